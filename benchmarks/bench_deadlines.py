@@ -0,0 +1,71 @@
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform import events
+from eduplatform.core import EduPlatform
+from eduplatform.entities import Assignment
+
+
+def build_platform(assignments, classes, teachers, seed):
+    rng = random.Random(seed)
+    platform = EduPlatform(auto_export_mode="off")
+    start = datetime.datetime.now() - datetime.timedelta(days=180)
+    for _ in range(assignments):
+        deadline = (start + datetime.timedelta(minutes=rng.randrange(365 * 24 * 60))).isoformat()
+        platform.add_assignment(Assignment("Task", "", deadline, "Math", rng.randrange(teachers), f"C{rng.randrange(classes)}"))
+    return platform
+
+
+def scan_due(platform, end, class_id):
+    # What callers had to do before: compare ISO strings over every assignment.
+    now = datetime.datetime.now().isoformat()
+    end = datetime.datetime.fromtimestamp(end).isoformat()
+    return sorted((a for a in platform.assignments.values() if now <= a.deadline <= end and (class_id is None or a.class_id == class_id)),
+                  key=lambda a: a.deadline)
+
+
+def best(action, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = action()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deadline range queries: sorted index against a full scan.")
+    parser.add_argument("--assignments", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--classes", type=int, default=100)
+    parser.add_argument("--teachers", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'assignments':>11} {'query':>22} {'scan (ms)':>10} {'index (ms)':>11} {'speedup':>8}")
+    for count in args.assignments:
+        platform = build_platform(count, args.classes, args.teachers, 0)
+        start = time.perf_counter()
+        platform._deadlines()
+        build = time.perf_counter() - start
+        end = time.time() + 48 * 3600
+        for label, class_id in (("due in 48h", None), ("due in 48h, one class", "C7")):
+            scan, expected = best(lambda: scan_due(platform, end, class_id), args.repeat)
+            indexed, result = best(lambda: platform.get_assignments_due(end=end, class_id=class_id), args.repeat)
+            assert [a.id for a in result] == [a.id for a in expected]
+            print(f"{count:>11} {label:>22} {scan * 1000:>10.3f} {indexed * 1000:>11.3f} {scan / indexed:>7.0f}x")
+        statuses, _ = best(lambda: platform.get_class_assignment_statuses("C7"), args.repeat)
+        print(f"{count:>11} {'index build':>22} {'':>10} {build * 1000:>11.3f}")
+        print(f"{count:>11} {'class statuses':>22} {'':>10} {statuses * 1000:>11.3f}")
+        platform.close()
+
+
+if __name__ == "__main__":
+    # Platform messages would drown the results.
+    with events.bus.silenced():
+        main()
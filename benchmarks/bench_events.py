@@ -0,0 +1,65 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform import events
+from eduplatform.core import EduPlatform
+from eduplatform.entities import Assignment
+
+
+def workload(platform, operations):
+    student = next(iter(platform.students.values()))
+    assignment = Assignment("Homework", "", "2099-01-01", "Math", 2, student.grade)
+    platform.assignments[assignment.id] = assignment
+    start = time.perf_counter()
+    for i in range(operations):
+        student.add_notification(f"Reminder {i}")
+        assignment.add_submission(student._id, "answer")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of platform messages per sink, including silent mode.")
+    parser.add_argument("--operations", type=int, default=50000, help="notification + submission pairs per sink")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        platform = EduPlatform(auto_export_delay=None)
+    devnull = open(os.devnull, "w")
+    sinks = [
+        ("console (devnull)", lambda: events.ConsoleSink(devnull)),
+        ("buffered console", lambda: events.BufferedSink(events.ConsoleSink(devnull))),
+        ("json lines", lambda: events.JSONLinesSink(devnull)),
+        ("memory", lambda: events.MemorySink()),
+        ("silent", lambda: None),
+    ]
+    emits = args.operations * 2
+    print(f"{'sink':>18} {'total (s)':>10} {'us/op':>8}")
+    for name, make_sink in sinks:
+        sink = make_sink()
+        previous = platform.events.set_sink(sink)
+        elapsed = workload(platform, args.operations)
+        platform.events.flush()
+        if isinstance(sink, events.BufferedSink):
+            sink.close()
+        platform.events.set_sink(previous)
+        print(f"{name:>18} {elapsed:>10.3f} {elapsed / args.operations * 1e6:>8.2f}")
+
+    # The silent floor: the cost of emit() itself with no sink attached.
+    previous = platform.events.set_sink(None)
+    start = time.perf_counter()
+    for i in range(emits):
+        events.emit("bench.noop", f"message {i}", value=i)
+    elapsed = time.perf_counter() - start
+    platform.events.set_sink(previous)
+    print(f"silent emit(): {elapsed / emits * 1e9:.0f} ns per call")
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
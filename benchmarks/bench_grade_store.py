@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform.entities import Grade
+from eduplatform.gradebook import GradeStore
+
+SUBJECTS = ["Math", "Informatics", "Physics", "History", "Biology", "English"]
+
+
+def measure_objects(count, students):
+    start = time.perf_counter()
+    build_objects(count, students)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = build_objects(count, students)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+
+def measure_store(count, students):
+    # tracemalloc slows millions of appends down too much; the store reports
+    # its own footprint instead.
+    start = time.perf_counter()
+    store = build_store(count, students)
+    return store, store.memory_usage(), time.perf_counter() - start
+
+
+def build_objects(count, students):
+    # The previous layout: one Grade object per grade in a dict, plus the
+    # per-subject value lists each Student kept.
+    grades = {}
+    per_student = {}
+    for i in range(count):
+        student_id = i % students
+        subject = SUBJECTS[i % len(SUBJECTS)]
+        grade = Grade(student_id, subject, 1 + i % 5, 1 + i % 200, "")
+        grades[grade.id] = grade
+        per_student.setdefault(student_id, {}).setdefault(subject, []).append(grade.value)
+    return grades, per_student
+
+
+def build_store(count, students):
+    store = GradeStore()
+    for i in range(count):
+        store.append(i % students, SUBJECTS[i % len(SUBJECTS)], 1 + i % 5, 1 + i % 200)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per grade: Grade objects versus the columnar GradeStore.")
+    parser.add_argument("--grades", type=int, default=10000000, help="grades loaded into the GradeStore")
+    parser.add_argument("--object-grades", type=int, default=500000, help="grades built as objects for the baseline")
+    parser.add_argument("--students", type=int, default=100000, help="number of distinct students")
+    args = parser.parse_args()
+
+    object_bytes, object_time = measure_objects(args.object_grades, args.students)
+    store, store_bytes, store_time = measure_store(args.grades, args.students)
+
+    print(f"{'layout':>8} {'grades':>10} {'MB':>9} {'bytes/grade':>12} {'build (s)':>10}")
+    print(f"{'objects':>8} {args.object_grades:>10} {object_bytes / 1e6:>9.1f} {object_bytes / args.object_grades:>12.1f} {object_time:>10.2f}")
+    print(f"{'columns':>8} {args.grades:>10} {store_bytes / 1e6:>9.1f} {store_bytes / args.grades:>12.1f} {store_time:>10.2f}")
+
+    student_ids = range(0, args.students, max(1, args.students // 1000))
+    start = time.perf_counter()
+    for student_id in student_ids:
+        values = store.student_values(student_id, "Math")
+        sum(values) / len(values) if values else 0.0
+    print(f"per-student subject average over the store: {(time.perf_counter() - start) / len(student_ids) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform import events
+from eduplatform.core import EduPlatform
+from eduplatform.instrumentation import instrumentation
+from eduplatform.synthetic import generate_school
+
+
+def run(classes, students_per_class, seed):
+    edu_platform = EduPlatform(auto_export_mode="off")
+    start = time.perf_counter()
+    generate_school(edu_platform, classes=classes, students_per_class=students_per_class, seed=seed)
+    elapsed = time.perf_counter() - start
+    edu_platform.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of per-operation instrumentation on synthetic school generation.")
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--students-per-class", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="also write the collected metrics in Prometheus text format")
+    args = parser.parse_args()
+
+    run(args.classes, args.students_per_class, 0)
+    timings = {}
+    for mode in ("disabled", "enabled", "disabled again"):
+        if mode == "enabled":
+            instrumentation.reset()
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+        timings[mode] = min(run(args.classes, args.students_per_class, seed) for seed in range(args.repeat))
+        if mode == "enabled":
+            metrics = instrumentation.snapshot()
+            calls = sum(stats["count"] for stats in metrics.values()) // args.repeat
+            if args.output:
+                instrumentation.write_prometheus(args.output)
+    baseline = timings["disabled"]
+    for mode, elapsed in timings.items():
+        print(f"{mode:>15}: {elapsed * 1000:9.2f} ms ({(elapsed / baseline - 1) * 100:+.1f}%)")
+    per_call = (timings["enabled"] - baseline) / calls * 1e6 if calls else 0.0
+    print(f"{calls} instrumented calls per run, {len(metrics)} operations, about {per_call:.2f} us added per call")
+    print("Slowest operations over all enabled runs:")
+    slowest = sorted(metrics.items(), key=lambda item: item[1]["total_seconds"], reverse=True)[:5]
+    for operation, stats in slowest:
+        print(f"{operation:>32} {stats['count']:>8} calls {stats['total_seconds'] * 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    # Platform messages would drown the results.
+    with events.bus.silenced():
+        main()
@@ -0,0 +1,117 @@
+import argparse
+import datetime
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform.entities import Grade, Notification
+from eduplatform.enums import UserRole
+from eduplatform.notifications import NotificationStore
+from eduplatform.users import Student
+
+SUBJECTS = ["Math", "Informatics", "Physics", "History", "Biology", "English"]
+CLASSES = [f"{year}-{letter}" for year in range(1, 12) for letter in "ABC"]
+
+
+# The previous layout: instance dicts, ISO strings and a fresh string per
+# subject and class as read from a file or a request.
+class DictNotification:
+    def __init__(self, message, recipient_id, priority=0):
+        self.id = 0
+        self.message = message
+        self.recipient_id = recipient_id
+        self.created_at = datetime.datetime.now().isoformat()
+        self.is_read = False
+        self.priority = priority
+
+
+class DictGrade:
+    def __init__(self, student_id, subject, value, teacher_id, comment=""):
+        self.id = 0
+        self.student_id = student_id
+        self.subject = subject
+        self.value = value
+        self.date = datetime.datetime.now().isoformat()
+        self.teacher_id = teacher_id
+        self.comment = comment
+        self._platform = None
+
+
+class DictStudent:
+    def __init__(self, full_name, email, password_hash, grade):
+        self._id = 0
+        self._full_name = full_name
+        self._email = email
+        self._password_hash = password_hash
+        self._created_at = datetime.datetime.now().isoformat()
+        self.role = UserRole.STUDENT
+        self._notifications = NotificationStore()
+        self.phone = None
+        self.address = None
+        self._platform = None
+        self.grade = grade
+        self.subjects = {}
+        self.assignments = {}
+
+
+def fresh(value):
+    # A new string object with the same text, as a parser would produce.
+    return "".join(list(value))
+
+
+def build_notifications(cls, count):
+    return [cls("Reminder", i % 1000, i % 3) for i in range(count)]
+
+
+def build_grades(cls, count):
+    return [cls(i % 10000, fresh(SUBJECTS[i % len(SUBJECTS)]), 1 + i % 5, 1 + i % 200) for i in range(count)]
+
+
+def build_students(cls, count):
+    students = []
+    for i in range(count):
+        student = cls(f"Student {i}", f"s{i}@school.test", None, fresh(CLASSES[i % len(CLASSES)]))
+        student._password_hash = "0" * 64
+        students.append(student)
+    return students
+
+
+def measure(build, cls, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(cls, count)
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per object: dict-based entities versus the slotted ones.")
+    parser.add_argument("--notifications", type=int, default=1000000)
+    parser.add_argument("--grades", type=int, default=1000000, help="standalone Grade objects, before they join a GradeStore")
+    parser.add_argument("--students", type=int, default=200000)
+    args = parser.parse_args()
+
+    cases = [
+        ("notifications", build_notifications, DictNotification, Notification, args.notifications),
+        ("grades", build_grades, DictGrade, Grade, args.grades),
+        ("students", build_students, DictStudent, Student, args.students),
+    ]
+    print(f"{'entity':>14} {'count':>9} {'before MB':>10} {'after MB':>9} {'B/obj before':>13} {'B/obj after':>12} {'saved':>6}")
+    for name, build, before_cls, after_cls, count in cases:
+        if count <= 0:
+            continue
+        before, _ = measure(build, before_cls, count)
+        after, _ = measure(build, after_cls, count)
+        print(f"{name:>14} {count:>9} {before / 1e6:>10.1f} {after / 1e6:>9.1f} {before / count:>13.1f} {after / count:>12.1f} {1 - after / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform import events
+from eduplatform.core import EduPlatform
+from eduplatform.entities import Assignment
+from eduplatform.reminders import DEFAULT_OFFSETS
+from eduplatform.users import Student, Parent
+
+START = 1_900_000_000.0
+WEEK = 7 * 86400
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def build_platform(assignments, classes, students_per_class, seed):
+    # Deadlines spread over the coming week; a third of each class has
+    # already submitted and every class has one parent on file.
+    rng = random.Random(seed)
+    platform = EduPlatform(auto_export_mode="off")
+    platform.add_users([Student(f"Student {c}/{n}", f"s{c}-{n}@reminders.test", None, f"C{c}")
+                        for c in range(classes) for n in range(students_per_class)])
+    parents = []
+    for c in range(classes):
+        parent = Parent(f"Parent {c}", f"p{c}@reminders.test", None)
+        parent.add_child(platform.students_by_class[f"C{c}"][-1])
+        parents.append(parent)
+    platform.add_users(parents)
+    for _ in range(assignments):
+        class_id = f"C{rng.randrange(classes)}"
+        assignment = Assignment("Task", "", START + rng.uniform(3600, WEEK), "Math", 0, class_id)
+        for student_id in platform.students_by_class[class_id][:students_per_class // 3]:
+            assignment.submissions[student_id] = "done"
+        platform.add_assignment(assignment)
+    return platform
+
+
+def polling_tick(platform, now, last, offsets):
+    # What a script has to do without the dispatcher: every tick, walk every
+    # assignment and check each reminder window against it.
+    due = 0
+    for assignment in platform.assignments.values():
+        deadline = assignment._deadline_ts
+        for offset in offsets:
+            if last < deadline - offset <= now:
+                due += sum(1 for student_id in platform.students_by_class.get(assignment.class_id, []) if student_id not in assignment.submissions)
+    return due
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deadline reminder dispatch over a simulated week against per-tick polling.")
+    parser.add_argument("--assignments", type=int, default=100000)
+    parser.add_argument("--classes", type=int, default=2000)
+    parser.add_argument("--students-per-class", type=int, default=6)
+    parser.add_argument("--tick", type=float, default=60.0, help="simulated seconds between dispatcher runs")
+    parser.add_argument("--polling-ticks", type=int, default=20, help="ticks of the polling baseline to time")
+    args = parser.parse_args()
+
+    platform = build_platform(args.assignments, args.classes, args.students_per_class, 0)
+    clock = Clock(START)
+    start = time.perf_counter()
+    reminders = platform.start_reminders(clock=clock, background=False)
+    seed = time.perf_counter() - start
+    print(f"{args.assignments} open assignments, {len(reminders)} heap entries, seeded in {seed * 1000:.1f} ms")
+
+    ticks = 0
+    busiest = 0.0
+    start = time.perf_counter()
+    while clock.now < START + WEEK + args.tick:
+        clock.now += args.tick
+        tick_start = time.perf_counter()
+        reminders.run_due()
+        busiest = max(busiest, time.perf_counter() - tick_start)
+        ticks += 1
+    elapsed = time.perf_counter() - start
+    sent = reminders.reminders_sent + reminders.parent_alerts_sent
+    print(f"dispatcher: {ticks} ticks in {elapsed:.2f} s, {elapsed / ticks * 1e6:.0f} us per tick on average, "
+          f"busiest {busiest * 1000:.2f} ms; {reminders.reminders_sent} reminders, {reminders.parent_alerts_sent} parent alerts")
+
+    start = time.perf_counter()
+    now = START
+    for _ in range(args.polling_ticks):
+        polling_tick(platform, now + args.tick, now, DEFAULT_OFFSETS)
+        now += args.tick
+    per_tick = (time.perf_counter() - start) / args.polling_ticks
+    print(f"polling: {per_tick * 1000:.2f} ms per tick, about {per_tick * ticks:.1f} s for the same week")
+    platform.close()
+    sys.exit(0 if sent else 1)
+
+
+if __name__ == "__main__":
+    # Platform messages would drown the results.
+    with events.bus.silenced():
+        main()
@@ -0,0 +1,48 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform.core import EduPlatform
+from eduplatform.reports import render_report, REPORT_FORMATS
+from eduplatform.users import Student
+
+
+def build_platform(students, grades_per_student, classes):
+    with contextlib.redirect_stdout(io.StringIO()):
+        platform = EduPlatform(auto_export_delay=None)
+        teacher_id = next(iter(platform.teachers))
+        platform.add_users([Student(f"Student {i}", f"student{i}@edu.com", None, f"{i % classes}-A") for i in range(students)])
+        for i, student_id in enumerate(platform.students):
+            for j in range(grades_per_student):
+                platform.grades.append(student_id, "Math", 1 + (i + j) % 5, teacher_id)
+    return platform
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report build and render time at scale.")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--grades-per-student", type=int, default=5)
+    parser.add_argument("--classes", type=int, default=400)
+    args = parser.parse_args()
+
+    platform = build_platform(args.students, args.grades_per_student, args.classes)
+    for include_students in (False, True):
+        start = time.perf_counter()
+        report = platform.build_report(include_students)
+        build = time.perf_counter() - start
+        label = "with students" if include_students else "summary + classes"
+        print(f"{label}: build {build * 1000:.2f} ms")
+        for fmt in REPORT_FORMATS:
+            out = io.StringIO()
+            start = time.perf_counter()
+            render_report(report, fmt, out)
+            print(f"  {fmt:>5}: render {time.perf_counter() - start:.3f}s, {len(out.getvalue()) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
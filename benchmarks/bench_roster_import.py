@@ -0,0 +1,46 @@
+import argparse
+import contextlib
+import csv
+import io
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform.core import EduPlatform
+from eduplatform.roster import ROSTER_COLUMNS
+
+
+def write_roster(path, users, teachers=200, classes=40):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(ROSTER_COLUMNS)
+        for t in range(teachers):
+            writer.writerow(["Teacher", f"Teacher {t}", f"teacher{t}@school.edu", f"pass{t}", "", "Math;Physics", f"{t % classes}-A", ""])
+        for s in range((users - teachers) // 2):
+            teacher = f"teacher{s % teachers}@school.edu"
+            writer.writerow(["Student", f"Student {s}", f"student{s}@school.edu", f"pass{s}", f"{s % classes}-A", f"Math={teacher}", "", ""])
+            writer.writerow(["Parent", f"Parent {s}", f"parent{s}@school.edu", f"pass{s}", "", "", "", f"student{s}@school.edu"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk roster import with inline versus process-pool password hashing.")
+    parser.add_argument("--users", type=int, default=100000, help="number of roster rows")
+    parser.add_argument("--workers", type=int, nargs="*", default=[0, 2, 4], help="hashing worker counts to compare (0 = inline)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "roster.csv")
+        write_roster(path, args.users)
+        print(f"{'workers':>8} {'accepted':>9} {'rejected':>9} {'elapsed (s)':>12} {'users/s':>10}")
+        for workers in args.workers:
+            with contextlib.redirect_stdout(io.StringIO()):
+                platform = EduPlatform(auto_export_delay=None)
+                summary = platform.import_roster(path, workers=workers)
+            result = summary.summary()
+            print(f"{workers:>8} {result['accepted']:>9} {result['rejected']:>9} {result['elapsed']:>12.3f} {result['accepted'] / result['elapsed']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
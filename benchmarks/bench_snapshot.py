@@ -0,0 +1,76 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform.core import EduPlatform
+from eduplatform.entities import Grade
+from eduplatform.journal import INSERT
+from eduplatform.storage import SQLiteStorage
+from eduplatform.users import Student
+
+
+def populate(platform, students, rows):
+    with contextlib.redirect_stdout(io.StringIO()):
+        teacher_id = next(iter(platform.teachers))
+        for i in range(students):
+            student = Student(f"Student {i}", f"student{i}@edu.com", "studentpass", f"{9 + i % 3}-A")
+            student.subjects = {"Math": teacher_id}
+            platform.add_user(student)
+        student_ids = list(platform.students)
+        for i in range(rows // 2):
+            student_id = student_ids[i % len(student_ids)]
+            grade = Grade(student_id, "Math", 1 + i % 5, teacher_id, f"comment {i}")
+            platform.grades[grade.id] = grade
+            platform._record_change("grades", grade.id, INSERT, grade)
+            platform.users[student_id].add_notification(f"Grade {grade.value} recorded", priority=i % 3)
+
+
+def timed(func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time from a binary snapshot versus the SQLite backend.")
+    parser.add_argument("--students", type=int, default=20000, help="number of generated students")
+    parser.add_argument("--rows", type=int, default=1000000, help="approximate number of grade and notification records")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, "bench.snapshot")
+        db_path = os.path.join(tmp, "bench.db")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            platform = EduPlatform(auto_export_delay=None, storage=SQLiteStorage(db_path))
+        _, build = timed(lambda: populate(platform, args.students, args.rows))
+        size, save = timed(lambda: platform.save_snapshot(snapshot_path))
+        with contextlib.redirect_stdout(io.StringIO()):
+            platform.close()
+        print(f"built {len(platform.users)} users and ~{args.rows} records in {build:.2f}s")
+        print(f"snapshot: {size / 1e6:.1f} MB written in {save:.3f}s")
+
+        print(f"{'source':>10} {'startup (s)':>12} {'first grade (s)':>16} {'all grades (s)':>15}")
+        sources = [
+            ("snapshot", lambda: EduPlatform.load_snapshot(snapshot_path, auto_export_delay=None)),
+            ("sqlite", lambda: EduPlatform(auto_export_delay=None, storage=SQLiteStorage(db_path))),
+        ]
+        for name, open_platform in sources:
+            loaded, startup = timed(open_platform)
+            first_id = next(iter(loaded.grades))
+            _, first = timed(lambda: loaded.grades[first_id])
+            _, scan = timed(lambda: sum(grade.value for grade in loaded.grades.values()))
+            print(f"{name:>10} {startup:>12.3f} {first:>16.3f} {scan:>15.3f}")
+            with contextlib.redirect_stdout(io.StringIO()):
+                loaded.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform.core import EduPlatform
+from eduplatform.entities import Grade, Notification
+from eduplatform.utils import ExportSnapshot, _write_sql, _write_sqlite
+
+
+def build_platform(rows):
+    with contextlib.redirect_stdout(io.StringIO()):
+        platform = EduPlatform(auto_export_delay=None)
+        student_ids = list(platform.students)
+        teacher_id = next(iter(platform.teachers))
+        for i in range(rows // 2):
+            student_id = student_ids[i % len(student_ids)]
+            grade = Grade(student_id, "Math", 1 + i % 5, teacher_id, f"comment {i}")
+            platform.grades[grade.id] = grade
+            platform.add_notification(Notification(f"Grade {grade.value} recorded", student_id, priority=i % 3))
+    return platform
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Row throughput of the SQL text dump and the direct SQLite export.")
+    parser.add_argument("--rows", type=int, default=200000, help="approximate number of exported rows")
+    args = parser.parse_args()
+
+    platform = build_platform(args.rows)
+    # Every mode writes from the same snapshot so only the writer is timed.
+    snapshot = ExportSnapshot(platform, formats=("sql",))
+    total_rows = sum(len(rows) for rows in snapshot.tables.values())
+    modes = [
+        ("text, 1 row/INSERT", ".sql", lambda path: _write_sql(snapshot, path, batch_size=1)),
+        ("text, 500 rows/INSERT", ".sql", lambda path: _write_sql(snapshot, path, batch_size=500)),
+        ("sqlite executemany", ".sqlite", lambda path: _write_sqlite(snapshot, path)),
+    ]
+    print(f"{'mode':>24} {'rows':>9} {'write (s)':>10} {'rows/s':>11} {'load dump (s)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, suffix, write in modes:
+            path = os.path.join(tmp, "bench" + suffix)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                write(path)
+            elapsed = time.perf_counter() - start
+            load = "-"
+            if suffix == ".sql":
+                # Time replaying the dump into a fresh database in one transaction.
+                start = time.perf_counter()
+                conn = sqlite3.connect(":memory:")
+                with open(path, encoding="utf-8") as f:
+                    conn.executescript("BEGIN;\n" + f.read() + "\nCOMMIT;")
+                conn.close()
+                load = f"{time.perf_counter() - start:.3f}"
+            print(f"{name:>24} {total_rows:>9} {elapsed:>10.3f} {total_rows / elapsed:>11.0f} {load:>14}")
+
+
+if __name__ == "__main__":
+    main()
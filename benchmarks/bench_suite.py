@@ -0,0 +1,184 @@
+import argparse
+import datetime
+import io
+import json
+import os
+import platform as python_platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from eduplatform import events
+from eduplatform.core import EduPlatform
+from eduplatform.reports import render_report, REPORT_FORMATS
+from eduplatform.synthetic import generate_school, WEEKLY_HOURS
+from eduplatform.timetable import TimetableGenerator
+
+TIERS = {
+    "small": {"classes": 4, "students_per_class": 20, "assignments_per_subject": 1},
+    "medium": {"classes": 20, "students_per_class": 25, "assignments_per_subject": 2},
+    "large": {"classes": 60, "students_per_class": 30, "assignments_per_subject": 3},
+}
+EXPORTS = ("xlsx", "csv", "sql", "sqlite", "all")
+
+
+def timed(results, name, operations, action, repeat=1):
+    # Best of repeat runs; actions that change the platform run once.
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    results[name] = {"seconds": round(best, 6)}
+    count(results[name], operations)
+
+
+def count(result, operations):
+    # Cases whose size is only known afterwards (generation, fan-out) set
+    # their operation count once they have run.
+    result["operations"] = operations
+    result["us_per_op"] = round(result["seconds"] * 1e6 / operations, 3) if operations else None
+
+
+def run_tier(name, sizes, seed, repeat, directory):
+    edu_platform = EduPlatform(auto_export_mode="off")
+    results = {}
+    holder = {}
+
+    def generate():
+        holder["school"] = generate_school(edu_platform, seed=seed, **sizes)
+    timed(results, "generate", None, generate)
+    school = holder["school"]
+    count(results["generate"], school.submissions + school.grades + len(school.assignment_ids))
+
+    teachers = {class_id: edu_platform.teachers[subjects["Math"]] for class_id, subjects in school.class_teachers.items()}
+    students_by_class = {class_id: [edu_platform.users[student_id] for student_id in edu_platform.students_by_class.get(class_id, [])]
+                         for class_id in school.class_ids}
+    created = []
+
+    def fan_out():
+        for class_id, teacher in teachers.items():
+            created.append(teacher.create_assignment(edu_platform, "Benchmark task", "", "2099-12-01T09:00:00", "Math", class_id))
+    before = edu_platform.user_notification_count
+    timed(results, "fan_out", None, fan_out)
+    count(results["fan_out"], edu_platform.user_notification_count - before)
+
+    submissions = [(student, assignment) for assignment in created for student in students_by_class[assignment.class_id]]
+
+    def submit():
+        for student, assignment in submissions:
+            student.submit_assignment(assignment, "Benchmark answer.")
+    timed(results, "submissions", len(submissions), submit)
+
+    def grade():
+        for index, (student, assignment) in enumerate(submissions):
+            teachers[assignment.class_id].grade_assignment(edu_platform, assignment.id, student._id, 1 + index % 5)
+    timed(results, "grading", len(submissions), grade)
+
+    timetable = {}
+
+    def build_timetable():
+        timetable["result"] = TimetableGenerator(edu_platform, WEEKLY_HOURS).generate(apply=True)
+    with edu_platform.events.silenced():
+        timed(results, "timetable", len(school.class_ids) * sum(WEEKLY_HOURS.values()), build_timetable)
+    results["timetable"]["unplaced"] = timetable["result"].summary()["unplaced"]
+
+    path = lambda filename: os.path.join(directory, f"{name}_{filename}")
+    exports = {
+        "xlsx": lambda: edu_platform.export_to_xlsx(path("data.xlsx")),
+        "csv": lambda: edu_platform.export_to_csv(path("data_")),
+        "sql": lambda: edu_platform.export_to_sql(path("data.sql")),
+        "sqlite": lambda: edu_platform.export_to_sqlite(path("data.sqlite")),
+        "all": lambda: edu_platform.export_all(path("all.xlsx"), path("all_"), path("all.sql")),
+    }
+    rows = len(edu_platform.users) + len(edu_platform.assignments) + len(edu_platform.grades) + len(edu_platform.schedules)
+    for fmt in EXPORTS:
+        with edu_platform.events.silenced():
+            timed(results, f"export_{fmt}", rows, exports[fmt], repeat)
+
+    report = {}
+
+    def build():
+        report["report"] = edu_platform.build_report()
+    timed(results, "report_build", len(edu_platform.students), build, repeat)
+    for fmt in REPORT_FORMATS:
+        timed(results, f"report_{fmt}", len(edu_platform.students), lambda: render_report(report["report"], fmt, io.StringIO()), repeat)
+
+    summary = school.summary()
+    summary["grades_total"] = len(edu_platform.grades)
+    edu_platform.close()
+    return {"sizes": sizes, "school": summary, "results": results}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    # Returns (tier, case, baseline seconds, current seconds) for every case
+    # that got slower than threshold allows.
+    regressions = []
+    for tier, data in current["tiers"].items():
+        previous = baseline.get("tiers", {}).get(tier)
+        if previous is None:
+            continue
+        for case, result in data["results"].items():
+            old = previous["results"].get(case)
+            if old and old["seconds"] > 0 and result["seconds"] > old["seconds"] * (1 + threshold):
+                regressions.append((tier, case, old["seconds"], result["seconds"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot path benchmark suite on synthetic schools of several sizes; writes JSON results.")
+    parser.add_argument("--tiers", default="small,medium", help=f"comma separated tiers out of {', '.join(TIERS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each read-only case; the best one is kept")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file for the results")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown against --compare, as a fraction")
+    args = parser.parse_args()
+
+    output = {
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "machine": python_platform.platform(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "tiers": {}
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.tiers.split(","):
+            data = run_tier(name, TIERS[name], args.seed, args.repeat, directory)
+            output["tiers"][name] = data
+            print(f"{name}: {data['school']['students']} students, {data['school']['teachers']} teachers, {data['school']['grades_total']} grades")
+            for case, result in data["results"].items():
+                per_op = f"{result['us_per_op']:>10.2f} us/op" if result["us_per_op"] is not None else ""
+                print(f"  {case:>14} {result['seconds'] * 1000:>10.2f} ms {per_op}")
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(output, baseline, args.threshold)
+        for tier, case, old, new in regressions:
+            print(f"REGRESSION {tier}/{case}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}.")
+
+
+if __name__ == "__main__":
+    # Platform messages would drown the results.
+    with events.bus.silenced():
+        main()
@@ -0,0 +1,74 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform.core import EduPlatform
+from eduplatform.timetable import TimetableGenerator
+from eduplatform.users import Student, Teacher
+
+WEEKLY_HOURS = {
+    "Math": 5, "Language": 4, "Science": 3, "History": 2, "Geography": 2,
+    "Informatics": 2, "Art": 1, "Music": 1, "PE": 2,
+}
+TEACHER_CAPACITY = 37
+
+SCENARIOS = {
+    "small": 50,
+    "medium": 200,
+    "large": 500,
+}
+
+
+def build_school(classes, students_per_class=2):
+    with contextlib.redirect_stdout(io.StringIO()):
+        platform = EduPlatform(auto_export_delay=None)
+        class_ids = [f"{7 + i % 5}-{i // 5:03d}" for i in range(classes)]
+        class_subjects = {class_id: {} for class_id in class_ids}
+        teacher_count = 0
+        # Each subject gets just enough teachers to cover its hours at
+        # TEACHER_CAPACITY lessons a week, filled class by class.
+        for subject, hours in WEEKLY_HOURS.items():
+            teacher = None
+            for class_id in class_ids:
+                if teacher is None or len(teacher.classes) * hours + hours > TEACHER_CAPACITY:
+                    teacher_count += 1
+                    teacher = Teacher(f"Teacher {teacher_count}", f"teacher{teacher_count}@school.edu", "pass")
+                    teacher.subjects = [subject]
+                    platform.add_user(teacher)
+                teacher.classes.append(class_id)
+                class_subjects[class_id][subject] = teacher._id
+        for class_id in class_ids:
+            for n in range(students_per_class):
+                student = Student(f"Student {class_id}/{n}", f"s{class_id}-{n}@school.edu", "pass", class_id)
+                student.subjects = dict(class_subjects[class_id])
+                platform.add_user(student)
+    return platform, teacher_count
+
+
+def run_scenario(name, classes):
+    platform, teachers = build_school(classes)
+    generator = TimetableGenerator(platform, WEEKLY_HOURS)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = generator.generate(apply=True)
+    elapsed = time.perf_counter() - start
+    summary = result.summary()
+    print(f"{name:>8} {classes:>8} {teachers:>9} {summary['lessons']:>8} {summary['unplaced']:>9} {result.elapsed:>10.3f} {elapsed:>12.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the timetable generator at several school sizes.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated scenario names")
+    args = parser.parse_args()
+    print(f"{'scenario':>8} {'classes':>8} {'teachers':>9} {'lessons':>8} {'unplaced':>9} {'solve (s)':>10} {'+ apply (s)':>12}")
+    for name in args.scenarios.split(","):
+        run_scenario(name, SCENARIOS[name])
+
+
+if __name__ == "__main__":
+    main()
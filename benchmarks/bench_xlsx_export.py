@@ -0,0 +1,76 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform.core import EduPlatform
+from eduplatform.entities import Notification
+
+
+def _peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_platform(notifications):
+    with contextlib.redirect_stdout(io.StringIO()):
+        platform = EduPlatform(auto_export_delay=None)
+    recipients = list(platform.users)
+    for i in range(notifications):
+        recipient_id = recipients[i % len(recipients)]
+        platform.add_notification(Notification(f"Benchmark notification #{i}", recipient_id, priority=i % 4))
+    return platform
+
+
+def run_worker(mode, notifications):
+    platform = build_platform(notifications)
+    rss_before = _peak_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "bench.xlsx")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            platform.export_to_xlsx(filename, streaming=(mode == "streaming"))
+        elapsed = time.perf_counter() - start
+    rss_after = _peak_rss_mb()
+    print(json.dumps({
+        "mode": mode,
+        "notifications": notifications,
+        "wall_time_s": round(elapsed, 3),
+        "peak_rss_mb": round(rss_after, 1),
+        "export_rss_mb": round(rss_after - rss_before, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare regular and streaming XLSX export.")
+    parser.add_argument("--sizes", default="10000,50000,200000", help="comma separated notification counts")
+    parser.add_argument("--worker", choices=["regular", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--notifications", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.notifications)
+        return
+
+    # Every run gets its own process so peak RSS is not shared between modes.
+    print(f"{'rows':>10} {'mode':>10} {'time (s)':>10} {'peak RSS (MB)':>14} {'export RSS (MB)':>16}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for mode in ("regular", "streaming"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--worker", mode, "--notifications", str(size)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{size:>10} {mode:>10} {result['wall_time_s']:>10} {result['peak_rss_mb']:>14} {result['export_rss_mb']:>16}")
+
+
+if __name__ == "__main__":
+    main()
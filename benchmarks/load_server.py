@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform import events
+from eduplatform.core import EduPlatform
+from eduplatform.server import ApiServer
+from eduplatform.users import Student, Teacher
+
+PASSWORD = "loadpass"
+
+
+def build_platform(classes, students_per_class):
+    # Delta auto-exports run in the background as they would in production.
+    platform = EduPlatform(auto_export_delay=5.0, auto_export_mode="delta")
+    teachers, students, assignments = [], [], []
+    for index in range(classes):
+        class_id = f"L{index}"
+        teacher = Teacher(f"Load Teacher {index}", f"teacher{index}@load.test", PASSWORD)
+        teacher.subjects = ["Math"]
+        teacher.classes = [class_id]
+        platform.add_user(teacher)
+        teachers.append(teacher)
+        members = []
+        for number in range(students_per_class):
+            student = Student(f"Load Student {index}-{number}", f"student{index}-{number}@load.test", PASSWORD, class_id)
+            student.subjects = {"Math": teacher._id}
+            platform.add_user(student)
+            members.append(student)
+        assignment = teacher.create_assignment(platform, f"Load {index}", "", "2099-01-01T00:00:00", "Math", class_id)
+        for student in members:
+            student.submit_assignment(assignment, "seed answer")
+        students.extend(members)
+        assignments.append(assignment)
+    return platform, teachers, students, assignments
+
+
+class Client:
+    # One keep-alive HTTP/1.1 connection.
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.token = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n"
+        if self.token:
+            head += f"Authorization: Bearer {self.token}\r\n"
+        self.writer.write((head + "\r\n").encode() + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        return status, json.loads(data) if data else None
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def virtual_user(host, port, user, kind, assignment, class_students, deadline, samples, errors):
+    client = Client(host, port)
+    await client.connect()
+    status, body = await client.request("POST", "/login", {"email": user._email, "password": PASSWORD})
+    if status != 200:
+        errors.append(("login", status))
+        return
+    client.token = body["token"]
+    rng = random.Random(user._id)
+    if kind == "teacher":
+        actions = [
+            ("grade", 5, lambda: ("POST", f"/assignments/{assignment.id}/grades",
+                                  {"student_id": rng.choice(class_students)._id, "value": rng.randint(1, 5)})),
+            ("leaderboard", 3, lambda: ("GET", f"/classes/{assignment.class_id}/leaderboard?k=5", None)),
+            ("timetable", 1, lambda: ("GET", f"/teachers/{user._id}/timetable", None)),
+        ]
+    else:
+        actions = [
+            ("notifications", 4, lambda: ("GET", "/notifications?unread=1", None)),
+            ("submit", 3, lambda: ("POST", f"/assignments/{assignment.id}/submissions", {"content": "answer"})),
+            ("stats", 2, lambda: ("GET", f"/students/{user._id}/stats", None)),
+            ("me", 1, lambda: ("GET", "/me", None)),
+        ]
+    names = [name for name, _, _ in actions]
+    weights = [weight for _, weight, _ in actions]
+    builders = {name: build for name, _, build in actions}
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        method, path, payload = builders[name]()
+        start = time.perf_counter()
+        status, _ = await client.request(method, path, payload)
+        samples.setdefault(name, []).append(time.perf_counter() - start)
+        if status >= 400:
+            errors.append((name, status))
+    await client.close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def drive(host, port, teachers, students, assignments, concurrency, duration):
+    by_class = {}
+    for student in students:
+        by_class.setdefault(student.grade, []).append(student)
+    assignment_of = {assignment.class_id: assignment for assignment in assignments}
+    users = []
+    for index in range(concurrency):
+        # Roughly one teacher connection for every four student connections.
+        if index % 5 == 4:
+            teacher = teachers[index % len(teachers)]
+            users.append((teacher, "teacher", assignment_of[teacher.classes[0]]))
+        else:
+            student = students[index % len(students)]
+            users.append((student, "student", assignment_of[student.grade]))
+    samples, errors = {}, []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(virtual_user(host, port, user, kind, assignment, by_class[assignment.class_id], deadline, samples, errors)
+                           for user, kind, assignment in users))
+    elapsed = time.perf_counter() - start
+    health = Client(host, port)
+    await health.connect()
+    _, stats = await health.request("GET", "/health")
+    await health.close()
+    return samples, errors, elapsed, stats
+
+
+def start_server(platform, batch_window):
+    # Runs the server on its own event loop in a background thread, so the
+    # load generator's loop only drives clients.
+    ready = threading.Event()
+    holder = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        server = ApiServer(platform, port=0, batch_window=batch_window)
+        loop.run_until_complete(server.start())
+        holder.update(server=server, loop=loop)
+        ready.set()
+        loop.run_forever()
+        loop.run_until_complete(server.stop())
+        loop.close()
+
+    thread = threading.Thread(target=run, name="eduplatform-api-server", daemon=True)
+    thread.start()
+    ready.wait()
+    return holder["server"], holder["loop"], thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the EduPlatform HTTP/JSON API: latency percentiles and throughput.")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--students-per-class", type=int, default=30)
+    parser.add_argument("--batch-window", type=float, default=0.002, help="seconds writes of one kind are collected before applying")
+    args = parser.parse_args()
+
+    platform, teachers, students, assignments = build_platform(args.classes, args.students_per_class)
+    server, loop, thread = start_server(platform, args.batch_window)
+    samples, errors, elapsed, stats = asyncio.run(drive(server.host, server.port, teachers, students, assignments, args.concurrency, args.duration))
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    platform.close()
+
+    total = sum(len(values) for values in samples.values())
+    print(f"{total} requests in {elapsed:.1f}s over {args.concurrency} connections: {total / elapsed:.0f} req/s, {len(errors)} errors")
+    print(f"{'endpoint':>14} {'count':>8} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    everything = []
+    for name, values in sorted(samples.items()):
+        everything.extend(values)
+        print(f"{name:>14} {len(values):>8} {percentile(values, 0.5) * 1e3:>9.2f} {percentile(values, 0.99) * 1e3:>9.2f}")
+    if everything:
+        print(f"{'all':>14} {len(everything):>8} {percentile(everything, 0.5) * 1e3:>9.2f} {percentile(everything, 0.99) * 1e3:>9.2f}")
+    for kind, batch in stats.get("batches", {}).items():
+        if batch["batches"]:
+            print(f"{kind} batches: {batch['batches']}, {batch['items'] / batch['batches']:.1f} writes per batch")
+
+
+if __name__ == "__main__":
+    # Platform messages would drown the results.
+    with events.bus.silenced():
+        main()
@@ -0,0 +1,171 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eduplatform.concurrency import allocate_id
+from eduplatform import events
+from eduplatform.core import EduPlatform
+from eduplatform.entities import Grade, Notification, Schedule
+from eduplatform.users import Student, Teacher, Parent
+
+SUBJECTS = ["Math", "Informatics", "Physics"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+TIMES = [f"{hour:02d}:00" for hour in range(8, 16)]
+
+
+def build_platform(teachers):
+    # Delta auto-exports keep running in the background, so exports take
+    # every collection lock while the workers write.
+    platform = EduPlatform(auto_export_delay=2.0, auto_export_mode="delta")
+    staff = []
+    for index in range(teachers):
+        teacher = Teacher(f"Teacher {index}", f"teacher{index}@stress.test", "pw")
+        teacher.subjects = list(SUBJECTS)
+        teacher.classes = [f"C{index}"]
+        platform.add_user(teacher)
+        staff.append(teacher)
+    return platform, staff
+
+
+def worker(platform, staff, thread_index, operations, created, barrier):
+    # Mixed writes and reads: registrations, assignments, submissions and
+    # grades, notifications, lesson bookings, plus lookups and leaderboards.
+    teacher = staff[thread_index % len(staff)]
+    class_id = teacher.classes[0]
+    ids = {"users": [], "grades": [], "notifications": [], "schedules": [], "booked": 0}
+    students = []
+    barrier.wait()
+    for i in range(operations):
+        student = Student(f"S{thread_index}-{i}", f"s{thread_index}-{i}@stress.test", None, class_id)
+        student.subjects = {subject: teacher._id for subject in SUBJECTS}
+        platform.add_user(student)
+        ids["users"].append(student._id)
+        students.append(student)
+        if i % 10 == 0:
+            parent = Parent(f"P{thread_index}-{i}", f"p{thread_index}-{i}@stress.test", None)
+            parent.add_child(student._id)
+            platform.add_user(parent)
+            ids["users"].append(parent._id)
+
+        grade = Grade(student._id, SUBJECTS[i % len(SUBJECTS)], 1 + i % 5, teacher._id)
+        platform.add_grade(grade)
+        ids["grades"].append(grade.id)
+        ids["grades"].append(platform.grades.append(student._id, "Math", 1 + (i + 2) % 5, teacher._id))
+
+        ids["notifications"].append(student.add_notification(f"Notice {i}").id)
+        notification = Notification(f"Broadcast {thread_index}-{i}", None)
+        platform.add_notification(notification)
+        ids["notifications"].append(notification.id)
+
+        if i % 25 == 0:
+            # Every thread competes for the same shared teacher's slots.
+            schedule = Schedule(class_id, DAYS[i % len(DAYS)])
+            platform.add_schedule(schedule)
+            ids["schedules"].append(schedule.id)
+            if schedule.add_lesson(TIMES[(i // 25) % len(TIMES)], "Math", staff[0]._id, platform):
+                ids["booked"] += 1
+
+        platform.get_user_by_email(student._email)
+        platform.get_class_leaderboard(class_id, 3)
+        platform.get_teacher_timetable(staff[0]._id)
+        students[i // 2].view_notifications(unread_only=True)
+        if i % 50 == 0:
+            platform.remove_user(students[i // 2]._id)
+    created[thread_index] = ids
+
+
+def check(platform, created):
+    errors = []
+
+    def expect(condition, message):
+        if not condition:
+            errors.append(message)
+
+    for kind in ("users", "grades", "notifications", "schedules"):
+        allocated = [item for ids in created.values() for item in ids[kind]]
+        expect(len(allocated) == len(set(allocated)), f"duplicate {kind} ids")
+
+    users = platform.users
+    expect(len(users) == len(platform.users_by_email), "users and users_by_email differ")
+    expect(all(platform.users_by_email[user._email] is user for user in users.values()), "users_by_email points at the wrong user")
+    role_total = len(platform.admins) + len(platform.teachers) + len(platform.students) + len(platform.parents)
+    expect(role_total == len(users), "role tables do not add up to users")
+    in_classes = [student_id for ids in platform.students_by_class.values() for student_id in ids]
+    expect(sorted(in_classes) == sorted(platform.students), "students_by_class out of step with students")
+    for student_id, parent_ids in platform.parents_by_student.items():
+        expect(len(parent_ids) == len(set(parent_ids)), f"duplicate parents for student {student_id}")
+
+    expected_grades = sum(len(ids["grades"]) for ids in created.values())
+    expect(len(platform.grades) == expected_grades, f"{len(platform.grades)} grades stored, {expected_grades} added")
+    expect(sum(1 for _ in platform.grades) == expected_grades, "grade iteration count differs")
+    aggregates = platform.grades.aggregates
+    expect(sum(stats.count for stats in aggregates.teachers.values()) == expected_grades, "teacher aggregates out of step")
+    expect(sum(stats.count for stats in aggregates.students.values()) == expected_grades, "student aggregates out of step")
+
+    inbox_total = sum(len(user._notifications) for user in users.values())
+    expect(platform.user_notification_count == inbox_total, f"notification counter {platform.user_notification_count}, inboxes hold {inbox_total}")
+    broadcasts = sum(len(ids["notifications"]) for ids in created.values()) // 2
+    expect(len(platform.notifications) == broadcasts, "platform notifications lost")
+
+    booked = sum(ids["booked"] for ids in created.values())
+    slots = sum(len(teachers) for teachers in platform.teacher_slots.values())
+    expect(slots == booked, f"{slots} teacher slots booked, {booked} bookings succeeded")
+    for (day, time_), teachers in platform.teacher_slots.items():
+        for teacher_id, schedule_id in teachers.items():
+            expect(platform.schedules[schedule_id].lessons[time_]["teacher_id"] == teacher_id, f"slot {day} {time_} points at the wrong schedule")
+    return errors
+
+
+def run(threads, operations, teachers):
+    platform, staff = build_platform(teachers)
+    created = {}
+    barrier = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(platform, staff, index, operations, created, barrier)) for index in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    errors = check(platform, created) if len(created) == threads else ["a worker thread failed"]
+    platform.close()
+    return elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent writers and readers on one platform: index consistency and throughput.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--operations", type=int, default=2000, help="iterations per thread")
+    parser.add_argument("--teachers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'threads':>7} {'iterations':>10} {'seconds':>8} {'iter/s':>9}  consistency")
+    failed = False
+    for threads in args.threads:
+        elapsed, errors = run(threads, args.operations, args.teachers)
+        total = threads * args.operations
+        print(f"{threads:>7} {total:>10} {elapsed:>8.2f} {total / elapsed:>9.0f}  {'ok' if not errors else '; '.join(errors[:3])}")
+        failed = failed or bool(errors)
+    # A plain id allocation race check on top of the platform workload.
+    ids = []
+    def allocate():
+        ids.extend(allocate_id(Notification) for _ in range(50000))
+    pool = [threading.Thread(target=allocate) for _ in range(8)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    print(f"id allocation: {len(ids)} ids, {len(set(ids))} distinct")
+    failed = failed or len(ids) != len(set(ids))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    # Platform messages would drown the results.
+    with events.bus.silenced():
+        main()
@@ -1,19 +1,92 @@
 import hashlib
 import datetime
+import time
+from eduplatform.concurrency import allocate_id
 
-class AbstractRole:
+
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def hash_passwords(passwords):
+    return [hash_password(password) for password in passwords]
+
+
+def to_timestamp(value):
+    # Timestamps are kept as epoch seconds; ISO strings from older storage
+    # files and snapshots are converted on the way in. Strings and datetimes
+    # without an offset are taken as local time, as datetime.now() gives.
+    if value is None:
+        return time.time()
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value).timestamp()
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return value
+
+
+def to_isoformat(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp).isoformat()
+
+
+_SLOT_NAMES = {}
+
+
+def slot_names(cls):
+    names = _SLOT_NAMES.get(cls)
+    if names is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name != "__weakref__" and name not in names:
+                    names.append(name)
+        names = _SLOT_NAMES[cls] = tuple(names)
+    return names
+
+
+class Slotted:
+    # Pickling and storage state for classes that declare __slots__: the set
+    # slots across the class hierarchy as a plain dict.
+    __slots__ = ()
+
+    def __getstate__(self):
+        state = {}
+        for name in slot_names(type(self)):
+            try:
+                state[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class AbstractRole(Slotted):
+    __slots__ = ("_id", "_full_name", "_email", "_password_hash", "_created_ts")
     _next_id = 1
 
     def __init__(self, full_name, email, password):
-        self._id = AbstractRole._next_id
-        AbstractRole._next_id += 1
+        self._id = allocate_id(AbstractRole)
         self._full_name = full_name
         self._email = email
-        self._password_hash = self._hash_password(password)
-        self._created_at = datetime.datetime.now().isoformat()
+        # A None password leaves the hash to the caller, as the bulk importer
+        # hashes whole batches in worker processes.
+        self._password_hash = self._hash_password(password) if password is not None else None
+        self._created_ts = time.time()
+
+    @property
+    def _created_at(self):
+        return to_isoformat(self._created_ts)
+
+    @_created_at.setter
+    def _created_at(self, value):
+        self._created_ts = to_timestamp(value)
 
     def _hash_password(self, password):
-        return hashlib.sha256(password.encode()).hexdigest()
+        return hash_password(password)
 
     def verify_password(self, password):
         return self._password_hash == self._hash_password(password)
@@ -0,0 +1,166 @@
+import bisect
+import math
+
+DEFAULT_LEADERBOARD_SIZE = 10
+
+
+class RunningStats:
+    # count, sum, sum of squares and a value histogram. Grades take a handful
+    # of distinct values, so min and max come from the histogram and stay
+    # correct when values are removed.
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.total_sq = 0
+        self.histogram = {}
+
+    def add(self, value, times=1):
+        self.count += times
+        self.total += value * times
+        self.total_sq += value * value * times
+        self.histogram[value] = self.histogram.get(value, 0) + times
+
+    def remove(self, value, times=1):
+        self.count -= times
+        self.total -= value * times
+        self.total_sq -= value * value * times
+        left = self.histogram.get(value, 0) - times
+        if left > 0:
+            self.histogram[value] = left
+        else:
+            self.histogram.pop(value, None)
+
+    def merge(self, other):
+        for value, times in other.histogram.items():
+            self.add(value, times)
+
+    def unmerge(self, other):
+        for value, times in other.histogram.items():
+            self.remove(value, times)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def variance(self):
+        if not self.count:
+            return None
+        return max(0.0, self.total_sq / self.count - (self.total / self.count) ** 2)
+
+    @property
+    def min(self):
+        return min(self.histogram) if self.histogram else None
+
+    @property
+    def max(self):
+        return max(self.histogram) if self.histogram else None
+
+    def summary(self):
+        variance = self.variance
+        return {
+            "count": self.count,
+            "average": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "stddev": math.sqrt(variance) if variance is not None else None,
+            "histogram": dict(sorted(self.histogram.items()))
+        }
+
+
+class Leaderboard:
+    # Students of one class ordered by average. A sorted list keyed by
+    # (average, student_id) gives top-k and bottom-k as slices; an update
+    # is one bisect removal and one insort.
+    def __init__(self):
+        self._keys = []
+        self._key_of = {}
+
+    def update(self, student_id, average):
+        old = self._key_of.pop(student_id, None)
+        if old is not None:
+            del self._keys[bisect.bisect_left(self._keys, old)]
+        if average is not None:
+            key = (average, student_id)
+            bisect.insort(self._keys, key)
+            self._key_of[student_id] = key
+
+    def discard(self, student_id):
+        self.update(student_id, None)
+
+    def top(self, k=DEFAULT_LEADERBOARD_SIZE):
+        return [(student_id, average) for average, student_id in reversed(self._keys[-k:])] if k > 0 else []
+
+    def bottom(self, k=DEFAULT_LEADERBOARD_SIZE):
+        return [(student_id, average) for average, student_id in self._keys[:k]]
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class GradeAggregates:
+    # Running statistics per student, student and subject, class and teacher,
+    # updated by the grade store on every insert, update and delete.
+    # class_of maps a student id to its class at the time of the change.
+    def __init__(self, class_of=None):
+        self._class_of = class_of or (lambda student_id: None)
+        self.students = {}
+        self.student_subjects = {}
+        self.classes = {}
+        self.teachers = {}
+        self.leaderboards = {}
+        self._student_class = {}
+
+    def _stats(self, table, key):
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = RunningStats()
+        return stats
+
+    def add(self, student_id, subject, teacher_id, value):
+        self._change(student_id, subject, teacher_id, value, 1)
+
+    def remove(self, student_id, subject, teacher_id, value):
+        self._change(student_id, subject, teacher_id, value, -1)
+
+    def _change(self, student_id, subject, teacher_id, value, sign):
+        apply = RunningStats.add if sign > 0 else RunningStats.remove
+        student = self._stats(self.students, student_id)
+        apply(student, value)
+        apply(self._stats(self.student_subjects, (student_id, subject)), value)
+        apply(self._stats(self.teachers, teacher_id), value)
+        if student_id not in self._student_class:
+            self._student_class[student_id] = self._class_of(student_id)
+        class_id = self._student_class[student_id]
+        if class_id is not None:
+            apply(self._stats(self.classes, class_id), value)
+            self.leaderboards.setdefault(class_id, Leaderboard()).update(student_id, student.mean)
+
+    def move_student(self, student_id):
+        # Re-files a student's totals after their class changed.
+        old_class = self._student_class.get(student_id)
+        new_class = self._class_of(student_id)
+        if old_class == new_class or student_id not in self.students:
+            self._student_class[student_id] = new_class
+            return
+        student = self.students[student_id]
+        if old_class is not None:
+            self.classes[old_class].unmerge(student)
+            self.leaderboards[old_class].discard(student_id)
+        if new_class is not None:
+            self._stats(self.classes, new_class).merge(student)
+            self.leaderboards.setdefault(new_class, Leaderboard()).update(student_id, student.mean)
+        self._student_class[student_id] = new_class
+
+    def student(self, student_id, subject=None):
+        table, key = (self.students, student_id) if subject is None else (self.student_subjects, (student_id, subject))
+        return table.get(key) or RunningStats()
+
+    def for_class(self, class_id):
+        return self.classes.get(class_id) or RunningStats()
+
+    def for_teacher(self, teacher_id):
+        return self.teachers.get(teacher_id) or RunningStats()
+
+    def leaderboard(self, class_id):
+        return self.leaderboards.get(class_id) or Leaderboard()
@@ -0,0 +1,63 @@
+import threading
+
+_ID_LOCKS = {}
+_ID_LOCKS_GUARD = threading.Lock()
+
+
+def _id_lock(cls):
+    lock = _ID_LOCKS.get(cls)
+    if lock is None:
+        with _ID_LOCKS_GUARD:
+            lock = _ID_LOCKS.setdefault(cls, threading.Lock())
+    return lock
+
+
+def allocate_ids(cls, count=1):
+    # Reserves count consecutive ids from cls._next_id and returns the first.
+    # The counter stays a plain class attribute so storage and snapshots can
+    # save and restore it; every increment goes through the class's lock.
+    with _id_lock(cls):
+        first = cls._next_id
+        cls._next_id = first + count
+    return first
+
+
+def allocate_id(cls):
+    return allocate_ids(cls, 1)
+
+
+def advance_id(cls, next_id):
+    with _id_lock(cls):
+        if next_id > cls._next_id:
+            cls._next_id = next_id
+
+
+class LockSet:
+    # One reentrant lock per collection. Writers take the lock of the
+    # collection they change; using the set itself as a context manager takes
+    # every lock in declaration order, which is the order nested acquisitions
+    # must follow too. Readers take no lock: single dict and array operations
+    # are atomic, and iterating readers work on copies.
+    def __init__(self, names):
+        self.names = tuple(names)
+        self._locks = {name: threading.RLock() for name in self.names}
+
+    def __getitem__(self, name):
+        return self._locks[name]
+
+    def __enter__(self):
+        acquired = []
+        try:
+            for name in self.names:
+                self._locks[name].acquire()
+                acquired.append(name)
+        except BaseException:
+            for name in reversed(acquired):
+                self._locks[name].release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for name in reversed(self.names):
+            self._locks[name].release()
+        return False
@@ -1,6 +1,25 @@
 import datetime
+import time
 from eduplatform.users import Admin, Teacher, Student, Parent, UserRole
-from eduplatform.utils import export_to_xlsx, export_to_csv, export_to_sql
+from eduplatform.utils import export_to_xlsx, export_to_csv, export_to_sql, export_to_sqlite, export_all, ExportSnapshot
+from eduplatform.exporter import BackgroundExporter
+from eduplatform.journal import ChangeJournal, INSERT, UPDATE, DELETE
+from eduplatform.validation import ValidationState, validate_user
+from eduplatform.storage import LazyTable, LazyRefs
+from eduplatform.notifications import LazyNotificationStore
+from eduplatform.gradebook import GradeStore
+from eduplatform.reports import build_platform_report, write_report
+from eduplatform import events
+from eduplatform.events import emit, ERROR
+from eduplatform.instrumentation import instrumentation
+from eduplatform import snapshot
+from eduplatform.roster import import_roster
+from eduplatform.sessions import SessionStore, DEFAULT_SESSION_TTL, DEFAULT_MAX_SESSIONS
+from eduplatform.concurrency import LockSet
+from eduplatform.deadlines import DeadlineIndex
+from eduplatform.reminders import ReminderDispatcher, DEFAULT_OFFSETS
+from eduplatform.abstracts import to_timestamp
+from eduplatform.server import run_server, DEFAULT_HOST, DEFAULT_PORT
 from pathlib import Path
 import os
 
@@ -9,7 +28,20 @@ current_dir = Path(__file__).resolve().parent
 
 
 class EduPlatform:
-    def __init__(self):
+    def __init__(self, auto_export_delay=1.0, auto_export_mode="full", storage=None, snapshot_path=None,
+                 session_ttl=DEFAULT_SESSION_TTL, max_sessions=DEFAULT_MAX_SESSIONS, metrics=False):
+        # Platform messages go through the process-wide event bus. Silencing
+        # or redirecting it is up to the caller, with events.bus.silenced()
+        # or events.bus.using(sink), so creating a platform never changes
+        # what other platforms print.
+        self.events = events.bus
+        # Instrumentation wraps methods process-wide, so once one platform
+        # enables it every platform and user in the process is measured.
+        if metrics:
+            instrumentation.enable()
+        # One lock per collection for writers; "with self._locks" takes them
+        # all, for exports and snapshots that need a consistent view.
+        self._locks = LockSet(("users", "assignments", "grades", "schedules", "notifications"))
         self.users = {}
         self.admins = {}
         self.teachers = {}
@@ -17,32 +49,76 @@ class EduPlatform:
         self.parents = {}
         
         self.assignments = {}
-        self.grades = {}
+        self.grades = GradeStore(on_load=self._attach, class_of=self._class_of, lock=self._locks["grades"])
         self.schedules = {}
         self.notifications = {}
         
         self.users_by_email = {}
         self.students_by_class = {}
+        self.parents_by_student = {}
+        self.teacher_slots = {}
+        self.teacher_timetables = {}
+        # Built from the assignments on the first deadline query.
+        self._deadline_index = None
+        self.reminders = None
+        self._closed = False
+        self.user_notification_count = 0
 
         self.export_log = []
+        self.journal = ChangeJournal()
+        self.validation = ValidationState()
+        self.auto_export_mode = auto_export_mode
+        self.sessions = SessionStore(session_ttl, max_sessions)
+
+        self._exporter = BackgroundExporter(self._run_auto_export, auto_export_delay) if auto_export_delay is not None else None
+
+        # With a storage backend the history tables load lazily; users and
+        # schedules stay resident because every index is built from them.
+        # Grades are compact enough to load whole on first use.
+        self.storage = storage
+        self._restoring = False
+        if storage is not None:
+            self.assignments = LazyTable(storage, "assignments", on_load=self._attach)
+            self.grades = GradeStore(on_load=self._attach, loader=lambda: storage.iter_objects("grades"), class_of=self._class_of, lock=self._locks["grades"])
+
+        # A snapshot replaces the default data; its history tables are decoded
+        # on first access.
+        if storage is not None and snapshot_path is not None:
+            raise ValueError("A platform can start from storage or from a snapshot, not both.")
+        self._snapshot = snapshot.SnapshotReader(snapshot_path) if snapshot_path is not None else None
+        if self._snapshot is not None:
+            self.assignments = snapshot.SnapshotTable(self._snapshot, "assignments", snapshot.make_assignment, on_load=self._attach,
+                                                      fields=snapshot.ASSIGNMENT_FIELDS)
+            self.grades = GradeStore(on_load=self._attach, loader=lambda: snapshot.iter_grades(self._snapshot), class_of=self._class_of, lock=self._locks["grades"])
 
         self._initialize_system_data()
 
+    @classmethod
+    def load_snapshot(cls, path, **kwargs):
+        return cls(snapshot_path=path, **kwargs)
+
     def _initialize_system_data(self):
         try:
             os.mkdir(current_dir/"eduplatform_dataset_files")
         except FileExistsError:
             pass
         except OSError as e:
-            print(f"Error creating folder: {e}")
+            emit("platform.initialize_system_data", f"Error creating folder: {e}", level=ERROR)
         try:
             os.mkdir(current_dir/"auto_exported_files")
         except FileExistsError:
             pass
         except OSError as e:
-            print(f"Error creating folder: {e}")
+            emit("platform.initialize_system_data", f"Error creating folder: {e}", level=ERROR)
+
+        if self._snapshot is not None:
+            self._load_from_snapshot()
+            return
+        if self.storage is not None and self.storage.has_data():
+            self._load_from_storage()
+            return
         
-        print("Initializing system with default data...")
+        emit("platform.initialize_system_data", "Initializing system with default data...")
         admin = Admin("Super Admin", "admin@edu.com", "adminpass")
         self.add_user(admin)
 
@@ -63,14 +139,72 @@ class EduPlatform:
         parent1.add_child(student1._id)
         self.add_user(parent1)
         
-        print("System initialization complete.")
+        emit("platform.initialize_system_data", "System initialization complete.")
+
+    def _load_from_storage(self):
+        emit("platform.load_from_storage", "Loading platform data from storage...")
+        self._restoring = True
+        try:
+            self.storage.restore_id_counters()
+            for user in self.storage.iter_objects("users"):
+                user._notifications = LazyNotificationStore(self.storage.notification_loader(user._id))
+                self._add_user(user)
+            for schedule in self.storage.iter_objects("schedules"):
+                self._add_schedule(schedule)
+            for notification in self.storage.iter_objects("notifications", "WHERE platform_level = 1"):
+                self.notifications[notification.id] = notification
+            self.user_notification_count = self.storage.count("notifications") - len(self.notifications)
+        finally:
+            self._restoring = False
+        emit("platform.load_from_storage", f"Loaded {len(self.users)} users and {len(self.schedules)} schedules from storage.")
+
+    def _load_from_snapshot(self):
+        emit("platform.load_from_snapshot", f"Loading platform snapshot from {self._snapshot.path}...")
+        self._restoring = True
+        try:
+            snapshot.restore_id_counters(self._snapshot)
+            for state in self._snapshot.section("users"):
+                user = snapshot.make_user(state)
+                user._notifications = LazyNotificationStore(snapshot.notification_loader(self._snapshot, user._id))
+                if user.role == UserRole.TEACHER:
+                    user.assignments_given = LazyRefs(self.assignments, user.assignments_given)
+                self._add_user(user)
+            for row in self._snapshot.section("schedules"):
+                self._add_schedule(snapshot.make_schedule(row))
+            for notification in snapshot.iter_platform_notifications(self._snapshot):
+                self.notifications[notification.id] = notification
+            self.user_notification_count = self._snapshot.section("meta").get("user_notifications", 0)
+        finally:
+            self._restoring = False
+        emit("platform.load_from_snapshot", f"Loaded {len(self.users)} users and {len(self.schedules)} schedules from snapshot.")
+
+    def save_snapshot(self, path=current_dir/"eduplatform_dataset_files/eduplatform.snapshot"):
+        with self._locks:
+            sections = snapshot.build_sections(self)
+        size = snapshot.write_snapshot(sections, path)
+        emit("platform.save_snapshot", f"Platform snapshot saved to {path} ({size} bytes).")
+        return size
+
+    def _attach(self, obj):
+        obj._platform = self
 
     def add_user(self, user_obj):
+        with self._locks["users"]:
+            return self._add_user(user_obj)
+
+    def _add_user(self, user_obj):
         if user_obj._email in self.users_by_email:
             return False
         
         self.users[user_obj._id] = user_obj
         self.users_by_email[user_obj._email] = user_obj
+        user_obj._platform = self
+        if self.storage is not None and user_obj.role == UserRole.TEACHER and not isinstance(user_obj.assignments_given, LazyRefs):
+            user_obj.assignments_given = LazyRefs(self.assignments, user_obj.assignments_given)
+        self._revalidate_user(user_obj)
+        if not self._restoring:
+            with self._locks["notifications"]:
+                self.user_notification_count += len(user_obj._notifications)
 
         if user_obj.role == UserRole.ADMIN:
             self.admins[user_obj._id] = user_obj
@@ -83,9 +217,32 @@ class EduPlatform:
             self.students_by_class[user_obj.grade].append(user_obj._id)
         elif user_obj.role == UserRole.PARENT:
             self.parents[user_obj._id] = user_obj
+            for child_id in user_obj.children:
+                self._link_parent(user_obj._id, child_id)
+        self._record_change("users", user_obj._id, INSERT, user_obj)
         return True
 
+    def add_users(self, user_objs):
+        # Batch registration: emails are checked against the index and within
+        # the batch in one pass, then every user is indexed under one lock.
+        with self._locks["users"]:
+            taken = self.users_by_email.keys() & {user_obj._email for user_obj in user_objs}
+            added = []
+            rejected = []
+            for user_obj in user_objs:
+                if user_obj._email in taken:
+                    rejected.append(user_obj)
+                    continue
+                taken.add(user_obj._email)
+                self._add_user(user_obj)
+                added.append(user_obj)
+        return added, rejected
+
     def remove_user(self, user_id):
+        with self._locks["users"]:
+            return self._remove_user(user_id)
+
+    def _remove_user(self, user_id):
         user = self.users.pop(user_id, None)
         if user:
             self.users_by_email.pop(user._email, None)
@@ -97,11 +254,44 @@ class EduPlatform:
                 self.students.pop(user_id, None)
                 if user.grade in self.students_by_class:
                     self.students_by_class[user.grade].remove(user_id)
+                # With the student gone their totals leave the class stats
+                # and the leaderboard.
+                with self._locks["grades"]:
+                    self.grades.aggregates.move_student(user_id)
             elif user.role == UserRole.PARENT:
                 self.parents.pop(user_id, None)
+                for child_id in user.children:
+                    self._unlink_parent(user_id, child_id)
+            user._platform = None
+            self.sessions.revoke_user(user_id)
+            self.validation.discard("user", user_id)
+            # The inbox goes with the user; each delete is journaled so delta
+            # exports and storage drop the rows too, and _record_change
+            # keeps user_notification_count in step.
+            with self._locks["notifications"]:
+                for notification in list(user._notifications):
+                    self._record_change("notifications", notification.id, DELETE, notification)
+            self._record_change("users", user_id, DELETE, user)
             return True
         return False
 
+    def _link_parent(self, parent_id, student_id):
+        with self._locks["users"]:
+            parent_ids = self.parents_by_student.setdefault(student_id, [])
+            if parent_id not in parent_ids:
+                parent_ids.append(parent_id)
+
+    def _unlink_parent(self, parent_id, student_id):
+        with self._locks["users"]:
+            parent_ids = self.parents_by_student.get(student_id)
+            if parent_ids and parent_id in parent_ids:
+                parent_ids.remove(parent_id)
+                if not parent_ids:
+                    del self.parents_by_student[student_id]
+
+    def get_parents_of(self, student_id):
+        return [self.parents[parent_id] for parent_id in self.parents_by_student.get(student_id, []) if parent_id in self.parents]
+
     def get_user_by_id(self, user_id):
         return self.users.get(user_id)
 
@@ -111,66 +301,341 @@ class EduPlatform:
     def authenticate_user(self, email, password):
         user = self.get_user_by_email(email)
         if user and user.verify_password(password):
-            print(f"Authentication successful for {user._full_name} ({user.role.value}).")
+            emit("platform.authenticate_user", f"Authentication successful for {user._full_name} ({user.role.value}).")
             return user
-        print("Authentication failed: Invalid email or password.")
+        emit("platform.authenticate_user", "Authentication failed: Invalid email or password.")
         return None
 
+    def login(self, email, password):
+        # Verifies the password once and returns a session token; later
+        # requests authenticate with authenticate_token instead.
+        user = self.authenticate_user(email, password)
+        if user is None:
+            return None
+        return self.sessions.issue(user._id)
+
+    def authenticate_token(self, token):
+        user_id = self.sessions.resolve(token)
+        if user_id is None:
+            return None
+        return self.users.get(user_id)
+
+    def logout(self, token):
+        return self.sessions.revoke(token)
+
+    def _password_changed(self, user_obj):
+        self.sessions.revoke_user(user_obj._id)
+        self._record_change("users", user_obj._id, UPDATE, user_obj)
+
     def add_assignment(self, assignment_obj):
-        self.assignments[assignment_obj.id] = assignment_obj
-        print(f"Assignment '{assignment_obj.title}' added to platform.")
+        self._check_open()
+        with self._locks["assignments"]:
+            self.assignments[assignment_obj.id] = assignment_obj
+            assignment_obj._platform = self
+            if self._deadline_index is not None:
+                self._deadline_index.add(assignment_obj)
+            self._record_change("assignments", assignment_obj.id, INSERT, assignment_obj)
+        if self.reminders is not None:
+            self.reminders.schedule(assignment_obj)
+        emit("platform.assignment_added", f"Assignment '{assignment_obj.title}' added to platform.", assignment_id=assignment_obj.id)
         self._auto_export()
 
     def get_assignment_by_id(self, assignment_id):
         return self.assignments.get(assignment_id)
 
+    def _deadlines(self):
+        index = self._deadline_index
+        if index is None:
+            with self._locks["assignments"]:
+                if self._deadline_index is None:
+                    self._deadline_index = DeadlineIndex.from_rows(self._deadline_rows())
+                index = self._deadline_index
+        return index
+
+    def _deadline_rows(self):
+        # Stored and snapshot assignments are indexed from their columns so
+        # the lazy tables stay unloaded.
+        if self.storage is not None:
+            return self.storage.iter_columns("assignments", ("deadline", "class_id", "teacher_id"))
+        if self._snapshot is not None:
+            return self.assignments.iter_columns(("_deadline_ts", "class_id", "teacher_id"))
+        return ((assignment.id, assignment._deadline_ts, assignment.class_id, assignment.teacher_id) for assignment in self.assignments.values())
+
+    def _deadline_changed(self, assignment_obj):
+        with self._locks["assignments"]:
+            if self._deadline_index is not None:
+                self._deadline_index.add(assignment_obj)
+        if self.reminders is not None:
+            self.reminders.schedule(assignment_obj)
+
+    def start_reminders(self, offsets=DEFAULT_OFFSETS, parent_alert_delay=0.0, clock=None, background=True):
+        # Reminds students who have not submitted at each offset (seconds)
+        # before a deadline and alerts their parents parent_alert_delay
+        # seconds after it. With background=False, or a clock of your own,
+        # call reminders.run_due() to fire what is due.
+        if self.reminders is None:
+            # Published before seeding, so assignments added meanwhile are
+            # scheduled by add_assignment; scheduling twice is a no-op.
+            reminders = self.reminders = ReminderDispatcher(self, offsets, parent_alert_delay, clock or time.time)
+            reminders.schedule_pending(self._deadlines())
+            if background:
+                reminders.start()
+        return self.reminders
+
+    def stop_reminders(self, timeout=None):
+        reminders, self.reminders = self.reminders, None
+        if reminders is not None:
+            reminders.close(timeout)
+
+    def get_assignments_due(self, start=None, end=None, class_id=None, teacher_id=None):
+        # Assignments due between start and end, earliest first. Bounds are
+        # datetimes, ISO strings or epoch seconds; start defaults to now and
+        # end to no limit.
+        ids = self._deadlines().due_between(to_timestamp(start), None if end is None else to_timestamp(end), class_id, teacher_id)
+        return [self.assignments[assignment_id] for assignment_id in ids]
+
+    def get_overdue_assignments(self, class_id=None, teacher_id=None, ungraded_only=False, now=None):
+        # Past their deadline, earliest first; ungraded_only keeps those with
+        # submissions still waiting for a grade.
+        overdue = [self.assignments[assignment_id] for assignment_id in self._deadlines().overdue(to_timestamp(now), class_id, teacher_id)]
+        if ungraded_only:
+            overdue = [assignment for assignment in overdue if any(student_id not in assignment.grades for student_id in assignment.submissions)]
+        return overdue
+
+    def get_class_assignment_statuses(self, class_id, now=None):
+        # {assignment id: deadline, overall status and each student's status}
+        # for every assignment of the class, against one clock reading.
+        closed, still_open = self._deadlines().split(to_timestamp(now), class_id)
+        students = list(self.students_by_class.get(class_id, []))
+        statuses = {}
+        for assignment_ids, status in ((closed, "Closed (Past Deadline)"), (still_open, "Open")):
+            for assignment_id in assignment_ids:
+                assignment = self.assignments[assignment_id]
+                statuses[assignment_id] = {
+                    "title": assignment.title,
+                    "deadline": assignment.deadline,
+                    "status": status,
+                    "students": {student_id: assignment.get_status(student_id) for student_id in students}
+                }
+        return statuses
+
     def add_grade(self, grade_obj):
-        self.grades[grade_obj.id] = grade_obj
-        print(f"Grade {grade_obj.value} for student {grade_obj.student_id} added to platform.")
+        self._check_open()
+        with self._locks["grades"]:
+            self.grades[grade_obj.id] = grade_obj
+            grade_obj._platform = self
+            self._record_change("grades", grade_obj.id, INSERT, grade_obj)
+        emit("platform.grade_added", f"Grade {grade_obj.value} for student {grade_obj.student_id} added to platform.", grade_id=grade_obj.id, student_id=grade_obj.student_id)
         self._auto_export()
 
+    def _class_of(self, student_id):
+        student = self.students.get(student_id)
+        return student.grade if student is not None else None
+
+    def _student_class_changed(self, student_obj, old_class):
+        with self._locks["users"]:
+            if old_class != student_obj.grade and student_obj._id in self.students_by_class.get(old_class, []):
+                self.students_by_class[old_class].remove(student_obj._id)
+                self.students_by_class.setdefault(student_obj.grade, []).append(student_obj._id)
+        aggregates = self.grades.aggregates
+        with self._locks["grades"]:
+            aggregates.move_student(student_obj._id)
+
+    def get_student_stats(self, student_id, subject=None):
+        return self.grades.aggregates.student(student_id, subject).summary()
+
+    def get_class_stats(self, class_id):
+        return self.grades.aggregates.for_class(class_id).summary()
+
+    def get_teacher_stats(self, teacher_id):
+        return self.grades.aggregates.for_teacher(teacher_id).summary()
+
+    def get_class_leaderboard(self, class_id, k=10, bottom=False):
+        # [(student_id, average)], best first, or worst first with bottom=True.
+        leaderboard = self.grades.aggregates.leaderboard(class_id)
+        return leaderboard.bottom(k) if bottom else leaderboard.top(k)
+
     def add_schedule(self, schedule_obj):
+        with self._locks["schedules"]:
+            self._add_schedule(schedule_obj)
+        emit("platform.schedule_added", f"Schedule for class {schedule_obj.class_id} on {schedule_obj.day} added to platform.", schedule_id=schedule_obj.id)
+
+    def _add_schedule(self, schedule_obj):
         self.schedules[schedule_obj.id] = schedule_obj
-        print(f"Schedule for class {schedule_obj.class_id} on {schedule_obj.day} added to platform.")
+        schedule_obj._platform = self
+        for slot_time, lesson in schedule_obj.lessons.items():
+            self._book_teacher(schedule_obj, slot_time, lesson["teacher_id"])
+        self._record_change("schedules", schedule_obj.id, INSERT, schedule_obj)
+
+    def _book_teacher(self, schedule_obj, slot_time, teacher_id):
+        with self._locks["schedules"]:
+            self.teacher_slots.setdefault((schedule_obj.day, slot_time), {})[teacher_id] = schedule_obj.id
+            self.teacher_timetables.setdefault(teacher_id, {}).setdefault(schedule_obj.day, {})[slot_time] = schedule_obj.id
+
+    def _release_teacher(self, schedule_obj, slot_time, teacher_id):
+        with self._locks["schedules"]:
+            booked = self.teacher_slots.get((schedule_obj.day, slot_time))
+            if booked and booked.get(teacher_id) == schedule_obj.id:
+                del booked[teacher_id]
+                if not booked:
+                    del self.teacher_slots[(schedule_obj.day, slot_time)]
+            days = self.teacher_timetables.get(teacher_id)
+            if days and days.get(schedule_obj.day, {}).get(slot_time) == schedule_obj.id:
+                del days[schedule_obj.day][slot_time]
+                if not days[schedule_obj.day]:
+                    del days[schedule_obj.day]
+
+    def get_teacher_booking(self, teacher_id, day, slot_time):
+        schedule_id = self.teacher_slots.get((day, slot_time), {}).get(teacher_id)
+        return self.schedules.get(schedule_id) if schedule_id is not None else None
+
+    def get_teacher_timetable(self, teacher_id, day=None):
+        days = self.teacher_timetables.get(teacher_id, {})
+        timetable = {}
+        for lesson_day, slots in list(days.items()):
+            if day is not None and lesson_day != day:
+                continue
+            for slot_time, schedule_id in sorted(slots.items()):
+                schedule = self.schedules[schedule_id]
+                timetable.setdefault(lesson_day, {})[slot_time] = {"class_id": schedule.class_id, "subject": schedule.lessons[slot_time]["subject"], "schedule_id": schedule_id}
+        return timetable.get(day, {}) if day is not None else timetable
 
     def add_notification(self, notification_obj):
-        self.notifications[notification_obj.id] = notification_obj
+        with self._locks["notifications"]:
+            self.notifications[notification_obj.id] = notification_obj
+            self._record_change("notifications", notification_obj.id, INSERT, notification_obj)
+
+    def _record_change(self, table, key, op, obj):
+        if self._restoring:
+            return
+        if table == "notifications" and key not in self.notifications and op != UPDATE:
+            with self._locks["notifications"]:
+                self.user_notification_count += 1 if op == INSERT else -1
+        self.journal.record(table, key, op, obj)
+        if self.storage is not None:
+            self.storage.record(table, key, op, obj, platform_level=(table == "notifications" and key in self.notifications))
 
     def _auto_export(self):
-        print("\nPerforming automatic data export...")
-        self.export_to_xlsx(filename=current_dir/"auto_exported_files/auto_export.xlsx")
-        self.export_to_csv(filename_prefix=current_dir/"auto_exported_files/auto_export_")
-        self.export_to_sql(filename=current_dir/"auto_exported_files/auto_export.sql")
+        # "off" leaves exporting to explicit export_* calls, for bulk loads
+        # and benchmarks.
+        if self.auto_export_mode == "off":
+            return
+        if self._exporter is None:
+            self._run_auto_export()
+        else:
+            self._exporter.mark_dirty()
+
+    def _check_open(self):
+        # Writes that would schedule an auto-export are refused once close()
+        # has stopped the exporter, rather than quietly exporting in the
+        # caller. Callers check before changing anything.
+        if self._closed and self.auto_export_mode != "off":
+            raise RuntimeError("The platform is closed.")
+
+    def _take_export_snapshot(self, formats=("xlsx", "csv", "sql")):
+        # Platform writers and the entity mutators of attached objects take
+        # their collection's lock, so holding them all gives a stable view.
+        with self._locks:
+            return ExportSnapshot(self, formats)
+
+    def _run_auto_export(self):
+        emit("platform.run_auto_export", "\nPerforming automatic data export...")
+        if self.auto_export_mode == "delta":
+            # The workbook cannot be appended to cheaply, so delta auto-exports
+            # keep only the CSV and SQL files current.
+            export_to_csv(self, current_dir/"auto_exported_files/auto_export_", mode="delta")
+            export_to_sql(self, current_dir/"auto_exported_files/auto_export.sql", mode="delta")
+            formats = ["csv", "sql"]
+        else:
+            export_all(
+                self,
+                xlsx_filename=current_dir/"auto_exported_files/auto_export.xlsx",
+                csv_prefix=current_dir/"auto_exported_files/auto_export_",
+                sql_filename=current_dir/"auto_exported_files/auto_export.sql",
+                # Auto-exports are frequent and small: a process pool per run
+                # costs far more than it saves and needs a __main__ guard.
+                executor="thread"
+            )
+            formats = ["xlsx", "csv", "sql"]
         self.export_log.append({
             "timestamp": datetime.datetime.now().isoformat(),
             "action": "Auto Export",
-            "formats": ["xlsx", "csv", "sql"]
+            "mode": self.auto_export_mode,
+            "formats": formats
         })
-        print("Automatic export complete.")
+        emit("platform.run_auto_export", "Automatic export complete.")
+
+    def flush(self, timeout=None):
+        flushed = self._exporter.flush(timeout) if self._exporter is not None else True
+        if self.storage is not None:
+            self.storage.flush()
+        return flushed
+
+    def close(self, timeout=None):
+        self._closed = True
+        self.stop_reminders(timeout)
+        closed = self._exporter.close(timeout) if self._exporter is not None else True
+        if self.storage is not None:
+            self.storage.close()
+        self.events.flush(timeout)
+        return closed
+
+    def _revalidate_user(self, user_obj):
+        self.validation.update("user", user_obj._id, validate_user(user_obj))
 
     def validate_data_for_export(self):
-        print("Validating data for export...")
-        is_valid = True
-        for user_id, user in self.users.items():
-            if not user._full_name or not user._email:
-                print(f"Validation Error: User {user_id} has empty full_name or email.")
-                is_valid = False
-        if is_valid:
-            print("Data validation successful.")
-        else:
-            print("Data validation failed. Check for errors.")
-        return is_valid
+        return self.validation.is_valid()
 
-    def export_to_xlsx(self, filename=current_dir/"eduplatform_dataset_files/eduplatform_data.xlsx"):
-        export_to_xlsx(self, filename)
+    def validation_report(self):
+        return self.validation.report()
 
-    def export_to_csv(self, filename_prefix=current_dir/"eduplatform_dataset_files/edueduplatform_data_"):
-        export_to_csv(self, filename_prefix)
+    def export_to_xlsx(self, filename=current_dir/"eduplatform_dataset_files/eduplatform_data.xlsx", streaming=False):
+        export_to_xlsx(self, filename, streaming=streaming)
 
-    def export_to_sql(self, filename=current_dir/"eduplatform_dataset_files/eduplatform_data.sql"):
-        export_to_sql(self, filename)
+    def export_to_csv(self, filename_prefix=current_dir/"eduplatform_dataset_files/edueduplatform_data_", mode="full"):
+        export_to_csv(self, filename_prefix, mode=mode)
 
-    def _scrape_data(self, url="https://www.olx.uz/"):pass
+    def export_to_sql(self, filename=current_dir/"eduplatform_dataset_files/eduplatform_data.sql", mode="full", batch_size=500):
+        export_to_sql(self, filename, mode=mode, batch_size=batch_size)
+
+    def export_to_sqlite(self, filename=current_dir/"eduplatform_dataset_files/eduplatform_data.sqlite"):
+        export_to_sqlite(self, filename)
+
+    def export_all(self, xlsx_filename=current_dir/"eduplatform_dataset_files/eduplatform_data.xlsx",
+                   csv_prefix=current_dir/"eduplatform_dataset_files/edueduplatform_data_",
+                   sql_filename=current_dir/"eduplatform_dataset_files/eduplatform_data.sql",
+                   executor=None):
+        return export_all(self, xlsx_filename, csv_prefix, sql_filename, executor=executor)
 
+    def build_report(self, include_students=True):
+        # The rows are produced under the locks so the report is one
+        # consistent view; rendering happens after they are released.
+        with self._locks:
+            return build_platform_report(self, include_students).freeze()
+
+    def export_report(self, filename=current_dir/"eduplatform_dataset_files/eduplatform_report.txt", fmt="text", include_students=True):
+        write_report(self.build_report(include_students), filename, fmt)
+        emit("platform.export_report", f"Report exported to {filename} ({fmt}).")
+        return filename
+
+    def import_roster(self, filename, workers=0, chunk_size=5000):
+        return import_roster(self, filename, workers, chunk_size)
+
+    def metrics(self):
+        # {operation: count, errors, total/mean/max seconds and cumulative
+        # latency buckets}; empty unless instrumentation is enabled.
+        return instrumentation.snapshot()
+
+    def export_metrics(self, filename=current_dir/"eduplatform_dataset_files/eduplatform_metrics.prom"):
+        instrumentation.write_prometheus(filename)
+        emit("platform.export_metrics", f"Metrics exported to {filename}.")
+        return filename
+
+    def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, **kwargs):
+        # Blocks serving the HTTP/JSON API until interrupted.
+        return run_server(self, host, port, **kwargs)
+
+    def _scrape_data(self, url="https://www.olx.uz/"):pass
 
 
+instrumentation.register_class(EduPlatform, extra=("_take_export_snapshot",))
@@ -0,0 +1,94 @@
+import bisect
+
+_ALL = object()
+
+
+class DeadlineIndex:
+    # Assignment deadlines as sorted (timestamp, assignment id) lists: one
+    # over every assignment, one per class and one per teacher. Range
+    # queries bisect into the list they need, so "due in the next two days"
+    # costs O(log n) plus the size of the answer.
+    def __init__(self):
+        self._lists = {_ALL: []}
+        self._entries = {}
+
+    @classmethod
+    def build(cls, assignments):
+        return cls.from_rows((assignment.id, assignment._deadline_ts, assignment.class_id, assignment.teacher_id) for assignment in assignments)
+
+    @classmethod
+    def from_rows(cls, rows):
+        # rows are (assignment id, deadline timestamp, class id, teacher id),
+        # as read from storage or a snapshot without building assignments.
+        index = cls()
+        entries = sorted((timestamp, assignment_id, class_id, teacher_id) for assignment_id, timestamp, class_id, teacher_id in rows)
+        for timestamp, assignment_id, class_id, teacher_id in entries:
+            index._entries[assignment_id] = (timestamp, class_id, teacher_id)
+            for key in (_ALL, ("class", class_id), ("teacher", teacher_id)):
+                index._lists.setdefault(key, []).append((timestamp, assignment_id))
+        return index
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, assignment_id):
+        return assignment_id in self._entries
+
+    def deadline_of(self, assignment_id):
+        return self._entries[assignment_id][0]
+
+    def add(self, assignment):
+        if assignment.id in self._entries:
+            self.remove(assignment.id)
+        entry = (assignment._deadline_ts, assignment.id)
+        self._entries[assignment.id] = (assignment._deadline_ts, assignment.class_id, assignment.teacher_id)
+        for key in (_ALL, ("class", assignment.class_id), ("teacher", assignment.teacher_id)):
+            bisect.insort(self._lists.setdefault(key, []), entry)
+
+    def remove(self, assignment_id):
+        timestamp, class_id, teacher_id = self._entries.pop(assignment_id)
+        entry = (timestamp, assignment_id)
+        for key in (_ALL, ("class", class_id), ("teacher", teacher_id)):
+            entries = self._lists[key]
+            del entries[bisect.bisect_left(entries, entry)]
+
+    def _list(self, class_id, teacher_id):
+        # With both filters, walk the shorter list and check the other.
+        if class_id is None and teacher_id is None:
+            return self._lists[_ALL], None
+        if teacher_id is None:
+            return self._lists.get(("class", class_id), []), None
+        if class_id is None:
+            return self._lists.get(("teacher", teacher_id), []), None
+        by_class = self._lists.get(("class", class_id), [])
+        by_teacher = self._lists.get(("teacher", teacher_id), [])
+        if len(by_class) <= len(by_teacher):
+            return by_class, lambda assignment_id: self._entries[assignment_id][2] == teacher_id
+        return by_teacher, lambda assignment_id: self._entries[assignment_id][1] == class_id
+
+    def due_between(self, start=None, end=None, class_id=None, teacher_id=None):
+        # Ids of assignments with start <= deadline <= end, earliest first;
+        # either bound may be None for an open range.
+        entries, keep = self._list(class_id, teacher_id)
+        low = 0 if start is None else bisect.bisect_left(entries, (start,))
+        high = len(entries) if end is None else bisect.bisect_right(entries, (end, float("inf")))
+        ids = [assignment_id for _, assignment_id in entries[low:high]]
+        return ids if keep is None else [assignment_id for assignment_id in ids if keep(assignment_id)]
+
+    def overdue(self, now, class_id=None, teacher_id=None):
+        # Deadlines strictly before now; an assignment due exactly now is
+        # still open.
+        entries, keep = self._list(class_id, teacher_id)
+        ids = [assignment_id for _, assignment_id in entries[:bisect.bisect_left(entries, (now,))]]
+        return ids if keep is None else [assignment_id for assignment_id in ids if keep(assignment_id)]
+
+    def split(self, now, class_id=None, teacher_id=None):
+        # (overdue ids, open ids) with a single bisect, for bulk statuses.
+        entries, keep = self._list(class_id, teacher_id)
+        cut = bisect.bisect_left(entries, (now,))
+        closed = [assignment_id for _, assignment_id in entries[:cut]]
+        still_open = [assignment_id for _, assignment_id in entries[cut:]]
+        if keep is not None:
+            closed = [assignment_id for assignment_id in closed if keep(assignment_id)]
+            still_open = [assignment_id for assignment_id in still_open if keep(assignment_id)]
+        return closed, still_open
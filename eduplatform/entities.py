@@ -1,31 +1,79 @@
+import contextlib
 import datetime 
+import sys
+import time
+from eduplatform.abstracts import Slotted, to_isoformat, to_timestamp
+from eduplatform.concurrency import allocate_id
 from eduplatform.enums import AssignmentDifficulty
+from eduplatform.journal import UPDATE
+from eduplatform.events import emit, ERROR
 
-class Assignment:
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Assignment(Slotted):
+    # __weakref__ keeps assignments usable in the lazy tables' weak caches.
+    __slots__ = ("id", "title", "description", "_deadline_ts", "subject", "teacher_id", "class_id", "difficulty",
+                 "submissions", "grades", "_platform", "__weakref__")
     _next_id = 1
 
     def __init__(self, title, description, deadline, subject, teacher_id, class_id, difficulty=AssignmentDifficulty.MEDIUM):
-        self.id = Assignment._next_id
-        Assignment._next_id += 1
+        self.id = allocate_id(Assignment)
         self.title = title
         self.description = description
-        self.deadline = deadline
-        self.subject = subject
+        # Parsed once; ISO strings with an offset keep their instant.
+        self._deadline_ts = to_timestamp(deadline)
+        self.subject = _intern(subject)
         self.teacher_id = teacher_id
-        self.class_id = class_id
+        self.class_id = _intern(class_id)
         self.difficulty = difficulty
         self.submissions = {}
         self.grades = {}
+        self._platform = None
+
+    @property
+    def deadline(self):
+        return to_isoformat(self._deadline_ts)
+
+    @deadline.setter
+    def deadline(self, value):
+        # Older storage files hold the ISO string under "deadline"; their
+        # state is restored before the platform is attached.
+        self._deadline_ts = to_timestamp(value)
+        if getattr(self, "_platform", None) is not None:
+            self._platform._deadline_changed(self)
+            self._record_change()
+
+    @property
+    def deadline_at(self):
+        return datetime.datetime.fromtimestamp(self._deadline_ts, datetime.timezone.utc)
+
+    def is_overdue(self, now=None):
+        return (time.time() if now is None else now) > self._deadline_ts
+
+    def _record_change(self, op=UPDATE):
+        if self._platform is not None:
+            self._platform._record_change("assignments", self.id, op, self)
+
+    def _lock(self):
+        # submissions and grades are changed under the platform's
+        # assignments lock so an export snapshot never sees them mid-update.
+        return self._platform._locks["assignments"] if self._platform is not None else contextlib.nullcontext()
 
     def add_submission(self, student_id, content):
-        self.submissions[student_id] = content
-        print(f"Submission for assignment '{self.title}' added by student {student_id}.")
+        with self._lock():
+            self.submissions[student_id] = content
+            self._record_change()
+        emit("assignment.submission_added", f"Submission for assignment '{self.title}' added by student {student_id}.", assignment_id=self.id, student_id=student_id)
 
     def set_grade(self, student_id, grade_value):
-        self.grades[student_id] = grade_value
-        print(f"Grade {grade_value} set for student {student_id} on assignment '{self.title}'.")
+        with self._lock():
+            self.grades[student_id] = grade_value
+            self._record_change()
+        emit("assignment.graded", f"Grade {grade_value} set for student {student_id} on assignment '{self.title}'.", assignment_id=self.id, student_id=student_id, value=grade_value)
 
-    def get_status(self, student_id=None):
+    def get_status(self, student_id=None, now=None):
         if student_id:
             if student_id in self.grades:
                 return f"Graded: {self.grades[student_id]}"
@@ -33,33 +81,101 @@ class Assignment:
                 return "Submitted (Not Graded)"
             else:
                 return "Not Submitted"
-        
-        now = datetime.datetime.now().isoformat()
-        if now > self.deadline:
+
+        if self.is_overdue(now):
             return "Closed (Past Deadline)"
         return "Open"
 
+class GradeField:
+    # A Grade attribute that lives in a slot of its own until the grade is
+    # added to a GradeStore and is read from and written to the store's
+    # columns after. encode and decode convert between the public value and
+    # the one kept in the slot.
+    def __init__(self, encode=None, decode=None):
+        self.encode = encode
+        self.decode = decode
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = "_" + name
+
+    def __get__(self, grade, owner=None):
+        if grade is None:
+            return self
+        if grade._store is None:
+            try:
+                value = getattr(grade, self.slot)
+            except AttributeError:
+                raise AttributeError(self.name) from None
+            return self.decode(value) if self.decode else value
+        return grade._store.get_field(grade._row, self.name)
+
+    def __set__(self, grade, value):
+        if grade._store is None:
+            setattr(grade, self.slot, self.encode(value) if self.encode else value)
+        else:
+            grade._store.set_field(grade._row, self.name, value)
+
+
 class Grade:
+    FIELDS = ("student_id", "subject", "value", "date", "teacher_id", "comment")
+    __slots__ = ("id", "_store", "_row", "_platform") + tuple("_" + field for field in FIELDS)
     _next_id = 1
 
+    student_id = GradeField()
+    subject = GradeField(encode=_intern)
+    value = GradeField()
+    date = GradeField(encode=to_timestamp, decode=to_isoformat)
+    teacher_id = GradeField()
+    comment = GradeField()
+
     def __init__(self, student_id, subject, value, teacher_id, comment=""):
-        self.id = Grade._next_id
-        Grade._next_id += 1
+        self.id = allocate_id(Grade)
+        self._store = None
+        self._row = None
+        self._platform = None
         self.student_id = student_id
         self.subject = subject
         self.value = value
-        self.date = datetime.datetime.now().isoformat()
+        self._date = time.time()
         self.teacher_id = teacher_id
         self.comment = comment
 
+    def __getstate__(self):
+        # Always the plain field values, whether or not the grade is a view.
+        state = {"id": self.id}
+        for field in Grade.FIELDS:
+            state[field] = getattr(self, field)
+        return state
+
+    def __setstate__(self, state):
+        self._store = None
+        self._row = None
+        self._platform = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _release_fields(self):
+        # Called once the store holds the values.
+        for field in Grade.FIELDS:
+            try:
+                delattr(self, "_" + field)
+            except AttributeError:
+                pass
+
+    def _record_change(self, op=UPDATE):
+        if self._platform is not None:
+            self._platform._record_change("grades", self.id, op, self)
+
     def update_grade(self, new_value, new_comment=""):
         if not (1 <= new_value <= 5):
-            print("Error: Grade value must be between 1 and 5.")
+            emit("grade.update_grade", "Error: Grade value must be between 1 and 5.", level=ERROR)
             return False
         self.value = new_value
         self.comment = new_comment
         self.date = datetime.datetime.now().isoformat()
-        print(f"Grade {self.id} updated to {self.value}.")
+        self._record_change()
+        emit("grade.updated", f"Grade {self.id} updated to {self.value}.", grade_id=self.id, value=new_value)
         return True
 
     def get_grade_info(self):
@@ -73,66 +189,92 @@ class Grade:
             "comment": self.comment
         }
 
-class Schedule:
+class Schedule(Slotted):
+    __slots__ = ("id", "class_id", "day", "lessons", "_platform")
     _next_id = 1
 
     def __init__(self, class_id, day):
-        self.id = Schedule._next_id
-        Schedule._next_id += 1
-        self.class_id = class_id
-        self.day = day
+        self.id = allocate_id(Schedule)
+        self.class_id = _intern(class_id)
+        self.day = _intern(day)
         self.lessons = {}
+        self._platform = None
 
-    def add_lesson(self, time, subject, teacher_id, edu_platform):
-        if time in self.lessons:
-            print(f"Error: A lesson already exists at {time} for class {self.class_id} on {self.day}.")
-            return False
+    def _record_change(self, op=UPDATE):
+        if self._platform is not None:
+            self._platform._record_change("schedules", self.id, op, self)
+
+    def _lock(self):
+        return self._platform._locks["schedules"] if self._platform is not None else contextlib.nullcontext()
 
-        for sch_id, schedule in edu_platform.schedules.items():
-            if schedule.day == self.day and time in schedule.lessons:
-                existing_lesson = schedule.lessons[time]
-                if existing_lesson.get("teacher_id") == teacher_id:
-                    print(f"Error: Teacher {teacher_id} is already scheduled to teach {existing_lesson['subject']} in class {schedule.class_id} at {time} on {self.day}.")
-                    return False
+    def add_lesson(self, slot_time, subject, teacher_id, edu_platform):
+        # The checks and the booking happen under the schedules lock so two
+        # threads cannot book the same teacher into one slot.
+        with edu_platform._locks["schedules"]:
+            if slot_time in self.lessons:
+                emit("schedule.add_lesson", f"Error: A lesson already exists at {slot_time} for class {self.class_id} on {self.day}.", level=ERROR)
+                return False
 
-        self.lessons[time] = {"subject": subject, "teacher_id": teacher_id}
-        print(f"Lesson '{subject}' added for class {self.class_id} at {time} on {self.day}.")
+            schedule = edu_platform.get_teacher_booking(teacher_id, self.day, slot_time)
+            if schedule is not None:
+                existing_lesson = schedule.lessons[slot_time]
+                emit("schedule.add_lesson", f"Error: Teacher {teacher_id} is already scheduled to teach {existing_lesson['subject']} in class {schedule.class_id} at {slot_time} on {self.day}.", level=ERROR)
+                return False
+
+            self.lessons[slot_time] = {"subject": subject, "teacher_id": teacher_id}
+            if self._platform is not None:
+                self._platform._book_teacher(self, slot_time, teacher_id)
+        self._record_change()
+        emit("schedule.lesson_added", f"Lesson '{subject}' added for class {self.class_id} at {slot_time} on {self.day}.", schedule_id=self.id, time=slot_time, teacher_id=teacher_id)
         return True
 
     def view_schedule(self):
-        print(f"\nSchedule for Class {self.class_id} on {self.day}:")
+        emit("schedule.view_schedule", f"\nSchedule for Class {self.class_id} on {self.day}:")
         if not self.lessons:
-            print("  No lessons scheduled.")
+            emit("schedule.view_schedule", "  No lessons scheduled.")
             return {}
         
         sorted_lessons = sorted(self.lessons.items())
-        for time, details in sorted_lessons:
-            print(f"  - {time}: Subject: {details['subject']}, Teacher ID: {details['teacher_id']}")
+        for slot_time, details in sorted_lessons:
+            emit("schedule.view_schedule", f"  - {slot_time}: Subject: {details['subject']}, Teacher ID: {details['teacher_id']}")
         return self.lessons
 
-    def remove_lesson(self, time):
-        if time in self.lessons:
-            del self.lessons[time]
-            print(f"Lesson at {time} removed from schedule for class {self.class_id} on {self.day}.")
+    def remove_lesson(self, slot_time):
+        with self._lock():
+            lesson = self.lessons.pop(slot_time, None)
+            if lesson is not None:
+                if self._platform is not None:
+                    self._platform._release_teacher(self, slot_time, lesson["teacher_id"])
+                self._record_change()
+        if lesson is not None:
+            emit("schedule.remove_lesson", f"Lesson at {slot_time} removed from schedule for class {self.class_id} on {self.day}.")
             return True
-        print(f"Error: No lesson found at {time} for class {self.class_id} on {self.day}.")
+        emit("schedule.remove_lesson", f"Error: No lesson found at {slot_time} for class {self.class_id} on {self.day}.", level=ERROR)
         return False
 
 
-class Notification:
+class Notification(Slotted):
+    __slots__ = ("id", "message", "recipient_id", "_created_ts", "is_read", "priority")
     _next_id = 1
 
     def __init__(self, message, recipient_id, created_at=None, is_read=False, priority=0):
-        self.id = Notification._next_id
-        Notification._next_id += 1
+        self.id = allocate_id(Notification)
         self.message = message
         self.recipient_id = recipient_id
-        self.created_at = created_at if created_at else datetime.datetime.now().isoformat()
+        self._created_ts = to_timestamp(created_at or None)
         self.is_read = is_read
         self.priority = priority
 
+    @property
+    def created_at(self):
+        return to_isoformat(self._created_ts)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_ts = to_timestamp(value)
+
     def send(self):
-        print(f"Notification {self.id} (for {self.recipient_id}) is ready to be sent.")
+        emit("notification.send", f"Notification {self.id} (for {self.recipient_id}) is ready to be sent.")
 
     def mark_as_read(self):
         self.is_read = True
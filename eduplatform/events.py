@@ -0,0 +1,184 @@
+import collections
+import contextlib
+import datetime
+import json
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+
+class Event:
+    __slots__ = ("name", "level", "message", "fields", "timestamp")
+
+    def __init__(self, name, level, message, fields):
+        self.name = name
+        self.level = level
+        self.message = message
+        self.fields = fields
+        self.timestamp = time.time()
+
+    def to_dict(self):
+        return {
+            "timestamp": datetime.datetime.fromtimestamp(self.timestamp).isoformat(),
+            "level": LEVEL_NAMES.get(self.level, str(self.level)),
+            "event": self.name,
+            "message": self.message.strip(),
+            **self.fields
+        }
+
+
+class ConsoleSink:
+    # Prints each message as the platform always has. The stream is looked up
+    # per write so redirect_stdout keeps working.
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, event):
+        print(event.message, file=self.stream or sys.stdout)
+
+    def write_many(self, events):
+        (self.stream or sys.stdout).write("".join(event.message + "\n" for event in events))
+
+
+class JSONLinesSink:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, event):
+        self.stream.write(json.dumps(event.to_dict(), default=str) + "\n")
+
+    def write_many(self, events):
+        self.stream.write("".join(json.dumps(event.to_dict(), default=str) + "\n" for event in events))
+
+
+class MemorySink:
+    # Keeps the most recent events for inspection.
+    def __init__(self, maxlen=10000):
+        self.events = collections.deque(maxlen=maxlen)
+
+    def write(self, event):
+        self.events.append(event)
+
+    def write_many(self, events):
+        self.events.extend(events)
+
+
+class BufferedSink:
+    # Queues events and hands them to the wrapped sink in batches from a
+    # background thread, so callers never wait on terminal or file I/O.
+    def __init__(self, sink, capacity=1024, flush_interval=0.2):
+        self.sink = sink
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._pending = 0
+        self._thread = threading.Thread(target=self._run, name="eduplatform-events", daemon=True)
+        self._thread.start()
+
+    def write(self, event):
+        with self._condition:
+            self._buffer.append(event)
+            if len(self._buffer) >= self.capacity:
+                self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._buffer and not self._closed:
+                    self._condition.wait(self.flush_interval)
+                batch, self._buffer = self._buffer, []
+                self._pending = len(batch)
+                closed = self._closed
+            if batch:
+                try:
+                    self.sink.write_many(batch)
+                except Exception as e:
+                    sys.stderr.write(f"Error writing events: {e}\n")
+            with self._condition:
+                self._pending = 0
+                self._condition.notify_all()
+            if closed and not batch:
+                return
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify_all()
+            while self._buffer or self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+
+class EventBus:
+    # Platform-wide event surface. With no sink (silent mode) emit returns
+    # before building anything.
+    def __init__(self, sink=None, level=INFO):
+        self.sink = sink
+        self.level = level
+
+    def emit(self, name, message, level=INFO, **fields):
+        sink = self.sink
+        if sink is None or level < self.level:
+            return
+        sink.write(Event(name, level, message, fields))
+
+    def enabled(self, level=INFO):
+        return self.sink is not None and level >= self.level
+
+    def set_sink(self, sink, level=None):
+        previous = self.sink
+        self.sink = sink
+        if level is not None:
+            self.level = level
+        return previous
+
+    @property
+    def silent(self):
+        return self.sink is None
+
+    @contextlib.contextmanager
+    def using(self, sink, level=None):
+        # Swaps the sink (and level) for the duration of the block.
+        previous_level = self.level
+        previous = self.set_sink(sink, level)
+        try:
+            yield sink
+        finally:
+            self.sink = previous
+            self.level = previous_level
+
+    def silenced(self):
+        return self.using(None)
+
+    def flush(self, timeout=None):
+        flush = getattr(self.sink, "flush", None)
+        if flush is not None:
+            return flush(timeout)
+        return True
+
+
+bus = EventBus(ConsoleSink())
+
+
+def emit(name, message, level=INFO, **fields):
+    sink = bus.sink
+    if sink is None or level < bus.level:
+        return
+    sink.write(Event(name, level, message, fields))
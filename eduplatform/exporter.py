@@ -0,0 +1,89 @@
+import threading
+import time
+from eduplatform.events import emit, ERROR
+
+
+class BackgroundExporter:
+    # Write-behind exporter: writes only mark the platform dirty, a worker
+    # thread runs one export per burst once the coalescing window has passed.
+    def __init__(self, export_func, delay=1.0):
+        self._export_func = export_func
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._dirty_since = None
+        self._pending_writes = 0
+        self._flush_requested = False
+        self._exporting = False
+        self._closed = False
+        self._thread = None
+        self.exports_run = 0
+        self.writes_coalesced = 0
+
+    def mark_dirty(self):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("The background exporter is closed.")
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+            self._pending_writes += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="eduplatform-auto-export", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def is_dirty(self):
+        with self._cond:
+            return self._dirty_since is not None or self._exporting
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._dirty_since is None and not self._closed:
+                    self._cond.wait()
+                if self._dirty_since is None:
+                    return
+                while not self._flush_requested and not self._closed:
+                    remaining = self._dirty_since + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self.writes_coalesced += self._pending_writes
+                self._pending_writes = 0
+                self._dirty_since = None
+                self._flush_requested = False
+                self._exporting = True
+            try:
+                self._export_func()
+            except Exception as e:
+                emit("exporter.run", f"Error during automatic export: {e}", level=ERROR)
+            finally:
+                with self._cond:
+                    self._exporting = False
+                    self.exports_run += 1
+                    self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._dirty_since is not None:
+                self._flush_requested = True
+                self._cond.notify_all()
+            while self._dirty_since is not None or self._exporting:
+                if deadline is None:
+                    self._cond.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return flushed
@@ -0,0 +1,265 @@
+import array
+import bisect
+import collections.abc
+import sys
+import threading
+from eduplatform.abstracts import to_isoformat, to_timestamp
+from eduplatform.aggregates import GradeAggregates
+from eduplatform.concurrency import allocate_id
+from eduplatform.entities import Grade
+
+
+class GradeStore(collections.abc.MutableMapping):
+    # Column-oriented grade table. Each grade is one row across typed arrays;
+    # subjects are dictionary-encoded, dates are epoch seconds and comments
+    # are kept only for the rows that have one. Rows are found by binary
+    # search over the ids, which are appended in increasing order. The rare
+    # out-of-order id goes to a small side index and its slot in the id
+    # column repeats the previous id so the column stays sorted. Grade
+    # objects handed out are views over a row. Every change is mirrored into
+    # the running aggregates. Writes hold lock; readers index the arrays
+    # without it. Values are doubles so half grades fit; whole ones read
+    # back as ints.
+    def __init__(self, on_load=None, loader=None, class_of=None, lock=None):
+        self._on_load = on_load
+        self._loader = loader
+        self._lock = lock if lock is not None else threading.RLock()
+        self._aggregates = GradeAggregates(class_of)
+        self._ids = array.array("q")
+        self._student_ids = array.array("i")
+        self._teacher_ids = array.array("i")
+        self._values = array.array("d")
+        self._subject_codes = array.array("H")
+        self._dates = array.array("d")
+        self._alive = bytearray()
+        self._comments = {}
+        self._subjects = []
+        self._subject_index = {}
+        self._unordered = {}
+        self._unordered_rows = {}
+        self._by_student = {}
+        self._count = 0
+
+    def _ensure_loaded(self):
+        if self._loader is not None:
+            with self._lock:
+                if self._loader is None:
+                    return
+                loader, self._loader = self._loader, None
+                for grade in loader():
+                    self.add(grade)
+
+    @property
+    def aggregates(self):
+        self._ensure_loaded()
+        return self._aggregates
+
+    def _subject_code(self, subject):
+        code = self._subject_index.get(subject)
+        if code is None:
+            code = len(self._subjects)
+            self._subjects.append(subject)
+            self._subject_index[subject] = code
+        return code
+
+    def _row_of(self, grade_id):
+        row = self._unordered.get(grade_id)
+        if row is None:
+            row = bisect.bisect_left(self._ids, grade_id)
+            if row == len(self._ids) or self._ids[row] != grade_id or row in self._unordered_rows:
+                return None
+        return row if self._alive[row] else None
+
+    def _value(self, row):
+        value = self._values[row]
+        return int(value) if value.is_integer() else value
+
+    def _id_at(self, row):
+        if self._unordered_rows:
+            return self._unordered_rows.get(row, self._ids[row])
+        return self._ids[row]
+
+    def append(self, student_id, subject, value, teacher_id, comment="", date=None, grade_id=None):
+        # Adds a row without building a Grade; returns the grade id.
+        self._ensure_loaded()
+        if grade_id is None:
+            grade_id = allocate_id(Grade)
+        with self._lock:
+            return self._append(student_id, subject, value, teacher_id, comment, date, grade_id)
+
+    def _append(self, student_id, subject, value, teacher_id, comment, date, grade_id):
+        # The id column is written last: a row is visible to readers once
+        # every other column has it.
+        row = len(self._ids)
+        self._student_ids.append(student_id)
+        self._teacher_ids.append(teacher_id)
+        self._values.append(value)
+        self._subject_codes.append(self._subject_code(subject))
+        self._dates.append(to_timestamp(date or None))
+        self._alive.append(1)
+        if comment:
+            self._comments[row] = comment
+        rows = self._by_student.get(student_id)
+        if rows is None:
+            rows = self._by_student[student_id] = array.array("i")
+        rows.append(row)
+        if self._ids and grade_id <= self._ids[-1]:
+            self._unordered_rows[row] = grade_id
+            self._unordered[grade_id] = row
+            self._ids.append(self._ids[-1])
+        else:
+            self._ids.append(grade_id)
+        self._count += 1
+        self._aggregates.add(student_id, subject, teacher_id, value)
+        return grade_id
+
+    def add(self, grade):
+        # Moves a standalone Grade into the store; the object becomes a view.
+        self._ensure_loaded()
+        state = grade.__getstate__()
+        with self._lock:
+            existing = self._row_of(grade.id)
+            if existing is not None:
+                self._kill(existing)
+            self._append(state["student_id"], state["subject"], state["value"], state["teacher_id"], state["comment"], state["date"], grade.id)
+            grade._release_fields()
+            grade._store = self
+            grade._row = len(self._ids) - 1
+        return grade
+
+    def get_field(self, row, name):
+        if name == "student_id":
+            return self._student_ids[row]
+        if name == "subject":
+            return self._subjects[self._subject_codes[row]]
+        if name == "value":
+            return self._value(row)
+        if name == "date":
+            return to_isoformat(self._dates[row])
+        if name == "teacher_id":
+            return self._teacher_ids[row]
+        if name == "comment":
+            return self._comments.get(row, "")
+        raise AttributeError(name)
+
+    def _row_key(self, row):
+        return self._student_ids[row], self._subjects[self._subject_codes[row]], self._teacher_ids[row], self._value(row)
+
+    def set_field(self, row, name, value):
+        with self._lock:
+            tracked = name in ("student_id", "subject", "value", "teacher_id") and self._alive[row]
+            if tracked:
+                self._aggregates.remove(*self._row_key(row))
+            self._set_column(row, name, value)
+            if tracked:
+                self._aggregates.add(*self._row_key(row))
+
+    def _set_column(self, row, name, value):
+        if name == "student_id":
+            self._by_student[self._student_ids[row]].remove(row)
+            self._by_student.setdefault(value, array.array("i")).append(row)
+            self._student_ids[row] = value
+        elif name == "subject":
+            self._subject_codes[row] = self._subject_code(value)
+        elif name == "value":
+            self._values[row] = value
+        elif name == "date":
+            self._dates[row] = to_timestamp(value)
+        elif name == "teacher_id":
+            self._teacher_ids[row] = value
+        elif name == "comment":
+            if value:
+                self._comments[row] = value
+            else:
+                self._comments.pop(row, None)
+        else:
+            raise AttributeError(name)
+
+    def _view(self, row):
+        grade = Grade.__new__(Grade)
+        grade.id = self._id_at(row)
+        grade._store = self
+        grade._row = row
+        grade._platform = None
+        if self._on_load is not None:
+            self._on_load(grade)
+        return grade
+
+    def _kill(self, row):
+        self._aggregates.remove(*self._row_key(row))
+        self._alive[row] = 0
+        self._comments.pop(row, None)
+        self._count -= 1
+
+    def _student_rows(self, student_id):
+        self._ensure_loaded()
+        alive = self._alive
+        return [row for row in self._by_student.get(student_id, ()) if alive[row]]
+
+    def values_by_subject(self, student_id):
+        grades = {}
+        for row in self._student_rows(student_id):
+            grades.setdefault(self._subjects[self._subject_codes[row]], []).append(self._value(row))
+        return grades
+
+    def student_values(self, student_id, subject=None):
+        code = None
+        if subject is not None:
+            code = self._subject_index.get(subject)
+            if code is None:
+                return []
+        return [self._value(row) for row in self._student_rows(student_id) if code is None or self._subject_codes[row] == code]
+
+    def __getitem__(self, grade_id):
+        self._ensure_loaded()
+        row = self._row_of(grade_id)
+        if row is None:
+            raise KeyError(grade_id)
+        return self._view(row)
+
+    def __setitem__(self, grade_id, grade):
+        if grade._store is self and self._id_at(grade._row) == grade_id:
+            return
+        if grade._store is not None:
+            state = grade.__getstate__()
+            grade = Grade.__new__(Grade)
+            grade.__setstate__(state)
+        self.add(grade)
+
+    def __delitem__(self, grade_id):
+        self._ensure_loaded()
+        with self._lock:
+            row = self._row_of(grade_id)
+            if row is None:
+                raise KeyError(grade_id)
+            self._kill(row)
+
+    def __contains__(self, grade_id):
+        self._ensure_loaded()
+        return self._row_of(grade_id) is not None
+
+    def __iter__(self):
+        self._ensure_loaded()
+        for row in range(len(self._ids)):
+            if self._alive[row]:
+                yield self._id_at(row)
+
+    def __len__(self):
+        self._ensure_loaded()
+        return self._count
+
+    def values(self):
+        self._ensure_loaded()
+        return (self._view(row) for row in range(len(self._ids)) if self._alive[row])
+
+    def items(self):
+        self._ensure_loaded()
+        return ((self._id_at(row), self._view(row)) for row in range(len(self._ids)) if self._alive[row])
+
+    def memory_usage(self):
+        # Bytes held by the columns and indexes, excluding the subject names.
+        columns = (self._ids, self._student_ids, self._teacher_ids, self._values, self._subject_codes, self._dates, self._alive)
+        total = sum(sys.getsizeof(column) for column in columns)
+        total += sys.getsizeof(self._by_student) + sum(sys.getsizeof(rows) for rows in self._by_student.values())
+        total += sys.getsizeof(self._comments) + sys.getsizeof(self._unordered) + sys.getsizeof(self._unordered_rows)
+        return total
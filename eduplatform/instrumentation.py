@@ -0,0 +1,177 @@
+import bisect
+import functools
+import inspect
+import sys
+import threading
+import time
+
+# Upper bounds in seconds; the last bucket catches everything slower.
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class OperationStats:
+    __slots__ = ("count", "errors", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(BUCKETS + (float("inf"),), self.buckets):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else repr(bound)] = cumulative
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+            "buckets": buckets
+        }
+
+
+class Instrumentation:
+    # Call counts, cumulative time and latency histograms per operation.
+    # Instrumented methods and export stages are registered up front, but
+    # only wrapped while instrumentation is enabled: disabled, the original
+    # functions are in place and cost nothing extra.
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._classes = []
+        self._functions = []
+        self._originals = []
+
+    def register_class(self, cls, extra=()):
+        # Public functions defined on cls itself, plus any named in extra.
+        # Operations are named after the class of the instance, so methods
+        # inherited from User are counted per role.
+        self._classes.append((cls, extra))
+        if self.enabled:
+            self._wrap_class(cls, extra)
+
+    def register_functions(self, module_name, names, prefix):
+        # Module level functions, looked up through the module's globals by
+        # their callers, so replacing the attribute instruments every call.
+        self._functions.append((module_name, names, prefix))
+        if self.enabled:
+            self._wrap_functions(module_name, names, prefix)
+
+    def enable(self):
+        with self._lock:
+            if self.enabled:
+                return
+            self.enabled = True
+        for cls, extra in self._classes:
+            self._wrap_class(cls, extra)
+        for module_name, names, prefix in self._functions:
+            self._wrap_functions(module_name, names, prefix)
+
+    def disable(self):
+        with self._lock:
+            if not self.enabled:
+                return
+            self.enabled = False
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals.clear()
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def record(self, operation, elapsed, failed=False):
+        with self._lock:
+            stats = self._stats.get(operation)
+            if stats is None:
+                stats = self._stats[operation] = OperationStats()
+            stats.count += 1
+            stats.errors += failed
+            stats.total += elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+            stats.buckets[bisect.bisect_left(BUCKETS, elapsed)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {operation: stats.to_dict() for operation, stats in sorted(self._stats.items())}
+
+    def render_prometheus(self):
+        lines = [
+            "# HELP eduplatform_operation_seconds Latency of platform, user role and export operations.",
+            "# TYPE eduplatform_operation_seconds histogram"
+        ]
+        errors = []
+        for operation, stats in self.snapshot().items():
+            label = f'operation="{operation}"'
+            for bound, count in stats["buckets"].items():
+                lines.append(f'eduplatform_operation_seconds_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f"eduplatform_operation_seconds_sum{{{label}}} {stats['total_seconds']:.9f}")
+            lines.append(f"eduplatform_operation_seconds_count{{{label}}} {stats['count']}")
+            errors.append(f"eduplatform_operation_errors_total{{{label}}} {stats['errors']}")
+        lines.append("# HELP eduplatform_operation_errors_total Operations that raised an exception.")
+        lines.append("# TYPE eduplatform_operation_errors_total counter")
+        lines.extend(errors)
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, filename):
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        return filename
+
+    def _wrap_class(self, cls, extra):
+        for name, value in list(vars(cls).items()):
+            if inspect.isfunction(value) and (not name.startswith("_") or name in extra):
+                self._originals.append((cls, name, value))
+                setattr(cls, name, self._method_wrapper(value, name))
+
+    def _wrap_functions(self, module_name, names, prefix):
+        module = sys.modules[module_name]
+        for name in names:
+            original = getattr(module, name)
+            self._originals.append((module, name, original))
+            setattr(module, name, self._function_wrapper(original, f"{prefix}.{name.lstrip('_')}"))
+
+    def _method_wrapper(self, method, name):
+        record = self.record
+        operations = {}
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = method(self, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                cls = type(self)
+                operation = operations.get(cls)
+                if operation is None:
+                    operation = operations[cls] = f"{cls.__name__}.{name}"
+                record(operation, time.perf_counter() - start, failed)
+        return wrapper
+
+    def _function_wrapper(self, function, operation):
+        record = self.record
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = function(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                record(operation, time.perf_counter() - start, failed)
+        return wrapper
+
+
+instrumentation = Instrumentation()
@@ -0,0 +1,93 @@
+import threading
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+
+def _merge_ops(previous, current):
+    if previous is None:
+        return current
+    if previous == INSERT:
+        if current == DELETE:
+            return None
+        return INSERT
+    if previous == DELETE:
+        if current == INSERT:
+            return UPDATE
+        return DELETE
+    return current
+
+
+class ChangeJournal:
+    # Ordered log of (table, key, op) changes. Every consumer (one per delta
+    # export target) keeps its own cursor; entries every consumer has seen are
+    # dropped, and nothing is kept while no consumer is registered.
+    def __init__(self):
+        self._entries = []
+        self._base_seq = 0
+        self._cursors = {}
+        self._lock = threading.Lock()
+
+    @property
+    def head(self):
+        return self._base_seq + len(self._entries)
+
+    def record(self, table, key, op, obj=None):
+        with self._lock:
+            if not self._cursors:
+                return
+            self._entries.append((table, key, op, obj))
+
+    def cursor(self, consumer):
+        with self._lock:
+            state = self._cursors.get(consumer)
+            return dict(state) if state else None
+
+    def reset(self, consumer, seq=None):
+        # Called once a full export taken at seq (default: now) is written:
+        # the consumer is caught up to it.
+        with self._lock:
+            self._cursors[consumer] = {"seq": self.head if seq is None else seq, "deltas": 0}
+            self._trim()
+
+    def unregister(self, consumer):
+        with self._lock:
+            self._cursors.pop(consumer, None)
+            self._trim()
+
+    def pending(self, consumer):
+        with self._lock:
+            state = self._cursors[consumer]
+            start = state["seq"] - self._base_seq
+            changes = {}
+            for table, key, op, obj in self._entries[start:]:
+                table_changes = changes.setdefault(table, {})
+                previous = table_changes.get(key)
+                merged = _merge_ops(previous[0] if previous else None, op)
+                if merged is None:
+                    del table_changes[key]
+                else:
+                    table_changes[key] = (merged, obj)
+            return changes, self.head
+
+    def commit(self, consumer, seq):
+        with self._lock:
+            state = self._cursors[consumer]
+            state["seq"] = seq
+            state["deltas"] += 1
+            self._trim()
+
+    def _trim(self):
+        if not self._cursors:
+            self._base_seq += len(self._entries)
+            self._entries = []
+            return
+        oldest = min(state["seq"] for state in self._cursors.values())
+        drop = oldest - self._base_seq
+        if drop > 0:
+            del self._entries[:drop]
+            self._base_seq = oldest
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,143 @@
+import bisect
+import itertools
+
+IMPORTANT_PRIORITY = 1
+
+
+class NotificationStore:
+    # Per-user notifications indexed by id and bucketed by priority. Unread
+    # items are kept in their own buckets, so unread and important views
+    # never touch read or low-priority notifications.
+    def __init__(self, notifications=()):
+        self._by_id = {}
+        self._buckets = {}
+        self._unread = {}
+        self._priorities = []
+        for notification in notifications:
+            self.add(notification)
+
+    def add(self, notification):
+        if notification.id in self._by_id:
+            self.remove(notification.id)
+        self._by_id[notification.id] = notification
+        priority = notification.priority
+        if priority not in self._buckets:
+            bisect.insort(self._priorities, priority)
+            self._buckets[priority] = {}
+            self._unread[priority] = {}
+        self._buckets[priority][notification.id] = notification
+        if not notification.is_read:
+            self._unread[priority][notification.id] = notification
+        return notification
+
+    def get(self, notification_id):
+        return self._by_id.get(notification_id)
+
+    def mark_read(self, notification_id):
+        notification = self._by_id.get(notification_id)
+        if notification is None:
+            return None
+        notification.mark_as_read()
+        self._unread[notification.priority].pop(notification_id, None)
+        return notification
+
+    def remove(self, notification_id):
+        notification = self._by_id.pop(notification_id, None)
+        if notification is None:
+            return None
+        priority = notification.priority
+        bucket = self._buckets[priority]
+        del bucket[notification_id]
+        self._unread[priority].pop(notification_id, None)
+        if not bucket:
+            del self._buckets[priority]
+            del self._unread[priority]
+            self._priorities.pop(bisect.bisect_left(self._priorities, priority))
+        return notification
+
+    def iter_by_priority(self, unread_only=False, important_only=False):
+        # Walks copies of the priority list and buckets, so a reader is not
+        # disturbed by notifications added from another thread.
+        buckets = self._unread if unread_only else self._buckets
+        priorities = list(self._priorities)
+        stop = bisect.bisect_left(priorities, IMPORTANT_PRIORITY) if important_only else 0
+        for index in range(len(priorities) - 1, stop - 1, -1):
+            bucket = buckets.get(priorities[index])
+            if bucket:
+                yield from tuple(bucket.values())
+
+    def unread_count(self):
+        return sum(len(bucket) for bucket in list(self._unread.values()))
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, notification_id):
+        return notification_id in self._by_id
+
+    def __getitem__(self, index):
+        # Positional access in insertion order, kept for list-style callers.
+        if index < 0:
+            index += len(self._by_id)
+        if not 0 <= index < len(self._by_id):
+            raise IndexError("notification index out of range")
+        return next(itertools.islice(self._by_id.values(), index, None))
+
+
+class LazyNotificationStore(NotificationStore):
+    # Calls loader() for a user's persisted notifications the first time the
+    # store is used, so restoring a platform does not decode every inbox.
+    def __init__(self, loader):
+        super().__init__()
+        self._loader = loader
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            for notification in self._loader():
+                super().add(notification)
+            self._loader = None
+
+    def add(self, notification):
+        self._ensure_loaded()
+        return super().add(notification)
+
+    def get(self, notification_id):
+        self._ensure_loaded()
+        return super().get(notification_id)
+
+    def mark_read(self, notification_id):
+        self._ensure_loaded()
+        return super().mark_read(notification_id)
+
+    def remove(self, notification_id):
+        self._ensure_loaded()
+        return super().remove(notification_id)
+
+    def iter_by_priority(self, unread_only=False, important_only=False):
+        self._ensure_loaded()
+        return super().iter_by_priority(unread_only, important_only)
+
+    def unread_count(self):
+        self._ensure_loaded()
+        return super().unread_count()
+
+    def __iter__(self):
+        self._ensure_loaded()
+        return super().__iter__()
+
+    def __len__(self):
+        self._ensure_loaded()
+        return super().__len__()
+
+    def __contains__(self, notification_id):
+        self._ensure_loaded()
+        return super().__contains__(notification_id)
+
+    def __getitem__(self, index):
+        self._ensure_loaded()
+        return super().__getitem__(index)
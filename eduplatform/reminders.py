@@ -0,0 +1,166 @@
+import heapq
+import itertools
+import threading
+import time
+from eduplatform.events import emit, ERROR
+
+# Seconds before the deadline at which students who have not submitted are
+# reminded.
+DEFAULT_OFFSETS = (24 * 3600, 3600)
+DEFAULT_POLL_INTERVAL = 60.0
+
+
+def _describe(seconds):
+    if seconds % 86400 == 0 and seconds >= 86400:
+        count, unit = seconds // 86400, "day"
+    elif seconds % 3600 == 0 and seconds >= 3600:
+        count, unit = seconds // 3600, "hour"
+    else:
+        count, unit = max(1, round(seconds / 60)), "minute"
+    return f"{count:g} {unit}{'' if count == 1 else 's'}"
+
+
+class ReminderDispatcher:
+    # Deadline reminders on a min-heap of (fire time, sequence, assignment
+    # id, schedule token, offset) entries. Each assignment pushes one entry
+    # per reminder offset plus one for the parent alert after the deadline,
+    # so a tick only pops what is due; nothing ever rescans the assignments.
+    # A changed deadline pushes fresh entries under a new token and the old
+    # ones are dropped when they surface.
+    def __init__(self, edu_platform, offsets=DEFAULT_OFFSETS, parent_alert_delay=0.0, clock=time.time,
+                 poll_interval=DEFAULT_POLL_INTERVAL):
+        self.edu_platform = edu_platform
+        self.offsets = tuple(sorted(offsets, reverse=True))
+        self.parent_alert_delay = parent_alert_delay
+        self.clock = clock
+        self.poll_interval = poll_interval
+        self._heap = []
+        self._sequence = itertools.count()
+        self._deadlines = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self.reminders_sent = 0
+        self.parent_alerts_sent = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, assignment):
+        self._schedule(assignment.id, assignment._deadline_ts)
+
+    def schedule_pending(self, index):
+        # Seeds the heap from the platform's deadline index: everything
+        # whose parent alert has not come due yet, without loading the
+        # assignments themselves.
+        now = self.clock()
+        for assignment_id in index.due_between(now - self.parent_alert_delay):
+            self._schedule(assignment_id, index.deadline_of(assignment_id), now)
+
+    def _schedule(self, assignment_id, deadline_ts, now=None):
+        now = self.clock() if now is None else now
+        with self._cond:
+            current = self._deadlines.get(assignment_id)
+            if current is not None and current[0] == deadline_ts:
+                return
+            token = next(self._sequence)
+            self._deadlines[assignment_id] = (deadline_ts, token)
+            earliest = self._heap[0][0] if self._heap else None
+            for offset in self.offsets:
+                if deadline_ts - offset > now:
+                    heapq.heappush(self._heap, (deadline_ts - offset, next(self._sequence), assignment_id, token, offset))
+            heapq.heappush(self._heap, (deadline_ts + self.parent_alert_delay, next(self._sequence), assignment_id, token, None))
+            if earliest is None or self._heap[0][0] < earliest:
+                self._cond.notify_all()
+
+    def next_due(self):
+        with self._cond:
+            return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now=None):
+        # Fires every entry due at now; returns the notifications sent.
+        now = self.clock() if now is None else now
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, assignment_id, token, offset = heapq.heappop(self._heap)
+                current = self._deadlines.get(assignment_id)
+                if current is None or current[1] != token:
+                    continue
+                if offset is None:
+                    del self._deadlines[assignment_id]
+                due.append((assignment_id, current[0], offset))
+        sent = 0
+        for assignment_id, deadline_ts, offset in due:
+            assignment = self.edu_platform.assignments.get(assignment_id)
+            if assignment is None:
+                continue
+            if offset is None:
+                sent += self._alert_parents(assignment)
+            elif now < deadline_ts:
+                # A reminder that surfaces after the deadline, say after
+                # downtime, is no use any more; the parent alert follows.
+                sent += self._remind_students(assignment, offset)
+        if sent:
+            emit("reminders.run_due", f"Deadline reminders: {sent} notifications sent for {len(due)} due entries.", notifications=sent)
+        return sent
+
+    def _missing(self, assignment):
+        return [student_id for student_id in list(self.edu_platform.students_by_class.get(assignment.class_id, []))
+                if student_id not in assignment.submissions]
+
+    def _remind_students(self, assignment, offset):
+        sent = 0
+        for student_id in self._missing(assignment):
+            student = self.edu_platform.users.get(student_id)
+            if student is not None:
+                student.add_notification(f"Reminder: '{assignment.title}' in {assignment.subject} is due in {_describe(offset)} "
+                                         f"(deadline {assignment.deadline}) and you have not submitted it yet.", priority=1)
+                sent += 1
+        self.reminders_sent += sent
+        return sent
+
+    def _alert_parents(self, assignment):
+        sent = 0
+        for student_id in self._missing(assignment):
+            student = self.edu_platform.users.get(student_id)
+            if student is None:
+                continue
+            for parent in self.edu_platform.get_parents_of(student_id):
+                if parent.notification_preferences.get("missed_deadline_alert", True):
+                    parent.add_notification(f"Your child, {student._full_name}, missed the deadline for '{assignment.title}' in {assignment.subject}.", priority=2)
+                    sent += 1
+        self.parent_alerts_sent += sent
+        return sent
+
+    def start(self):
+        with self._cond:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="eduplatform-reminders", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        # Sleeps until the earliest entry is due, waking early when an
+        # earlier one is scheduled; poll_interval bounds each sleep so a
+        # clock that jumps is noticed.
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                wait = self.poll_interval if not self._heap else min(self.poll_interval, self._heap[0][0] - self.clock())
+                if wait > 0:
+                    self._cond.wait(wait)
+                if self._closed:
+                    return
+            try:
+                self.run_due()
+            except Exception as e:
+                emit("reminders.run", f"Error while sending deadline reminders: {e}", level=ERROR)
+
+    def close(self, timeout=None):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
@@ -0,0 +1,173 @@
+import csv
+import datetime
+import io
+import json
+import sys
+
+REPORT_FORMATS = ("text", "json", "csv")
+
+
+class ReportSection:
+    # A table of rows. rows is a callable returning a fresh iterator, so a
+    # section can be rendered more than once and large sections are produced
+    # row by row while they are written.
+    def __init__(self, name, title, columns, rows):
+        self.name = name
+        self.title = title
+        self.columns = columns
+        self.rows = rows
+
+
+class Report:
+    def __init__(self, title, summary, sections):
+        self.title = title
+        self.generated_at = datetime.datetime.now().isoformat()
+        self.summary = summary
+        self.sections = sections
+
+    def freeze(self):
+        # Produces every section's rows now, so the report reflects the
+        # moment it was built rather than the moment it is rendered.
+        for section in self.sections:
+            rows = list(section.rows())
+            section.rows = lambda rows=rows: iter(rows)
+        return self
+
+    def section(self, name):
+        for section in self.sections:
+            if section.name == name:
+                return section
+        raise KeyError(name)
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "generated_at": self.generated_at,
+            "summary": dict(self.summary),
+            "sections": {section.name: [dict(zip(section.columns, row)) for row in section.rows()] for section in self.sections}
+        }
+
+
+def _round(value):
+    return round(value, 2) if isinstance(value, float) else value
+
+
+def build_platform_report(edu_platform, include_students=True, leaderboard_size=3):
+    # Every figure comes from an index or a running aggregate: role tables,
+    # students_by_class, the grade aggregates and the notification counter.
+    # Nothing here walks the users or the grades.
+    aggregates = edu_platform.grades.aggregates
+    summary = {
+        "total_users": len(edu_platform.users),
+        "admins": len(edu_platform.admins),
+        "teachers": len(edu_platform.teachers),
+        "students": len(edu_platform.students),
+        "parents": len(edu_platform.parents),
+        "total_assignments": len(edu_platform.assignments),
+        "total_grades": len(edu_platform.grades),
+        "total_schedules": len(edu_platform.schedules),
+        "total_notifications": edu_platform.user_notification_count,
+        "classes": len(edu_platform.students_by_class),
+    }
+
+    def class_rows():
+        for class_id in sorted(edu_platform.students_by_class):
+            stats = aggregates.for_class(class_id)
+            top = aggregates.leaderboard(class_id).top(leaderboard_size)
+            yield [class_id, len(edu_platform.students_by_class[class_id]), stats.count, _round(stats.mean), stats.min, stats.max,
+                   " ".join(f"{student_id}:{average:.2f}" for student_id, average in top)]
+
+    def teacher_rows():
+        for teacher in list(edu_platform.teachers.values()):
+            stats = aggregates.for_teacher(teacher._id)
+            yield [teacher._id, teacher._full_name, len(teacher.classes), stats.count, _round(stats.mean)]
+
+    def student_rows():
+        for student in list(edu_platform.students.values()):
+            stats = aggregates.student(student._id)
+            yield [student._id, student._full_name, student.grade, stats.count, _round(stats.mean)]
+
+    sections = [
+        ReportSection("classes", "Class Performance", ["class_id", "students", "grades", "average", "min", "max", "top_students"], class_rows),
+        ReportSection("teachers", "Teacher Overview", ["teacher_id", "full_name", "classes", "grades_given", "average_given"], teacher_rows),
+    ]
+    if include_students:
+        sections.append(ReportSection("students", "Student Performance", ["student_id", "full_name", "class_id", "grades", "average"], student_rows))
+    return Report("System Report", summary, sections)
+
+
+def _cell(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def render_text(report, out):
+    out.write(f"--- {report.title} ({report.generated_at}) ---\n")
+    for key, value in report.summary.items():
+        out.write(f"{key.replace('_', ' ').title()}: {value}\n")
+    for section in report.sections:
+        out.write(f"\n{section.title}:\n")
+        out.write("  " + " | ".join(section.columns) + "\n")
+        lines = []
+        for row in section.rows():
+            lines.append("  " + " | ".join(_cell(value) for value in row) + "\n")
+            if len(lines) >= 1000:
+                out.writelines(lines)
+                lines.clear()
+        out.writelines(lines)
+    out.write(f"--- End of {report.title} ---\n")
+
+
+def render_json(report, out):
+    # Streams the sections so a large report is never held as one document.
+    out.write("{")
+    out.write(f'"title": {json.dumps(report.title)}, "generated_at": {json.dumps(report.generated_at)}, ')
+    out.write(f'"summary": {json.dumps(report.summary)}, "sections": {{')
+    for index, section in enumerate(report.sections):
+        out.write(("" if index == 0 else ", ") + f"{json.dumps(section.name)}: [")
+        for row_index, row in enumerate(section.rows()):
+            out.write(("" if row_index == 0 else ", ") + json.dumps(dict(zip(section.columns, row))))
+        out.write("]")
+    out.write("}}\n")
+
+
+def render_csv(report, out):
+    # One block per section: a "# title" line, the header, the rows and a
+    # blank separator line. The summary comes first as key/value rows.
+    writer = csv.writer(out)
+    writer.writerow([f"# {report.title}", report.generated_at])
+    writer.writerow(["key", "value"])
+    writer.writerows(report.summary.items())
+    for section in report.sections:
+        writer.writerow([])
+        writer.writerow([f"# {section.title}"])
+        writer.writerow(section.columns)
+        writer.writerows(section.rows())
+
+
+_RENDERERS = {"text": render_text, "json": render_json, "csv": render_csv}
+
+
+def render_report(report, fmt="text", out=None):
+    # Writes to out when given, otherwise returns the rendered string.
+    if fmt not in _RENDERERS:
+        raise ValueError(f"Unknown report format {fmt}; expected one of {', '.join(REPORT_FORMATS)}.")
+    if out is not None:
+        _RENDERERS[fmt](report, out)
+        return None
+    buffer = io.StringIO()
+    _RENDERERS[fmt](report, buffer)
+    return buffer.getvalue()
+
+
+def write_report(report, filename, fmt="text"):
+    with open(filename, "w", newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        render_report(report, fmt, f)
+    return filename
+
+
+def print_report(report, fmt="text"):
+    render_report(report, fmt, sys.stdout)
@@ -0,0 +1,188 @@
+import concurrent.futures
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from eduplatform.abstracts import hash_passwords
+from eduplatform.enums import UserRole
+from eduplatform.events import emit
+from eduplatform.users import Admin, Teacher, Student, Parent
+
+# Roster CSV columns. List values (subjects, classes, children) are separated
+# by ";", a student's subjects are "Subject=teacher email" pairs and a
+# parent's children are student emails.
+ROSTER_COLUMNS = ("role", "full_name", "email", "password", "class_id", "subjects", "classes", "children")
+REQUIRED_COLUMNS = ("role", "full_name", "email", "password")
+DEFAULT_CHUNK_SIZE = 5000
+ROLES = {role.value.lower(): role for role in UserRole}
+
+
+class ImportSummary:
+    def __init__(self):
+        self.accepted = []
+        self.rejected = []
+        self.elapsed = 0.0
+
+    def accept(self, line, user):
+        self.accepted.append({"line": line, "id": user._id, "email": user._email, "role": user.role.value})
+
+    def reject(self, line, email, reason):
+        self.rejected.append({"line": line, "email": email, "reason": reason})
+
+    @property
+    def is_complete(self):
+        return not self.rejected
+
+    def summary(self):
+        return {
+            "accepted": len(self.accepted),
+            "rejected": len(self.rejected),
+            "elapsed": self.elapsed
+        }
+
+
+def _split(value):
+    return [item.strip() for item in (value or "").split(";") if item.strip()]
+
+
+def _check_row(row, seen):
+    for column in REQUIRED_COLUMNS:
+        if not (row.get(column) or "").strip():
+            return f"missing {column}"
+    role = ROLES.get(row["role"].strip().lower())
+    if role is None:
+        return f"unknown role {row['role']}"
+    if role == UserRole.STUDENT and not (row.get("class_id") or "").strip():
+        return "missing class_id"
+    if row["email"].strip() in seen:
+        return "duplicate email"
+    return None
+
+
+def _lookup(edu_platform, chunk_users, email, role):
+    user = chunk_users.get(email) or edu_platform.get_user_by_email(email)
+    if user is None or user.role != role:
+        return None
+    return user
+
+
+def _build_user(edu_platform, row, chunk_users):
+    role = ROLES[row["role"].strip().lower()]
+    full_name = row["full_name"].strip()
+    email = row["email"].strip()
+    if role == UserRole.STUDENT:
+        subjects = {}
+        for pair in _split(row.get("subjects")):
+            subject, _, teacher_email = pair.partition("=")
+            teacher = _lookup(edu_platform, chunk_users, teacher_email.strip(), UserRole.TEACHER)
+            if teacher is None:
+                return None, f"unknown teacher {teacher_email.strip()}"
+            subjects[sys.intern(subject.strip())] = teacher._id
+        user = Student(full_name, email, None, row["class_id"].strip())
+        user.subjects = subjects
+    elif role == UserRole.TEACHER:
+        user = Teacher(full_name, email, None)
+        user.subjects = _split(row.get("subjects"))
+        user.classes = _split(row.get("classes"))
+    elif role == UserRole.PARENT:
+        children = []
+        for child_email in _split(row.get("children")):
+            child = _lookup(edu_platform, chunk_users, child_email, UserRole.STUDENT)
+            if child is None:
+                return None, f"unknown child {child_email}"
+            children.append(child._id)
+        user = Parent(full_name, email, None)
+        user.children = children
+    else:
+        user = Admin(full_name, email, None)
+    return user, None
+
+
+def _submit_hashes(pool, passwords, workers):
+    if pool is None:
+        return [hash_passwords(passwords)]
+    size = max(1, -(-len(passwords) // workers))
+    return [pool.submit(hash_passwords, passwords[i:i + size]) for i in range(0, len(passwords), size)]
+
+
+def _collect_hashes(batches):
+    hashes = []
+    for batch in batches:
+        hashes.extend(batch if isinstance(batch, list) else batch.result())
+    return hashes
+
+
+def _commit_chunk(edu_platform, rows, batches, summary, seen):
+    # An email is only taken once its row has built a user, so a row
+    # rejected here does not shut out a later one with the same email.
+    users = []
+    lines = {}
+    chunk_users = {}
+    for (line, row), password_hash in zip(rows, _collect_hashes(batches)):
+        email = row["email"].strip()
+        if email in seen:
+            summary.reject(line, email, "duplicate email")
+            continue
+        user, reason = _build_user(edu_platform, row, chunk_users)
+        if user is None:
+            summary.reject(line, email, reason)
+            continue
+        seen.add(email)
+        user._password_hash = password_hash
+        chunk_users[user._email] = user
+        lines[user._id] = line
+        users.append(user)
+    added, rejected = edu_platform.add_users(users)
+    for user in added:
+        summary.accept(lines[user._id], user)
+    for user in rejected:
+        summary.reject(lines[user._id], user._email, "email already registered")
+
+
+def import_roster(edu_platform, filename, workers=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Rows are read and checked in chunks. With workers > 0 (None for one per
+    # CPU) each chunk's passwords are hashed in worker processes while the
+    # previous chunk is built and registered. A single sha256 is cheaper than
+    # shipping it to another process, so hashing stays inline by default.
+    start = time.perf_counter()
+    summary = ImportSummary()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    pool = None
+    if workers > 0:
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    seen = set(edu_platform.users_by_email)
+    try:
+        with open(filename, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+            if missing:
+                raise ValueError(f"Roster {filename} is missing columns: {', '.join(missing)}.")
+            numbered = enumerate(reader, start=2)
+            pending = None
+            while True:
+                chunk = list(itertools.islice(numbered, chunk_size))
+                if not chunk:
+                    break
+                rows = []
+                for line, row in chunk:
+                    reason = _check_row(row, seen)
+                    if reason is not None:
+                        summary.reject(line, (row.get("email") or "").strip(), reason)
+                        continue
+                    rows.append((line, row))
+                batches = _submit_hashes(pool, [row["password"] for _, row in rows], workers)
+                if pending is not None:
+                    _commit_chunk(edu_platform, *pending, summary, seen)
+                pending = (rows, batches)
+            if pending is not None:
+                _commit_chunk(edu_platform, *pending, summary, seen)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    summary.rejected.sort(key=lambda rejection: rejection["line"])
+    summary.elapsed = time.perf_counter() - start
+    emit("roster.import_roster", f"Roster import from {filename}: {len(summary.accepted)} users added, {len(summary.rejected)} rows rejected in {summary.elapsed:.2f}s.")
+    return summary
@@ -0,0 +1,553 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import math
+import re
+import time
+import urllib.parse
+from eduplatform.abstracts import to_timestamp
+from eduplatform.enums import UserRole, AssignmentDifficulty
+from eduplatform.entities import Schedule
+from eduplatform.events import emit, ERROR
+from eduplatform.users import Admin, Teacher, Student, Parent
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_HEADER_LINES = 100
+MAX_BODY_SIZE = 1 << 20
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+USER_CLASSES = {"admin": Admin, "teacher": Teacher, "student": Student, "parent": Parent}
+
+
+def _param_pattern(match):
+    name = match.group(1)
+    return f"(?P<{name}>\\d+)" if name == "id" else f"(?P<{name}>[^/]+)"
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.user = None
+        self.params = {}
+
+    def json(self):
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON.") from None
+        if not isinstance(data, dict):
+            raise ApiError(400, "Request body must be a JSON object.")
+        return data
+
+    def query_value(self, name, kind, default):
+        if name not in self.query:
+            return default
+        try:
+            value = kind(self.query[name])
+        except ValueError:
+            value = None
+        if value is None or (kind is float and not math.isfinite(value)):
+            raise ApiError(400, f"Query parameter '{name}' must be {'an integer' if kind is int else 'a finite number'}.")
+        return value
+
+    def field(self, data, name, kind=None, default=...):
+        if name not in data:
+            if default is ...:
+                raise ApiError(400, f"Missing field '{name}'.")
+            return default
+        value = data[name]
+        # bool is an int subclass and json.loads accepts NaN and Infinity;
+        # neither is a valid number here.
+        if kind is not None and (not isinstance(value, kind) or (isinstance(value, bool) and kind is not bool)
+                                 or (isinstance(value, float) and not math.isfinite(value))):
+            raise ApiError(400, f"Field '{name}' has the wrong type.")
+        return value
+
+
+class WriteBatcher:
+    # Collects writes of one kind for up to window seconds, or until
+    # max_size are waiting, and applies them in a single executor call. Each
+    # caller gets its own result or exception back.
+    def __init__(self, apply_one, executor, window=0.002, max_size=256):
+        self.apply_one = apply_one
+        self.executor = executor
+        self.window = window
+        self.max_size = max_size
+        self._pending = []
+        self._timer = None
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, *args):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((args, future))
+        if len(self._pending) >= self.max_size:
+            self._flush(loop)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush, loop)
+        return await future
+
+    def _flush(self, loop):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        done = loop.run_in_executor(self.executor, self._apply, [args for args, _ in batch])
+        done.add_done_callback(lambda task: self._resolve(batch, task))
+
+    def _apply(self, batch):
+        results = []
+        for args in batch:
+            try:
+                results.append((True, self.apply_one(*args)))
+            except Exception as e:
+                results.append((False, e))
+        return results
+
+    def _resolve(self, batch, task):
+        error = task.exception()
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+                continue
+            ok, value = task.result()[index]
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+class ApiServer:
+    # HTTP/1.1 JSON API over one platform. Reads run on the event loop;
+    # password hashing, exports and other blocking calls go to an executor,
+    # and submissions, grades and notification updates are batched per kind.
+    def __init__(self, edu_platform, host=DEFAULT_HOST, port=DEFAULT_PORT, executor=None, batch_window=0.002, max_batch=256):
+        self.edu_platform = edu_platform
+        self.host = host
+        self.port = port
+        self.executor = executor or concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="eduplatform-api")
+        self._owns_executor = executor is None
+        self.batchers = {
+            "submissions": WriteBatcher(self._submit, self.executor, batch_window, max_batch),
+            "grades": WriteBatcher(self._grade, self.executor, batch_window, max_batch),
+            "notifications": WriteBatcher(self._mark_read, self.executor, batch_window, max_batch),
+        }
+        self.requests_served = 0
+        self._server = None
+        self._connections = set()
+        self._routes = []
+        self._route("GET", "/health", self.health, auth=False)
+        self._route("POST", "/login", self.login, auth=False)
+        self._route("POST", "/logout", self.logout)
+        self._route("GET", "/me", self.me)
+        self._route("POST", "/users", self.create_user)
+        self._route("POST", "/assignments", self.create_assignment)
+        self._route("GET", "/assignments/{id}", self.get_assignment)
+        self._route("POST", "/assignments/{id}/submissions", self.submit_assignment)
+        self._route("POST", "/assignments/{id}/grades", self.grade_assignment)
+        self._route("GET", "/notifications", self.list_notifications)
+        self._route("POST", "/notifications/{id}/read", self.read_notification)
+        self._route("GET", "/schedules", self.list_schedules)
+        self._route("POST", "/schedules", self.create_schedule)
+        self._route("POST", "/schedules/{id}/lessons", self.add_lesson)
+        self._route("GET", "/teachers/{id}/timetable", self.teacher_timetable)
+        self._route("GET", "/students/{id}/stats", self.student_stats)
+        self._route("GET", "/classes/{class_id}/leaderboard", self.class_leaderboard)
+        self._route("GET", "/classes/{class_id}/deadlines", self.class_deadlines)
+        self._route("POST", "/exports", self.export)
+
+    def _route(self, method, pattern, handler, auth=True):
+        # {id} matches a number and is passed as an int; any other {name}
+        # matches one path segment.
+        regex = re.compile("^" + re.sub(r"\{(\w+)\}", _param_pattern, pattern) + "$")
+        self._routes.append((method, regex, handler, auth))
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        emit("server.start", f"EduPlatform API listening on http://{self.host}:{self.port}", host=self.host, port=self.port)
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise outlive the server.
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def _serve_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ApiError as e:
+                    await self._write_response(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                status, payload = await self._dispatch(request)
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                await self._write_response(writer, status, payload, keep_alive)
+                self.requests_served += 1
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # stop() cancels idle connections; ending quietly is the point.
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+            finally:
+                self._connections.discard(task)
+
+    async def _read_line(self, reader, status, message):
+        # readline raises ValueError once a line outgrows the stream limit.
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise ApiError(status, message) from None
+
+    async def _read_request(self, reader):
+        line = await self._read_line(reader, 400, "Request line too long.")
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ApiError(400, "Malformed request line.") from None
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await self._read_line(reader, 431, "Header line too long.")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ApiError(400, "Too many header lines.")
+        length = headers.get("content-length", "0") or "0"
+        if not (length.isascii() and length.isdigit()):
+            raise ApiError(400, "Invalid Content-Length header.")
+        length = int(length)
+        if length > MAX_BODY_SIZE:
+            raise ApiError(413, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        url = urllib.parse.urlsplit(target)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        return Request(method.upper(), url.path, query, headers, body)
+
+    async def _write_response(self, writer, status, payload, keep_alive=True):
+        body = json.dumps(payload, default=str).encode()
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _dispatch(self, request):
+        allowed = False
+        for method, regex, handler, auth in self._routes:
+            match = regex.match(request.path)
+            if match is None:
+                continue
+            allowed = True
+            if method != request.method:
+                continue
+            request.params = {key: int(value) if key == "id" else urllib.parse.unquote(value) for key, value in match.groupdict().items()}
+            try:
+                if auth:
+                    request.user = self._authenticate(request)
+                result = await handler(request)
+            except ApiError as e:
+                return e.status, {"error": e.message}
+            except Exception as e:
+                emit("server.dispatch", f"Error handling {request.method} {request.path}: {e}", level=ERROR)
+                return 500, {"error": "Internal server error."}
+            return result if isinstance(result, tuple) else (200, result)
+        if allowed:
+            return 405, {"error": f"Method {request.method} not allowed on {request.path}."}
+        return 404, {"error": f"No route for {request.path}."}
+
+    def _authenticate(self, request):
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        user = self.edu_platform.authenticate_token(token.strip()) if scheme.lower() == "bearer" else None
+        if user is None:
+            raise ApiError(401, "A valid bearer token is required.")
+        return user
+
+    def _require_role(self, request, *roles):
+        if request.user.role not in roles:
+            raise ApiError(403, f"This action requires the {' or '.join(role.value for role in roles)} role.")
+
+    def _assignment(self, assignment_id):
+        assignment = self.edu_platform.get_assignment_by_id(assignment_id)
+        if assignment is None:
+            raise ApiError(404, f"Assignment {assignment_id} not found.")
+        return assignment
+
+    def _submit(self, student, assignment, content):
+        if not student.submit_assignment(assignment, content):
+            raise ApiError(400, "Submission rejected.")
+        return {"assignment_id": assignment.id, "status": student.assignments[assignment.id]}
+
+    def _grade(self, teacher, assignment_id, student_id, value, comment):
+        if not teacher.grade_assignment(self.edu_platform, assignment_id, student_id, value, comment):
+            raise ApiError(400, "Grade rejected.")
+        return {"assignment_id": assignment_id, "student_id": student_id, "value": value}
+
+    def _mark_read(self, user, notification_id):
+        if not user.mark_notification_as_read(notification_id):
+            raise ApiError(404, f"Notification {notification_id} not found.")
+        return {"id": notification_id, "is_read": True}
+
+    async def health(self, request):
+        return {"status": "ok", "users": len(self.edu_platform.users), "requests_served": self.requests_served,
+                "batches": {kind: {"batches": batcher.batches, "items": batcher.items} for kind, batcher in self.batchers.items()}}
+
+    async def login(self, request):
+        data = request.json()
+        email = request.field(data, "email", str)
+        password = request.field(data, "password", str)
+        token = await self._run(self.edu_platform.login, email, password)
+        if token is None:
+            raise ApiError(401, "Invalid email or password.")
+        user = self.edu_platform.authenticate_token(token)
+        return {"token": token, "user": user.get_profile()}
+
+    async def logout(self, request):
+        token = request.headers["authorization"].partition(" ")[2].strip()
+        return {"revoked": self.edu_platform.logout(token)}
+
+    async def me(self, request):
+        return request.user.get_profile()
+
+    async def create_user(self, request):
+        self._require_role(request, UserRole.ADMIN)
+        data = request.json()
+        role = request.field(data, "role", str).lower()
+        if role not in USER_CLASSES:
+            raise ApiError(400, f"Unknown role '{role}'.")
+        args = [request.field(data, "full_name", str), request.field(data, "email", str), request.field(data, "password", str)]
+        if role == "student":
+            args.append(request.field(data, "class_id", str))
+        if self.edu_platform.get_user_by_email(args[1]) is not None:
+            raise ApiError(409, f"A user with email {args[1]} already exists.")
+        # Building the user hashes the password, so it runs off the loop.
+        user = await self._run(USER_CLASSES[role], *args)
+        if not self.edu_platform.add_user(user):
+            raise ApiError(409, f"A user with email {args[1]} already exists.")
+        return 201, user.get_profile()
+
+    async def create_assignment(self, request):
+        self._require_role(request, UserRole.TEACHER)
+        data = request.json()
+        difficulty = request.field(data, "difficulty", str, AssignmentDifficulty.MEDIUM.value)
+        try:
+            difficulty = AssignmentDifficulty(difficulty)
+        except ValueError:
+            raise ApiError(400, f"Unknown difficulty '{difficulty}'.") from None
+        deadline = request.field(data, "deadline", str)
+        try:
+            to_timestamp(deadline)
+        except ValueError:
+            raise ApiError(400, f"Invalid deadline '{deadline}'; expected an ISO 8601 date and time.") from None
+        assignment = await self._run(request.user.create_assignment, self.edu_platform,
+                                     request.field(data, "title", str), request.field(data, "description", str, ""),
+                                     deadline, request.field(data, "subject", str),
+                                     request.field(data, "class_id", str), difficulty)
+        if assignment is None:
+            raise ApiError(403, "The teacher does not teach this subject or class.")
+        return 201, _assignment_info(assignment)
+
+    async def get_assignment(self, request):
+        assignment = self._assignment(request.params["id"])
+        info = _assignment_info(assignment)
+        if request.user.role == UserRole.STUDENT:
+            info["status"] = assignment.get_status(request.user._id)
+        return info
+
+    async def submit_assignment(self, request):
+        self._require_role(request, UserRole.STUDENT)
+        assignment = self._assignment(request.params["id"])
+        if assignment.class_id != request.user.grade:
+            raise ApiError(403, "The assignment is not for the student's class.")
+        content = request.field(request.json(), "content", str)
+        return 201, await self.batchers["submissions"].submit(request.user, assignment, content)
+
+    async def grade_assignment(self, request):
+        self._require_role(request, UserRole.TEACHER)
+        assignment_id = request.params["id"]
+        data = request.json()
+        value = request.field(data, "value", (int, float))
+        student_id = request.field(data, "student_id", int)
+        return 201, await self.batchers["grades"].submit(request.user, assignment_id, student_id, value, request.field(data, "comment", str, ""))
+
+    async def list_notifications(self, request):
+        unread = request.query.get("unread") in ("1", "true")
+        important = request.query.get("important") in ("1", "true")
+        notifications = request.user._notifications.iter_by_priority(unread, important)
+        return {"notifications": [notification.get_info() for notification in notifications]}
+
+    async def read_notification(self, request):
+        return await self.batchers["notifications"].submit(request.user, request.params["id"])
+
+    async def list_schedules(self, request):
+        class_id = request.query.get("class_id")
+        day = request.query.get("day")
+        schedules = [schedule for schedule in list(self.edu_platform.schedules.values())
+                     if (class_id is None or schedule.class_id == class_id) and (day is None or schedule.day == day)]
+        return {"schedules": [_schedule_info(schedule) for schedule in schedules]}
+
+    async def create_schedule(self, request):
+        self._require_role(request, UserRole.ADMIN)
+        data = request.json()
+        schedule = Schedule(request.field(data, "class_id", str), request.field(data, "day", str))
+        self.edu_platform.add_schedule(schedule)
+        return 201, _schedule_info(schedule)
+
+    async def add_lesson(self, request):
+        self._require_role(request, UserRole.ADMIN)
+        schedule = self.edu_platform.schedules.get(request.params["id"])
+        if schedule is None:
+            raise ApiError(404, f"Schedule {request.params['id']} not found.")
+        data = request.json()
+        added = schedule.add_lesson(request.field(data, "time", str), request.field(data, "subject", str),
+                                    request.field(data, "teacher_id", int), self.edu_platform)
+        if not added:
+            raise ApiError(409, "The slot or the teacher is already booked.")
+        return 201, _schedule_info(schedule)
+
+    async def teacher_timetable(self, request):
+        return {"teacher_id": request.params["id"], "timetable": self.edu_platform.get_teacher_timetable(request.params["id"], request.query.get("day"))}
+
+    async def student_stats(self, request):
+        student_id = request.params["id"]
+        user = request.user
+        allowed = (user.role in (UserRole.ADMIN, UserRole.TEACHER) or user._id == student_id
+                   or (user.role == UserRole.PARENT and student_id in user.children))
+        if not allowed:
+            raise ApiError(403, "Not allowed to view this student's grades.")
+        if student_id not in self.edu_platform.students:
+            raise ApiError(404, f"Student {student_id} not found.")
+        return self.edu_platform.get_student_stats(student_id, request.query.get("subject"))
+
+    async def class_leaderboard(self, request):
+        class_id = request.params["class_id"]
+        k = request.query_value("k", int, 10)
+        leaderboard = self.edu_platform.get_class_leaderboard(class_id, k, request.query.get("bottom") in ("1", "true"))
+        return {"class_id": class_id, "leaderboard": [{"student_id": student_id, "average": average} for student_id, average in leaderboard]}
+
+    async def class_deadlines(self, request):
+        class_id = request.params["class_id"]
+        hours = request.query_value("hours", float, 48.0)
+        now = time.time()
+        due = self.edu_platform.get_assignments_due(now, now + hours * 3600, class_id)
+        return {"class_id": class_id, "hours": hours, "due": [_assignment_info(assignment) for assignment in due]}
+
+    async def export(self, request):
+        self._require_role(request, UserRole.ADMIN)
+        fmt = request.field(request.json(), "format", str, "all")
+        exports = {
+            "all": self.edu_platform.export_all,
+            "xlsx": self.edu_platform.export_to_xlsx,
+            "csv": self.edu_platform.export_to_csv,
+            "sql": self.edu_platform.export_to_sql,
+            "report": self.edu_platform.export_report,
+        }
+        if fmt not in exports:
+            raise ApiError(400, f"Unknown export format '{fmt}'.")
+        await self._run(exports[fmt])
+        return {"format": fmt, "exported": True}
+
+
+def _assignment_info(assignment):
+    return {
+        "id": assignment.id,
+        "title": assignment.title,
+        "description": assignment.description,
+        "deadline": assignment.deadline,
+        "subject": assignment.subject,
+        "teacher_id": assignment.teacher_id,
+        "class_id": assignment.class_id,
+        "difficulty": assignment.difficulty.value,
+        "submissions": len(assignment.submissions)
+    }
+
+
+def _schedule_info(schedule):
+    return {"id": schedule.id, "class_id": schedule.class_id, "day": schedule.day, "lessons": dict(sorted(schedule.lessons.items()))}
+
+
+def run_server(edu_platform, host=DEFAULT_HOST, port=DEFAULT_PORT, **kwargs):
+    server = ApiServer(edu_platform, host, port, **kwargs)
+
+    async def main():
+        try:
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    return server
+
+
+if __name__ == "__main__":
+    from eduplatform.core import EduPlatform
+
+    parser = argparse.ArgumentParser(description="Serve an EduPlatform over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--snapshot", help="start from a platform snapshot")
+    args = parser.parse_args()
+    platform = EduPlatform(snapshot_path=args.snapshot)
+    try:
+        run_server(platform, args.host, args.port)
+    finally:
+        platform.close()
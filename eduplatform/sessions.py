@@ -0,0 +1,93 @@
+import collections
+import secrets
+import threading
+import time
+
+DEFAULT_SESSION_TTL = 3600.0
+DEFAULT_MAX_SESSIONS = 10000
+
+
+class SessionStore:
+    # Opaque tokens mapped to user ids. Entries expire a fixed ttl after they
+    # are issued; past max_sessions the least recently used token is dropped.
+    # Tokens are also indexed by user so a user's sessions can be revoked
+    # together.
+    def __init__(self, ttl=DEFAULT_SESSION_TTL, max_sessions=DEFAULT_MAX_SESSIONS, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._sessions = collections.OrderedDict()
+        self._by_user = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def issue(self, user_id):
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._sessions[token] = (user_id, self._clock() + self.ttl)
+            self._by_user.setdefault(user_id, set()).add(token)
+            while len(self._sessions) > self.max_sessions:
+                old_token, (old_user_id, _) = self._sessions.popitem(last=False)
+                self._forget(old_token, old_user_id)
+                self.evictions += 1
+        return token
+
+    def resolve(self, token):
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                self.misses += 1
+                return None
+            user_id, expires_at = session
+            if expires_at <= self._clock():
+                del self._sessions[token]
+                self._forget(token, user_id)
+                self.misses += 1
+                return None
+            self._sessions.move_to_end(token)
+            self.hits += 1
+            return user_id
+
+    def revoke(self, token):
+        with self._lock:
+            session = self._sessions.pop(token, None)
+            if session is None:
+                return False
+            self._forget(token, session[0])
+            return True
+
+    def revoke_user(self, user_id):
+        with self._lock:
+            tokens = self._by_user.pop(user_id, ())
+            for token in tokens:
+                self._sessions.pop(token, None)
+            return len(tokens)
+
+    def purge_expired(self):
+        with self._lock:
+            now = self._clock()
+            expired = [(token, user_id) for token, (user_id, expires_at) in self._sessions.items() if expires_at <= now]
+            for token, user_id in expired:
+                del self._sessions[token]
+                self._forget(token, user_id)
+            return len(expired)
+
+    def _forget(self, token, user_id):
+        tokens = self._by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[user_id]
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        return {
+            "active": len(self._sessions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
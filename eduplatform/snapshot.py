@@ -0,0 +1,271 @@
+import collections.abc
+import marshal
+import mmap
+import os
+import struct
+from eduplatform.concurrency import advance_id
+from eduplatform.entities import Assignment, Grade, Schedule, Notification
+from eduplatform.enums import UserRole, AssignmentDifficulty
+from eduplatform.storage import ID_COUNTERS
+from eduplatform.users import Admin, Teacher, Student, Parent
+
+# File layout: header, section table, then one marshal payload per section.
+# Sections are only decoded when the platform first touches them.
+MAGIC = b"EDUSNAP\0"
+VERSION = 3
+_HEADER = struct.Struct("<8sHH")
+_SECTION = struct.Struct("<16sQQ")
+
+USER_CLASSES = {UserRole.ADMIN.value: Admin, UserRole.TEACHER.value: Teacher, UserRole.STUDENT.value: Student, UserRole.PARENT.value: Parent}
+_SKIPPED_USER_STATE = ("_platform", "_notifications")
+
+ASSIGNMENT_FIELDS = ("id", "title", "description", "_deadline_ts", "subject", "teacher_id", "class_id", "difficulty", "submissions", "grades")
+GRADE_FIELDS = ("id", "student_id", "subject", "value", "date", "teacher_id", "comment")
+NOTIFICATION_FIELDS = ("id", "message", "recipient_id", "_created_ts", "is_read", "priority")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _user_state(user):
+    state = {key: value for key, value in user.__getstate__().items() if key not in _SKIPPED_USER_STATE}
+    state["role"] = user.role.value
+    if "assignments_given" in state:
+        state["assignments_given"] = list(state["assignments_given"])
+    return state
+
+
+def _columns(records, fields, convert=None):
+    columns = [[] for _ in fields]
+    for record in records:
+        for column, field in zip(columns, fields):
+            value = getattr(record, field)
+            column.append(convert(field, value) if convert else value)
+    return columns
+
+
+def _assignment_value(field, value):
+    if field == "difficulty":
+        return value.value
+    if field in ("submissions", "grades"):
+        return dict(value)
+    return value
+
+
+def build_sections(platform):
+    users = list(platform.users.values())
+    by_recipient = {}
+    for user in users:
+        if len(user._notifications):
+            by_recipient[user._id] = list(user._notifications)
+    notifications = []
+    ranges = {}
+    for recipient_id, inbox in by_recipient.items():
+        ranges[recipient_id] = (len(notifications), len(notifications) + len(inbox))
+        notifications.extend(inbox)
+
+    return {
+        "meta": dict({name: cls._next_id for name, cls in ID_COUNTERS.items()}, user_notifications=len(notifications)),
+        "users": [_user_state(user) for user in users],
+        "assignments": _columns(platform.assignments.values(), ASSIGNMENT_FIELDS, _assignment_value),
+        "grades": _columns(platform.grades.values(), GRADE_FIELDS),
+        "schedules": [(s.id, s.class_id, s.day, dict(s.lessons)) for s in platform.schedules.values()],
+        "notifications": {"columns": _columns(notifications, NOTIFICATION_FIELDS), "ranges": ranges},
+        "platform_notes": _columns(platform.notifications.values(), NOTIFICATION_FIELDS),
+    }
+
+
+def write_snapshot(sections, path):
+    payloads = [(name.encode(), marshal.dumps(data)) for name, data in sections.items()]
+    offset = _HEADER.size + _SECTION.size * len(payloads)
+    table = []
+    for name, payload in payloads:
+        table.append(_SECTION.pack(name, offset, len(payload)))
+        offset += len(payload)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(payloads)))
+        f.writelines(table)
+        for name, payload in payloads:
+            f.write(payload)
+    os.replace(tmp_path, path)
+    return offset
+
+
+class SnapshotReader:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not an EduPlatform snapshot.")
+        if version != VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version} in {path}.")
+        self._sections = {}
+        for index in range(count):
+            name, offset, length = _SECTION.unpack_from(self._mm, _HEADER.size + index * _SECTION.size)
+            self._sections[name.rstrip(b"\0").decode()] = (offset, length)
+        self._decoded = {}
+
+    def section(self, name):
+        if name not in self._decoded:
+            offset, length = self._sections[name]
+            self._decoded[name] = marshal.loads(self._mm[offset:offset + length])
+            if len(self._decoded) == len(self._sections):
+                self._mm.close()
+        return self._decoded[name]
+
+
+def make_user(state):
+    cls = USER_CLASSES[state["role"]]
+    user = cls.__new__(cls)
+    user.__setstate__(state)
+    user.role = UserRole(state["role"])
+    user._platform = None
+    return user
+
+
+def make_assignment(row):
+    assignment = Assignment.__new__(Assignment)
+    for field, value in zip(ASSIGNMENT_FIELDS, row):
+        setattr(assignment, field, value)
+    assignment.difficulty = AssignmentDifficulty(assignment.difficulty)
+    assignment._platform = None
+    return assignment
+
+
+def make_grade(row):
+    grade = Grade.__new__(Grade)
+    grade.__setstate__(dict(zip(GRADE_FIELDS, row)))
+    return grade
+
+
+def iter_grades(reader):
+    for row in zip(*reader.section("grades")):
+        yield make_grade(row)
+
+
+def make_schedule(row):
+    schedule = Schedule.__new__(Schedule)
+    schedule.id, schedule.class_id, schedule.day, schedule.lessons = row
+    schedule._platform = None
+    return schedule
+
+
+def make_notification(row):
+    notification = Notification.__new__(Notification)
+    for field, value in zip(NOTIFICATION_FIELDS, row):
+        setattr(notification, field, value)
+    return notification
+
+
+class SnapshotTable(collections.abc.MutableMapping):
+    # Dict-like table over one columnar section. The section is decoded on
+    # first use and objects are built per id on access; writes after loading
+    # live in ordinary dicts layered on top.
+    def __init__(self, reader, section, factory, on_load=None, fields=None):
+        self._reader = reader
+        self._section = section
+        self._factory = factory
+        self._on_load = on_load
+        self._fields = fields
+        self._columns = None
+        self._rows = None
+        self._objects = {}
+        self._deleted = set()
+
+    def _ensure_index(self):
+        if self._rows is None:
+            self._columns = self._reader.section(self._section)
+            self._rows = {key: row for row, key in enumerate(self._columns[0])}
+
+    def _build(self, key):
+        self._ensure_index()
+        row = self._rows.get(key)
+        if row is None or key in self._deleted:
+            return None
+        obj = self._factory(tuple(column[row] for column in self._columns))
+        if self._on_load is not None:
+            self._on_load(obj)
+        self._objects[key] = obj
+        return obj
+
+    def __getitem__(self, key):
+        obj = self._objects.get(key)
+        if obj is None:
+            obj = self._build(key)
+            if obj is None:
+                raise KeyError(key)
+        return obj
+
+    def __setitem__(self, key, obj):
+        self._deleted.discard(key)
+        self._objects[key] = obj
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._objects.pop(key, None)
+        self._deleted.add(key)
+
+    def __contains__(self, key):
+        if key in self._objects:
+            return True
+        self._ensure_index()
+        return key in self._rows and key not in self._deleted
+
+    def __iter__(self):
+        self._ensure_index()
+        for key in self._rows:
+            if key not in self._deleted:
+                yield key
+        for key in list(self._objects):
+            if key not in self._rows:
+                yield key
+
+    def iter_columns(self, names):
+        # (id, *values) per record: read from the section's columns for rows
+        # never built and from the objects for those that were.
+        self._ensure_index()
+        columns = [self._columns[self._fields.index(name)] for name in names]
+        for key, row in self._rows.items():
+            if key in self._deleted:
+                continue
+            obj = self._objects.get(key)
+            if obj is None:
+                yield (key,) + tuple(column[row] for column in columns)
+            else:
+                yield (key,) + tuple(getattr(obj, name) for name in names)
+        for key, obj in list(self._objects.items()):
+            if key not in self._rows:
+                yield (key,) + tuple(getattr(obj, name) for name in names)
+
+    def __len__(self):
+        self._ensure_index()
+        extra = sum(1 for key in self._objects if key not in self._rows)
+        return len(self._rows) - len(self._deleted) + extra
+
+
+def restore_id_counters(reader):
+    stored = reader.section("meta")
+    for name, cls in ID_COUNTERS.items():
+        advance_id(cls, stored.get(name, 1))
+
+
+def notification_loader(reader, recipient_id):
+    def load():
+        section = reader.section("notifications")
+        bounds = section["ranges"].get(recipient_id)
+        if bounds is None:
+            return []
+        columns = section["columns"]
+        return [make_notification(tuple(column[row] for column in columns)) for row in range(*bounds)]
+    return load
+
+
+def iter_platform_notifications(reader):
+    columns = reader.section("platform_notes")
+    for row in zip(*columns):
+        yield make_notification(row)
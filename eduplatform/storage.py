@@ -0,0 +1,352 @@
+import collections
+import collections.abc
+import functools
+import pickle
+import sqlite3
+import threading
+import weakref
+from eduplatform.abstracts import AbstractRole
+from eduplatform.concurrency import advance_id
+from eduplatform.entities import Assignment, Grade, Schedule, Notification
+from eduplatform.enums import UserRole
+from eduplatform.journal import DELETE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    role TEXT NOT NULL,
+    class_id TEXT,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_class_id ON users(class_id);
+CREATE TABLE IF NOT EXISTS assignments (
+    id INTEGER PRIMARY KEY,
+    teacher_id INTEGER NOT NULL,
+    class_id TEXT NOT NULL,
+    deadline REAL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_assignments_class_id ON assignments(class_id);
+CREATE TABLE IF NOT EXISTS grades (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_grades_student_id ON grades(student_id);
+CREATE TABLE IF NOT EXISTS schedules (
+    id INTEGER PRIMARY KEY,
+    class_id TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_schedules_class_id ON schedules(class_id);
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,
+    recipient_id INTEGER NOT NULL,
+    platform_level INTEGER NOT NULL DEFAULT 0,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notifications_recipient_id ON notifications(recipient_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Classes whose _next_id counters are persisted alongside the data.
+ID_COUNTERS = {"AbstractRole": AbstractRole, "Assignment": Assignment, "Grade": Grade, "Schedule": Schedule, "Notification": Notification}
+
+# Indexed columns callers may filter on.
+QUERYABLE_COLUMNS = {
+    "users": ("class_id",),
+    "assignments": ("teacher_id", "class_id"),
+    "grades": ("student_id",),
+    "schedules": ("class_id",),
+    "notifications": ("recipient_id",),
+}
+
+
+def _dump(obj):
+    # Objects are stored as (class, state) without the platform back-reference.
+    # Users leave their notifications to the notifications table and teachers
+    # keep only the ids of the assignments they gave.
+    state = dict(obj.__getstate__())
+    state.pop("_platform", None)
+    state.pop("_notifications", None)
+    if "assignments_given" in state:
+        state["assignments_given"] = list(state["assignments_given"])
+    return pickle.dumps((type(obj), state), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load(data):
+    cls, state = pickle.loads(data)
+    obj = cls.__new__(cls)
+    obj.__setstate__(state)
+    return obj
+
+
+def _columns(table, obj):
+    if table == "users":
+        return (obj._email, obj.role.value, obj.grade if obj.role == UserRole.STUDENT else None)
+    if table == "assignments":
+        return (obj.teacher_id, obj.class_id, obj._deadline_ts)
+    if table == "grades":
+        return (obj.student_id,)
+    if table == "schedules":
+        return (obj.class_id,)
+    return (obj.recipient_id,)
+
+
+_UPSERTS = {
+    "users": "INSERT OR REPLACE INTO users (id, email, role, class_id, data) VALUES (?, ?, ?, ?, ?)",
+    "assignments": "INSERT OR REPLACE INTO assignments (id, teacher_id, class_id, deadline, data) VALUES (?, ?, ?, ?, ?)",
+    "grades": "INSERT OR REPLACE INTO grades (id, student_id, data) VALUES (?, ?, ?)",
+    "schedules": "INSERT OR REPLACE INTO schedules (id, class_id, data) VALUES (?, ?, ?)",
+    "notifications": "INSERT OR REPLACE INTO notifications (id, recipient_id, platform_level, data) VALUES (?, ?, ?, ?)",
+}
+
+
+class SQLiteStorage:
+    # Write-behind persistence: changes reported by the platform are kept in
+    # a pending map and written in one transaction per batch.
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._add_deadline_column()
+
+    def _add_deadline_column(self):
+        # Databases written before assignments had a deadline column get one,
+        # filled in from the stored objects.
+        if any(row[1] == "deadline" for row in self._conn.execute("PRAGMA table_info(assignments)")):
+            return
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.execute("ALTER TABLE assignments ADD COLUMN deadline REAL")
+            rows = [(_load(data)._deadline_ts, key) for key, data in self._conn.execute("SELECT id, data FROM assignments")]
+            self._conn.executemany("UPDATE assignments SET deadline = ? WHERE id = ?", rows)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def record(self, table, key, op, obj, platform_level=False):
+        with self._lock:
+            self._pending[(table, key)] = (op, obj, platform_level)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return 0
+            upserts = collections.defaultdict(list)
+            deletes = collections.defaultdict(list)
+            for (table, key), (op, obj, platform_level) in self._pending.items():
+                if op == DELETE:
+                    deletes[table].append((key,))
+                elif table == "notifications":
+                    upserts[table].append((key,) + _columns(table, obj) + (1 if platform_level else 0, _dump(obj)))
+                else:
+                    upserts[table].append((key,) + _columns(table, obj) + (_dump(obj),))
+            written = len(self._pending)
+            self._conn.execute("BEGIN")
+            try:
+                for table, rows in deletes.items():
+                    self._conn.executemany(f"DELETE FROM {table} WHERE id = ?", rows)
+                for table, rows in upserts.items():
+                    self._conn.executemany(_UPSERTS[table], rows)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [(f"next_id:{name}", cls._next_id) for name, cls in ID_COUNTERS.items()]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._pending.clear()
+            return written
+
+    def has_data(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is not None
+
+    def restore_id_counters(self):
+        with self._lock:
+            stored = dict(self._conn.execute("SELECT key, value FROM meta"))
+        for name, cls in ID_COUNTERS.items():
+            advance_id(cls, stored.get(f"next_id:{name}", 1))
+
+    def load(self, table, key):
+        with self._lock:
+            pending = self._pending.get((table, key))
+            if pending is not None:
+                return None if pending[0] == DELETE else pending[1]
+            row = self._conn.execute(f"SELECT data FROM {table} WHERE id = ?", (key,)).fetchone()
+        return _load(row[0]) if row else None
+
+    def contains(self, table, key):
+        with self._lock:
+            pending = self._pending.get((table, key))
+            if pending is not None:
+                return pending[0] != DELETE
+            return self._conn.execute(f"SELECT 1 FROM {table} WHERE id = ?", (key,)).fetchone() is not None
+
+    def count(self, table):
+        with self._lock:
+            self.flush()
+            return self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def keys(self, table):
+        with self._lock:
+            self.flush()
+            return [row[0] for row in self._conn.execute(f"SELECT id FROM {table} ORDER BY id")]
+
+    def iter_rows(self, table, where="", params=(), batch=1000):
+        with self._lock:
+            self.flush()
+            cursor = self._conn.execute(f"SELECT id, data FROM {table} {where} ORDER BY id", params)
+            rows = cursor.fetchmany(batch)
+        while rows:
+            for key, data in rows:
+                yield key, data
+            with self._lock:
+                rows = cursor.fetchmany(batch)
+
+    def iter_columns(self, table, columns, batch=1000):
+        # (id, *columns) per row, straight from the table without loading
+        # the stored objects.
+        with self._lock:
+            self.flush()
+            cursor = self._conn.execute(f"SELECT id, {', '.join(columns)} FROM {table} ORDER BY id")
+            rows = cursor.fetchmany(batch)
+        while rows:
+            yield from rows
+            with self._lock:
+                rows = cursor.fetchmany(batch)
+
+    def iter_objects(self, table, where="", params=()):
+        for key, data in self.iter_rows(table, where, params):
+            yield _load(data)
+
+    def query_ids(self, table, column, value):
+        if column not in QUERYABLE_COLUMNS.get(table, ()):
+            raise ValueError(f"Column {column} of {table} is not indexed.")
+        with self._lock:
+            self.flush()
+            return [row[0] for row in self._conn.execute(f"SELECT id FROM {table} WHERE {column} = ? ORDER BY id", (value,))]
+
+    def notification_loader(self, recipient_id):
+        return functools.partial(self.iter_objects, "notifications", "WHERE recipient_id = ? AND platform_level = 0", (recipient_id,))
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+
+class LazyTable(collections.abc.MutableMapping):
+    # Dict-like view of one storage table. Objects are loaded on first access;
+    # a small LRU keeps recent ones alive and a weak map hands back the same
+    # object for as long as anything else still references it.
+    def __init__(self, storage, table, on_load=None, cache_size=10000):
+        self._storage = storage
+        self._table = table
+        self._on_load = on_load
+        self._cache_size = cache_size
+        self._live = weakref.WeakValueDictionary()
+        self._recent = collections.OrderedDict()
+        self._load_lock = threading.Lock()
+
+    def _remember(self, key, obj):
+        self._live[key] = obj
+        self._recent[key] = obj
+        self._recent.move_to_end(key)
+        if len(self._recent) > self._cache_size:
+            self._recent.popitem(last=False)
+
+    def _resolve(self, key, data=None):
+        obj = self._live.get(key)
+        if obj is None:
+            # Loads are serialised so two threads never build two objects
+            # for one row.
+            with self._load_lock:
+                obj = self._live.get(key)
+                if obj is None:
+                    obj = _load(data) if data is not None else self._storage.load(self._table, key)
+                    if obj is None:
+                        return None
+                    if self._on_load is not None:
+                        self._on_load(obj)
+                    self._live[key] = obj
+        self._remember(key, obj)
+        return obj
+
+    def __getitem__(self, key):
+        obj = self._resolve(key)
+        if obj is None:
+            raise KeyError(key)
+        return obj
+
+    def get(self, key, default=None):
+        obj = self._resolve(key)
+        return default if obj is None else obj
+
+    def __setitem__(self, key, obj):
+        # Persistence is driven by the platform's change records.
+        self._remember(key, obj)
+
+    def __delitem__(self, key):
+        self._live.pop(key, None)
+        self._recent.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._live or self._storage.contains(self._table, key)
+
+    def __iter__(self):
+        return iter(self._storage.keys(self._table))
+
+    def __len__(self):
+        return self._storage.count(self._table)
+
+    def values(self):
+        for key, data in self._storage.iter_rows(self._table):
+            yield self._resolve(key, data)
+
+    def items(self):
+        for key, data in self._storage.iter_rows(self._table):
+            yield key, self._resolve(key, data)
+
+
+class LazyRefs(collections.abc.MutableMapping):
+    # Id-keyed view into a LazyTable, used for per-user collections such as
+    # Teacher.assignments_given so they do not pin every object in memory.
+    def __init__(self, table, keys=()):
+        self._table = table
+        self._keys = dict.fromkeys(keys)
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._table[key]
+
+    def __setitem__(self, key, obj):
+        self._keys[key] = None
+        self._table[key] = obj
+
+    def __delitem__(self, key):
+        del self._keys[key]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
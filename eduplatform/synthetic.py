@@ -0,0 +1,138 @@
+import contextlib
+import datetime
+import random
+from eduplatform.enums import AssignmentDifficulty
+from eduplatform.users import Teacher, Student, Parent
+
+WEEKLY_HOURS = {
+    "Math": 5, "Language": 4, "Science": 3, "History": 2, "Geography": 2,
+    "Informatics": 2, "Art": 1, "Music": 1, "PE": 2,
+}
+TEACHER_CAPACITY = 37
+DEFAULT_PASSWORD = "synthetic"
+# Far enough ahead that every generated submission is on time, so runs do
+# not depend on the current date.
+DEADLINE_BASE = datetime.datetime(2099, 9, 1, 9, 0)
+# Skewed towards the middle, like real marks.
+GRADE_WEIGHTS = {1: 1, 2: 2, 3: 4, 4: 5, 5: 3}
+
+
+class SyntheticSchool:
+    def __init__(self, edu_platform, seed):
+        self.edu_platform = edu_platform
+        self.seed = seed
+        self.class_ids = []
+        self.teacher_ids = []
+        self.student_ids = []
+        self.parent_ids = []
+        self.assignment_ids = []
+        self.class_teachers = {}
+        self.submissions = 0
+        self.grades = 0
+
+    def summary(self):
+        return {
+            "seed": self.seed,
+            "classes": len(self.class_ids),
+            "teachers": len(self.teacher_ids),
+            "students": len(self.student_ids),
+            "parents": len(self.parent_ids),
+            "assignments": len(self.assignment_ids),
+            "submissions": self.submissions,
+            "grades": self.grades,
+            "notifications": self.edu_platform.user_notification_count
+        }
+
+
+def class_names(classes):
+    # 1-A, 1-B, ... 11-A, 11-B, ...: up to four parallel classes per year.
+    return [f"{1 + index // 4 % 11}-{'ABCD'[index % 4]}" + (f"{index // 44}" if index >= 44 else "") for index in range(classes)]
+
+
+def generate_school(edu_platform, classes=10, students_per_class=25, parent_ratio=0.8, assignments_per_subject=1,
+                    submission_rate=0.9, grade_rate=0.8, weekly_hours=None, seed=0, password=DEFAULT_PASSWORD, quiet=True):
+    # Builds a school through the public APIs: users are registered in
+    # batches, assignments come from Teacher.create_assignment (with its
+    # notification fan-out), submissions from Student.submit_assignment and
+    # grades from Teacher.grade_assignment. The same arguments on a fresh
+    # platform always give the same school.
+    with edu_platform.events.silenced() if quiet else contextlib.nullcontext():
+        return _generate(edu_platform, classes, students_per_class, parent_ratio, assignments_per_subject,
+                         submission_rate, grade_rate, weekly_hours or WEEKLY_HOURS, seed, password)
+
+
+def _generate(edu_platform, classes, students_per_class, parent_ratio, assignments_per_subject,
+              submission_rate, grade_rate, weekly_hours, seed, password):
+    rng = random.Random(seed)
+    school = SyntheticSchool(edu_platform, seed)
+    school.class_ids = class_names(classes)
+    tag = f"s{seed}"
+
+    # Each subject gets just enough teachers to cover its hours at
+    # TEACHER_CAPACITY lessons a week, filled class by class, so the school
+    # always has a feasible timetable.
+    teachers = []
+    class_subjects = {class_id: {} for class_id in school.class_ids}
+    for subject, hours in weekly_hours.items():
+        teacher = None
+        for class_id in school.class_ids:
+            if teacher is None or (len(teacher.classes) + 1) * hours > TEACHER_CAPACITY:
+                number = len(teachers) + 1
+                teacher = Teacher(f"Teacher {number}", f"teacher{number}.{tag}@school.test", password)
+                teacher.subjects = [subject]
+                teachers.append(teacher)
+            teacher.classes.append(class_id)
+            class_subjects[class_id][subject] = teacher
+    edu_platform.add_users(teachers)
+    school.teacher_ids = [teacher._id for teacher in teachers]
+    school.class_teachers = {class_id: {subject: teacher._id for subject, teacher in subjects.items()}
+                             for class_id, subjects in class_subjects.items()}
+
+    students_by_class = {}
+    students = []
+    for class_id in school.class_ids:
+        members = []
+        for number in range(students_per_class):
+            student = Student(f"Student {class_id}/{number}", f"student.{class_id}.{number}.{tag}@school.test", password, class_id)
+            student.subjects = {subject: teacher._id for subject, teacher in class_subjects[class_id].items()}
+            members.append(student)
+        students_by_class[class_id] = members
+        students.extend(members)
+    edu_platform.add_users(students)
+    school.student_ids = [student._id for student in students]
+
+    # parent_ratio of the students have a parent; every fifth parent also
+    # has the next student in the class as a second child.
+    parents = []
+    for members in students_by_class.values():
+        for index, student in enumerate(members):
+            if rng.random() >= parent_ratio:
+                continue
+            parent = Parent(f"Parent of {student._full_name}", f"parent.{student._id}.{tag}@school.test", password)
+            parent.add_child(student._id)
+            if len(parents) % 5 == 4 and index + 1 < len(members):
+                parent.add_child(members[index + 1]._id)
+            parents.append(parent)
+    edu_platform.add_users(parents)
+    school.parent_ids = [parent._id for parent in parents]
+
+    difficulties = list(AssignmentDifficulty)
+    grade_values = list(GRADE_WEIGHTS)
+    grade_weights = list(GRADE_WEIGHTS.values())
+    for round_number in range(assignments_per_subject):
+        for class_id in school.class_ids:
+            for subject, teacher in class_subjects[class_id].items():
+                deadline = (DEADLINE_BASE + datetime.timedelta(days=7 * round_number + rng.randrange(7))).isoformat()
+                assignment = teacher.create_assignment(edu_platform, f"{subject} task {round_number + 1}", f"Synthetic {subject} work for {class_id}.",
+                                                       deadline, subject, class_id, rng.choice(difficulties))
+                school.assignment_ids.append(assignment.id)
+                for student in students_by_class[class_id]:
+                    if rng.random() >= submission_rate:
+                        continue
+                    student.submit_assignment(assignment, f"Answer from {student._full_name}.")
+                    school.submissions += 1
+                    if rng.random() < grade_rate:
+                        value = rng.choices(grade_values, grade_weights)[0]
+                        teacher.grade_assignment(edu_platform, assignment.id, student._id, value)
+                        school.grades += 1
+    return school
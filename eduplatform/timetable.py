@@ -0,0 +1,182 @@
+import collections
+import time
+from eduplatform.entities import Schedule
+
+DEFAULT_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+DEFAULT_TIMES = ["08:00", "09:00", "10:00", "11:00", "12:00", "13:00", "14:00", "15:00"]
+
+
+class TimetableResult:
+    # plan holds (class_id, day, {time: lesson}) for every lesson placed by
+    # the run; schedules holds the platform schedules they went into, and is
+    # empty unless the timetable was applied.
+    def __init__(self, plan, schedules, unplaced, skipped, elapsed):
+        self.plan = plan
+        self.schedules = schedules
+        self.unplaced = unplaced
+        self.skipped = skipped
+        self.elapsed = elapsed
+
+    @property
+    def is_complete(self):
+        return not self.unplaced
+
+    def summary(self):
+        return {
+            "schedules": len(self.plan),
+            "lessons": sum(len(lessons) for _, _, lessons in self.plan),
+            "unplaced": len(self.unplaced),
+            "skipped": len(self.skipped),
+            "elapsed": self.elapsed
+        }
+
+
+class TimetableGenerator:
+    # Greedy constructive solver: lessons of the most loaded teachers and
+    # classes are placed first, each into the free slot that best spreads the
+    # subject over the week; a lesson with no free slot tries one repair move
+    # of the teacher's clashing lesson before it is reported as unplaced.
+    def __init__(self, edu_platform, weekly_hours, default_hours=0, days=None, times=None):
+        self.edu_platform = edu_platform
+        self.weekly_hours = weekly_hours
+        self.default_hours = default_hours
+        self.days = list(days or DEFAULT_DAYS)
+        self.times = list(times or DEFAULT_TIMES)
+        self.slots = [(d, t) for d in range(len(self.days)) for t in range(len(self.times))]
+
+    def collect_requirements(self):
+        # class_id -> {subject: teacher_id}, taken from what the class's
+        # students study; the most common teacher wins when they disagree.
+        votes = collections.defaultdict(collections.Counter)
+        for class_id, student_ids in self.edu_platform.students_by_class.items():
+            for student_id in student_ids:
+                student = self.edu_platform.get_user_by_id(student_id)
+                if student is None:
+                    continue
+                for subject, teacher_id in student.subjects.items():
+                    votes[(class_id, subject)][teacher_id] += 1
+
+        requirements = collections.defaultdict(dict)
+        skipped = []
+        for (class_id, subject), counter in votes.items():
+            teacher_id = counter.most_common(1)[0][0]
+            teacher = self.edu_platform.teachers.get(teacher_id)
+            if teacher is None or subject not in teacher.subjects or class_id not in teacher.classes:
+                skipped.append({"class_id": class_id, "subject": subject, "teacher_id": teacher_id, "reason": "teacher does not teach this subject or class"})
+                continue
+            requirements[class_id][subject] = teacher_id
+        return requirements, skipped
+
+    def _lessons(self, requirements):
+        lessons = []
+        for class_id, subjects in requirements.items():
+            for subject, teacher_id in subjects.items():
+                hours = self.weekly_hours.get(subject, self.default_hours)
+                lessons.extend((class_id, subject, teacher_id) for _ in range(hours))
+        teacher_load = collections.Counter(teacher_id for _, _, teacher_id in lessons)
+        class_load = collections.Counter(class_id for class_id, _, _ in lessons)
+        lessons.sort(key=lambda lesson: (-teacher_load[lesson[2]], -class_load[lesson[0]], lesson[0], lesson[1]))
+        return lessons
+
+    def generate(self, apply=True):
+        start = time.perf_counter()
+        requirements, skipped = self.collect_requirements()
+        lessons = self._lessons(requirements)
+
+        class_slots = collections.defaultdict(dict)
+        teacher_slots = collections.defaultdict(dict)
+        subject_day_count = collections.Counter()
+        day_load = collections.Counter()
+        day_index = {day: d for d, day in enumerate(self.days)}
+        time_index = {t: i for i, t in enumerate(self.times)}
+
+        # Lessons already booked on the platform stay where they are.
+        existing = {}
+        for schedule in self.edu_platform.schedules.values():
+            existing[(schedule.class_id, schedule.day)] = schedule
+            if schedule.day not in day_index:
+                continue
+            for lesson_time, lesson in schedule.lessons.items():
+                if lesson_time in time_index:
+                    slot = (day_index[schedule.day], time_index[lesson_time])
+                    class_slots[schedule.class_id][slot] = None
+                    teacher_slots[lesson["teacher_id"]][slot] = None
+
+        def place(lesson, slot):
+            class_id, subject, teacher_id = lesson
+            class_slots[class_id][slot] = lesson
+            teacher_slots[teacher_id][slot] = lesson
+            subject_day_count[(class_id, subject, slot[0])] += 1
+            day_load[(class_id, slot[0])] += 1
+
+        def unplace(lesson, slot):
+            class_id, subject, teacher_id = lesson
+            del class_slots[class_id][slot]
+            del teacher_slots[teacher_id][slot]
+            subject_day_count[(class_id, subject, slot[0])] -= 1
+            day_load[(class_id, slot[0])] -= 1
+
+        def best_slot(lesson, exclude=None):
+            class_id, subject, teacher_id = lesson
+            busy_class = class_slots[class_id]
+            busy_teacher = teacher_slots[teacher_id]
+            best = None
+            best_score = None
+            for slot in self.slots:
+                if slot in busy_class or slot in busy_teacher or slot == exclude:
+                    continue
+                score = (subject_day_count[(class_id, subject, slot[0])], day_load[(class_id, slot[0])], slot[1])
+                if best_score is None or score < best_score:
+                    best, best_score = slot, score
+            return best
+
+        def repair(lesson):
+            class_id, subject, teacher_id = lesson
+            busy_class = class_slots[class_id]
+            for slot in self.slots:
+                if slot in busy_class:
+                    continue
+                blocking = teacher_slots[teacher_id].get(slot)
+                if blocking is None:
+                    continue
+                unplace(blocking, slot)
+                target = best_slot(blocking, exclude=slot)
+                if target is not None:
+                    place(blocking, target)
+                    place(lesson, slot)
+                    return True
+                place(blocking, slot)
+            return False
+
+        unplaced = []
+        for lesson in lessons:
+            slot = best_slot(lesson)
+            if slot is not None:
+                place(lesson, slot)
+            elif not repair(lesson):
+                unplaced.append({"class_id": lesson[0], "subject": lesson[1], "teacher_id": lesson[2]})
+
+        plan = []
+        for class_id in sorted(class_slots):
+            by_day = collections.defaultdict(dict)
+            for (d, t), lesson in class_slots[class_id].items():
+                if lesson is not None:
+                    by_day[d][self.times[t]] = {"subject": lesson[1], "teacher_id": lesson[2]}
+            for d in sorted(by_day):
+                plan.append((class_id, self.days[d], dict(sorted(by_day[d].items()))))
+
+        # Schedules are only created for days the platform has none for, so
+        # a dry run or a merge never uses up schedule ids.
+        schedules = []
+        if apply:
+            for class_id, day, lessons in plan:
+                schedule = existing.get((class_id, day))
+                if schedule is None:
+                    schedule = Schedule(class_id, day)
+                    schedule.lessons = lessons
+                    self.edu_platform.add_schedule(schedule)
+                else:
+                    for lesson_time, lesson in lessons.items():
+                        schedule.add_lesson(lesson_time, lesson["subject"], lesson["teacher_id"], self.edu_platform)
+                schedules.append(schedule)
+        return TimetableResult(plan, schedules, unplaced, skipped, time.perf_counter() - start)
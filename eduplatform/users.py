@@ -1,15 +1,41 @@
-from eduplatform.abstracts import AbstractRole
-import datetime 
+from eduplatform.abstracts import AbstractRole, to_timestamp
 from eduplatform.enums import UserRole, AssignmentDifficulty
 from eduplatform.entities import Assignment, Grade, Notification
+from eduplatform.journal import INSERT, UPDATE, DELETE
+from eduplatform.notifications import NotificationStore
+from eduplatform.aggregates import RunningStats
+from eduplatform.reports import render_report
+from eduplatform.events import emit, ERROR, WARNING
+from eduplatform.instrumentation import instrumentation
+import contextlib
+import sys
 
 class User(AbstractRole):
+    __slots__ = ("role", "_notifications", "phone", "address", "_platform")
+
     def __init__(self, full_name, email, password, role):
         super().__init__(full_name, email, password)
         self.role = role
-        self._notifications = []
+        self._notifications = NotificationStore()
         self.phone = None
         self.address = None
+        self._platform = None
+
+    def _record_change(self, op=UPDATE):
+        if self._platform is not None:
+            self._platform._record_change("users", self._id, op, self)
+
+    def _users_lock(self):
+        # Containers on attached users change under the platform's users lock.
+        return self._platform._locks["users"] if self._platform is not None else contextlib.nullcontext()
+
+    def _inbox_lock(self):
+        # Inboxes of attached users share the platform's notifications lock.
+        return self._platform._locks["notifications"] if self._platform is not None else contextlib.nullcontext()
+
+    def _record_notification_change(self, notification, op):
+        if self._platform is not None:
+            self._platform._record_change("notifications", notification.id, op, notification)
 
     def get_profile(self):
         return {
@@ -23,6 +49,7 @@ class User(AbstractRole):
         }
 
     def update_profile(self, **kwargs):
+        old_class = getattr(self, "grade", None)
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
@@ -31,109 +58,137 @@ class User(AbstractRole):
             elif key == "email":
                 self._email = value
             else:
-                print(f"Warning: Cannot update unknown attribute '{key}' for user {self._full_name}.")
-        print(f"Profile for {self._full_name} updated.")
+                emit("user.update_profile", f"Warning: Cannot update unknown attribute '{key}' for user {self._full_name}.", level=WARNING)
+        if self._platform is not None:
+            self._platform._revalidate_user(self)
+            if self.role == UserRole.STUDENT and "grade" in kwargs:
+                self._platform._student_class_changed(self, old_class)
+            if "_password_hash" in kwargs:
+                self._platform.sessions.revoke_user(self._id)
+        self._record_change()
+        emit("user.update_profile", f"Profile for {self._full_name} updated.")
+
+    def change_password(self, old_password, new_password):
+        if not self.verify_password(old_password):
+            emit("user.change_password", f"Error: Current password for {self._full_name} is incorrect.", level=ERROR)
+            return False
+        self._password_hash = self._hash_password(new_password)
+        if self._platform is not None:
+            self._platform._password_changed(self)
+        emit("user.change_password", f"Password for {self._full_name} changed.")
+        return True
 
     def add_notification(self, message, priority=0):
         new_notification = Notification(message, self._id, priority=priority)
-        self._notifications.append(new_notification)
-        print(f"Notification added for {self._full_name}: {message}")
+        with self._inbox_lock():
+            self._notifications.add(new_notification)
+            self._record_notification_change(new_notification, INSERT)
+        emit("user.notification_added", f"Notification added for {self._full_name}: {message}", user_id=self._id, notification_id=new_notification.id, priority=priority)
         return new_notification
 
     def view_notifications(self, unread_only=False, important_only=False):
         filtered_notifications = []
-        print(f"\nNotifications for {self._full_name}:")
-        for notification in sorted(self._notifications, key=lambda n: n.priority, reverse=True):
-            if unread_only and notification.is_read:
-                continue
-            if important_only and notification.priority < 1:
-                continue
+        emit("user.view_notifications", f"\nNotifications for {self._full_name}:")
+        for notification in self._notifications.iter_by_priority(unread_only, important_only):
             filtered_notifications.append(notification.get_info())
-            print(f"- [ID: {notification.id}] {'[READ]' if notification.is_read else '[UNREAD]'} [Priority: {notification.priority}] ({notification.created_at}): {notification.message}")
+            emit("user.view_notifications", f"- [ID: {notification.id}] {'[READ]' if notification.is_read else '[UNREAD]'} [Priority: {notification.priority}] ({notification.created_at}): {notification.message}")
         return filtered_notifications
 
     def mark_notification_as_read(self, notification_id):
-        for notification in self._notifications:
-            if notification.id == notification_id:
-                notification.mark_as_read()
-                print(f"Notification {notification_id} marked as read for {self._full_name}.")
-                return True
-        print(f"Notification {notification_id} not found for {self._full_name}.")
+        with self._inbox_lock():
+            notification = self._notifications.mark_read(notification_id)
+            if notification is not None:
+                self._record_notification_change(notification, UPDATE)
+        if notification is not None:
+            emit("user.mark_notification_as_read", f"Notification {notification_id} marked as read for {self._full_name}.")
+            return True
+        emit("user.mark_notification_as_read", f"Notification {notification_id} not found for {self._full_name}.")
         return False
 
     def delete_notification(self, notification_id):
-        initial_count = len(self._notifications)
-        self._notifications = [n for n in self._notifications if n.id != notification_id]
-        if len(self._notifications) < initial_count:
-            print(f"Notification {notification_id} deleted for {self._full_name}.")
+        with self._inbox_lock():
+            removed = self._notifications.remove(notification_id)
+            if removed is not None:
+                self._record_notification_change(removed, DELETE)
+        if removed is not None:
+            emit("user.delete_notification", f"Notification {notification_id} deleted for {self._full_name}.")
             return True
-        print(f"Notification {notification_id} not found for {self._full_name}.")
+        emit("user.delete_notification", f"Notification {notification_id} not found for {self._full_name}.")
         return False
 
 class Student(User):
+    __slots__ = ("grade", "subjects", "assignments")
+
     def __init__(self, full_name, email, password, grade):
         super().__init__(full_name, email, password, UserRole.STUDENT)
-        self.grade = grade
+        self.grade = sys.intern(grade) if isinstance(grade, str) else grade
         self.subjects = {}
         self.assignments = {}
-        self.grades = {}
+
+    @property
+    def grades(self):
+        # {subject: [values]}, read from the platform's grade store.
+        if self._platform is None:
+            return {}
+        return self._platform.grades.values_by_subject(self._id)
 
     def submit_assignment(self, assignment_obj, content, max_length=500):
         if len(content) > max_length:
-            print(f"Error: Submission content exceeds maximum length of {max_length} characters.")
+            emit("student.submit_assignment", f"Error: Submission content exceeds maximum length of {max_length} characters.", level=ERROR)
             return False
 
-        if assignment_obj.deadline < datetime.datetime.now().isoformat():
+        if assignment_obj.is_overdue():
             status = "Late Submitted"
-            print(f"Warning: Assignment '{assignment_obj.title}' submitted late.")
+            emit("student.submit_assignment", f"Warning: Assignment '{assignment_obj.title}' submitted late.", level=WARNING)
         else:
             status = "Submitted"
 
         assignment_obj.add_submission(self._id, content)
-        self.assignments[assignment_obj.id] = status
-        print(f"Assignment '{assignment_obj.title}' submitted by {self._full_name}. Status: {status}")
+        with self._users_lock():
+            self.assignments[assignment_obj.id] = status
+            self._record_change()
+        emit("student.submit_assignment", f"Assignment '{assignment_obj.title}' submitted by {self._full_name}. Status: {status}")
         return True
 
     def view_grades(self, subject=None):
-        print(f"\nGrades for {self._full_name} ({self.grade}):")
+        emit("student.view_grades", f"\nGrades for {self._full_name} ({self.grade}):")
         if not self.grades:
-            print("No grades recorded yet.")
+            emit("student.view_grades", "No grades recorded yet.")
             return {}
 
         filtered_grades = {}
         for s, grade_list in self.grades.items():
             if subject and s != subject:
                 continue
-            print(f"  Subject: {s}, Grades: {grade_list}")
+            emit("student.view_grades", f"  Subject: {s}, Grades: {grade_list}")
             filtered_grades[s] = grade_list
         return filtered_grades
 
+    def _grade_stats(self, subject=None):
+        if self._platform is None:
+            return RunningStats()
+        return self._platform.grades.aggregates.student(self._id, subject)
+
     def calculate_average_grade(self, subject=None):
-        grades_to_average = []
-        if subject:
-            grades_to_average = self.grades.get(subject, [])
-        else:
-            for grade_list in self.grades.values():
-                grades_to_average.extend(grade_list)
+        avg = self._grade_stats(subject or None).mean
 
-        if not grades_to_average:
-            print(f"No grades to calculate average for {'subject ' + subject if subject else 'all subjects'}.")
+        if avg is None:
+            emit("student.calculate_average_grade", f"No grades to calculate average for {'subject ' + subject if subject else 'all subjects'}.")
             return 0.0
-        avg = sum(grades_to_average) / len(grades_to_average)
-        print(f"Average grade for {self._full_name} ({'subject ' + subject if subject else 'all subjects'}): {avg:.2f}")
+        emit("student.calculate_average_grade", f"Average grade for {self._full_name} ({'subject ' + subject if subject else 'all subjects'}): {avg:.2f}")
         return avg
 
     def get_subject_stats(self, subject):
-        grades = self.grades.get(subject, [])
-        if not grades:
-            return {"min": None, "max": None, "average": None}
+        stats = self._grade_stats(subject)
         return {
-            "min": min(grades),
-            "max": max(grades),
-            "average": sum(grades) / len(grades)
+            "min": stats.min,
+            "max": stats.max,
+            "average": stats.mean
         }
 
 class Teacher(User):
+    __slots__ = ("subjects", "classes", "assignments_given", "workload")
+
     def __init__(self, full_name, email, password):
         super().__init__(full_name, email, password, UserRole.TEACHER)
         self.subjects = []
@@ -143,178 +198,182 @@ class Teacher(User):
 
     def create_assignment(self, edu_platform, title, description, deadline, subject, class_id, difficulty=AssignmentDifficulty.MEDIUM):
         if subject not in self.subjects:
-            print(f"Error: {self._full_name} does not teach {subject}.")
+            emit("teacher.create_assignment", f"Error: {self._full_name} does not teach {subject}.", level=ERROR)
             return None
         if class_id not in self.classes:
-            print(f"Error: {self._full_name} does not teach class {class_id}.")
+            emit("teacher.create_assignment", f"Error: {self._full_name} does not teach class {class_id}.", level=ERROR)
+            return None
+        try:
+            deadline = to_timestamp(deadline)
+        except (TypeError, ValueError):
+            emit("teacher.create_assignment", f"Error: Invalid deadline '{deadline}'.", level=ERROR)
             return None
+        edu_platform._check_open()
 
         new_assignment = Assignment(
             title, description, deadline, subject, self._id, class_id, difficulty
         )
         edu_platform.add_assignment(new_assignment)
         self.assignments_given[new_assignment.id] = new_assignment
-        print(f"Assignment '{title}' created by {self._full_name}.")
+        self._record_change()
+        emit("teacher.create_assignment", f"Assignment '{title}' created by {self._full_name}.")
 
         for student_id in edu_platform.students_by_class.get(class_id, []):
             student = edu_platform.get_user_by_id(student_id)
             if student:
-                student.add_notification(f"New assignment: '{title}' for {subject}. Deadline: {deadline}")
-                for parent_id, parent in edu_platform.parents.items():
-                    if student._id in parent.children:
-                        parent.add_notification(f"Your child, {student._full_name}, has a new assignment: '{title}'.")
+                student.add_notification(f"New assignment: '{title}' for {subject}. Deadline: {new_assignment.deadline}")
+                for parent in edu_platform.get_parents_of(student._id):
+                    parent.add_notification(f"Your child, {student._full_name}, has a new assignment: '{title}'.")
         return new_assignment
 
     def grade_assignment(self, edu_platform, assignment_id, student_id, grade_value, comment=""):
         assignment = self.assignments_given.get(assignment_id)
         if not assignment:
-            print(f"Error: Assignment {assignment_id} not found or not created by {self._full_name}.")
+            emit("teacher.grade_assignment", f"Error: Assignment {assignment_id} not found or not created by {self._full_name}.", level=ERROR)
             return False
         if student_id not in assignment.submissions:
-            print(f"Error: Student {student_id} has not submitted assignment {assignment_id}.")
+            emit("teacher.grade_assignment", f"Error: Student {student_id} has not submitted assignment {assignment_id}.", level=ERROR)
             return False
         if not (1 <= grade_value <= 5):
-            print("Error: Grade value must be between 1 and 5.")
+            emit("teacher.grade_assignment", "Error: Grade value must be between 1 and 5.", level=ERROR)
             return False
+        edu_platform._check_open()
 
         assignment.set_grade(student_id, grade_value)
         
         student = edu_platform.get_user_by_id(student_id)
         if student and isinstance(student, Student):
-            if assignment.subject not in student.grades:
-                student.grades[assignment.subject] = []
-            student.grades[assignment.subject].append(grade_value)
-            print(f"Grade {grade_value} added for student {student._full_name} in subject {assignment.subject}.")
+            emit("teacher.grade_assignment", f"Grade {grade_value} added for student {student._full_name} in subject {assignment.subject}.")
 
             new_grade = Grade(student_id, assignment.subject, grade_value, self._id, comment)
             edu_platform.add_grade(new_grade)
 
             student.add_notification(f"You received a grade of {grade_value} for '{assignment.title}' in {assignment.subject}.", priority=2)
             if grade_value < 3:
-                for parent_id, parent in edu_platform.parents.items():
-                    if student._id in parent.children:
-                        parent.add_notification(f"Urgent: Your child, {student._full_name}, received a low grade ({grade_value}) for '{assignment.title}' in {assignment.subject}.", priority=3)
+                for parent in edu_platform.get_parents_of(student._id):
+                    parent.add_notification(f"Urgent: Your child, {student._full_name}, received a low grade ({grade_value}) for '{assignment.title}' in {assignment.subject}.", priority=3)
         return True
 
     def view_student_progress(self, edu_platform, student_id):
         student = edu_platform.get_user_by_id(student_id)
         if not student or not isinstance(student, Student):
-            print(f"Error: Student with ID {student_id} not found.")
+            emit("teacher.view_student_progress", f"Error: Student with ID {student_id} not found.", level=ERROR)
             return
 
-        print(f"\nProgress for Student: {student._full_name} (ID: {student._id})")
-        print(f"  Class: {student.grade}")
-        print("  Subjects and Teachers:")
+        emit("teacher.view_student_progress", f"\nProgress for Student: {student._full_name} (ID: {student._id})")
+        emit("teacher.view_student_progress", f"  Class: {student.grade}")
+        emit("teacher.view_student_progress", "  Subjects and Teachers:")
         for sub, tid in student.subjects.items():
             teacher = edu_platform.get_user_by_id(tid)
-            print(f"    - {sub}: {teacher._full_name if teacher else 'N/A'}")
+            emit("teacher.view_student_progress", f"    - {sub}: {teacher._full_name if teacher else 'N/A'}")
 
-        print("  Assignments Submitted:")
+        emit("teacher.view_student_progress", "  Assignments Submitted:")
         if not student.assignments:
-            print("    No assignments submitted.")
+            emit("teacher.view_student_progress", "    No assignments submitted.")
         else:
             for assign_id, status in student.assignments.items():
                 assignment = edu_platform.get_assignment_by_id(assign_id)
-                print(f"    - {assignment.title if assignment else 'Unknown'}: {status}")
+                emit("teacher.view_student_progress", f"    - {assignment.title if assignment else 'Unknown'}: {status}")
 
         student.view_grades()
         student.calculate_average_grade()
 
 class Parent(User):
+    __slots__ = ("children", "notification_preferences")
+
     def __init__(self, full_name, email, password):
         super().__init__(full_name, email, password, UserRole.PARENT)
         self.children = []
-        self.notification_preferences = {"low_grade_alert": True, "new_assignment_alert": True}
+        self.notification_preferences = {"low_grade_alert": True, "new_assignment_alert": True, "missed_deadline_alert": True}
 
     def add_child(self, student_id):
-        if student_id not in self.children:
-            self.children.append(student_id)
-            print(f"Child (ID: {student_id}) added for {self._full_name}.")
+        with self._users_lock():
+            added = student_id not in self.children
+            if added:
+                self.children.append(student_id)
+                if self._platform is not None:
+                    self._platform._link_parent(self._id, student_id)
+                self._record_change()
+        if added:
+            emit("parent.add_child", f"Child (ID: {student_id}) added for {self._full_name}.")
             return True
-        print(f"Child (ID: {student_id}) already linked to {self._full_name}.")
+        emit("parent.add_child", f"Child (ID: {student_id}) already linked to {self._full_name}.")
         return False
 
     def view_child_grades(self, edu_platform, child_id):
         if child_id not in self.children:
-            print(f"Error: Child with ID {child_id} is not linked to {self._full_name}.")
+            emit("parent.view_child_grades", f"Error: Child with ID {child_id} is not linked to {self._full_name}.", level=ERROR)
             return
         child = edu_platform.get_user_by_id(child_id)
         if child and isinstance(child, Student):
             child.view_grades()
             child.calculate_average_grade()
         else:
-            print(f"Error: Child with ID {child_id} not found or is not a student.")
+            emit("parent.view_child_grades", f"Error: Child with ID {child_id} not found or is not a student.", level=ERROR)
 
     def view_child_assignments(self, edu_platform, child_id):
         if child_id not in self.children:
-            print(f"Error: Child with ID {child_id} is not linked to {self._full_name}.")
+            emit("parent.view_child_assignments", f"Error: Child with ID {child_id} is not linked to {self._full_name}.", level=ERROR)
             return
         child = edu_platform.get_user_by_id(child_id)
         if child and isinstance(child, Student):
-            print(f"\nAssignments for {child._full_name}:")
+            emit("parent.view_child_assignments", f"\nAssignments for {child._full_name}:")
             if not child.assignments:
-                print("  No assignments recorded.")
+                emit("parent.view_child_assignments", "  No assignments recorded.")
             else:
                 for assign_id, status in child.assignments.items():
                     assignment = edu_platform.get_assignment_by_id(assign_id)
-                    print(f"  - {assignment.title if assignment else 'Unknown'}: {status}")
+                    emit("parent.view_child_assignments", f"  - {assignment.title if assignment else 'Unknown'}: {status}")
         else:
-            print(f"Error: Child with ID {child_id} not found or is not a student.")
+            emit("parent.view_child_assignments", f"Error: Child with ID {child_id} not found or is not a student.", level=ERROR)
 
     def receive_child_notification(self, edu_platform, child_id):
         if child_id not in self.children:
-            print(f"Error: Child with ID {child_id} is not linked to {self._full_name}.")
+            emit("parent.receive_child_notification", f"Error: Child with ID {child_id} is not linked to {self._full_name}.", level=ERROR)
             return
         child_user = edu_platform.get_user_by_id(child_id)
         if child_user:
-            print(f"\nNotifications for {self._full_name} regarding {child_user._full_name}:")
+            emit("parent.receive_child_notification", f"\nNotifications for {self._full_name} regarding {child_user._full_name}:")
             self.view_notifications()
         else:
-            print(f"Child with ID {child_id} not found.")
+            emit("parent.receive_child_notification", f"Child with ID {child_id} not found.")
 
 class Admin(User):
+    __slots__ = ("permissions",)
+
     def __init__(self, full_name, email, password):
         super().__init__(full_name, email, password, UserRole.ADMIN)
         self.permissions = ["manage_users", "generate_reports", "manage_system_settings"]
 
     def add_user(self, edu_platform, user_obj):
         if edu_platform.get_user_by_email(user_obj._email):
-            print(f"Error: User with email {user_obj._email} already exists.")
+            emit("admin.add_user", f"Error: User with email {user_obj._email} already exists.", level=ERROR)
             return False
         edu_platform.add_user(user_obj)
-        print(f"User '{user_obj._full_name}' ({user_obj.role.value}) added by Admin {self._full_name}.")
+        emit("admin.add_user", f"User '{user_obj._full_name}' ({user_obj.role.value}) added by Admin {self._full_name}.")
         return True
 
     def remove_user(self, edu_platform, user_id):
         if self._id == user_id:
-            print("Error: Admin cannot remove themselves.")
+            emit("admin.remove_user", "Error: Admin cannot remove themselves.", level=ERROR)
             return False
         if edu_platform.remove_user(user_id):
-            print(f"User with ID {user_id} removed by Admin {self._full_name}.")
+            emit("admin.remove_user", f"User with ID {user_id} removed by Admin {self._full_name}.")
             return True
-        print(f"Error: User with ID {user_id} not found to remove.")
+        emit("admin.remove_user", f"Error: User with ID {user_id} not found to remove.", level=ERROR)
         return False
 
-    def generate_report(self, edu_platform):
-        print(f"\n--- System Report generated by Admin {self._full_name} ({datetime.datetime.now().isoformat()}) ---")
-        print(f"Total Users: {len(edu_platform.users)}")
-        print(f"  Admins: {sum(1 for u in edu_platform.users.values() if u.role == UserRole.ADMIN)}")
-        print(f"  Teachers: {sum(1 for u in edu_platform.users.values() if u.role == UserRole.TEACHER)}")
-        print(f"  Students: {sum(1 for u in edu_platform.users.values() if u.role == UserRole.STUDENT)}")
-        print(f"  Parents: {sum(1 for u in edu_platform.users.values() if u.role == UserRole.PARENT)}")
-
-        print(f"\nTotal Assignments: {len(edu_platform.assignments)}")
-        print(f"Total Grades: {len(edu_platform.grades)}")
-        print(f"Total Schedules: {len(edu_platform.schedules)}")
-        print(f"Total Notifications: {sum(len(u._notifications) for u in edu_platform.users.values())}")
-
-        print("\nStudent Performance Overview:")
-        for student in edu_platform.students.values():
-            print(f"  - {student._full_name} (ID: {student._id}, Class: {student.grade})")
-            student.calculate_average_grade()
-        print("--- End of Report ---")
-        return {
-            "total_users": len(edu_platform.users),
-            "total_assignments": len(edu_platform.assignments),
-            "total_grades": len(edu_platform.grades)
-        }
+    def generate_report(self, edu_platform, fmt="text", out=None, include_students=True):
+        report = edu_platform.build_report(include_students)
+        report.title = f"System Report generated by Admin {self._full_name}"
+        if out is not None:
+            render_report(report, fmt, out)
+        elif edu_platform.events.enabled():
+            # Without an explicit stream the report is a platform message
+            # like any other, so a silenced or redirected bus applies to it.
+            emit("admin.generate_report", render_report(report, fmt).rstrip("\n"), format=fmt)
+        return report.summary
+
+
+for _role in (User, Student, Teacher, Parent, Admin):
+    instrumentation.register_class(_role)
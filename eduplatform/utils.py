@@ -1,7 +1,17 @@
+import concurrent.futures
 import csv
 import datetime
+import multiprocessing
+import os
+import sqlite3
+import time
+import types
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
+from eduplatform.enums import UserRole
+from eduplatform.journal import INSERT, UPDATE
+from eduplatform.events import emit, WARNING, MemorySink, bus
+from eduplatform.instrumentation import instrumentation
 
 # Helper for SQL escaping
 
@@ -13,188 +23,280 @@ def _sql_escape(value):
         return f"'{v}'"
     return str(value)
 
-def export_to_xlsx(platform_instance, filename="eduplatform_data.xlsx"):
-    if not platform_instance.validate_data_for_export():
-        print("Export cancelled due to data validation errors.")
-        return
-
-    wb = Workbook()
-
-    ws_users = wb.active
-    ws_users.title = "Users"
-    user_headers = ["id", "full_name", "email", "role", "created_at", "phone", "address"]
-    ws_users.append(user_headers)
-    for user in platform_instance.users.values():
-        ws_users.append([
-            user._id, user._full_name, user._email, user.role.value, user._created_at,
-            user.phone, user.address
-        ])
-
-    ws_students = wb.create_sheet("Students")
-    student_headers = ["user_id", "full_name", "grade", "subjects", "assignments", "grades_data"]
-    ws_students.append(student_headers)
-    for student in platform_instance.students.values():
-        ws_students.append([
-            student._id, student._full_name, student.grade,
-            str(student.subjects),
-            str(student.assignments),
-            str(student.grades)
-        ])
-    
-    ws_teachers = wb.create_sheet("Teachers")
-    teacher_headers = ["user_id", "full_name", "subjects", "classes", "workload"]
-    ws_teachers.append(teacher_headers)
-    for teacher in platform_instance.teachers.values():
-        ws_teachers.append([
-            teacher._id, teacher._full_name,
-            ", ".join(teacher.subjects),
-            ", ".join(teacher.classes),
-            teacher.workload
-        ])
-
-    ws_parents = wb.create_sheet("Parents")
-    parent_headers = ["user_id", "full_name", "children_ids", "notification_preferences"]
-    ws_parents.append(parent_headers)
-    for parent in platform_instance.parents.values():
-        ws_parents.append([
-            parent._id, parent._full_name,
-            ", ".join(map(str, parent.children)),
-            str(parent.notification_preferences)
-        ])
-
-    ws_assignments = wb.create_sheet("Assignments")
-    assignment_headers = ["id", "title", "description", "deadline", "subject", "teacher_id", "class_id", "difficulty", "submissions_count", "grades_count"]
-    ws_assignments.append(assignment_headers)
-    for assignment in platform_instance.assignments.values():
-        ws_assignments.append([
-            assignment.id, assignment.title, assignment.description, assignment.deadline,
-            assignment.subject, assignment.teacher_id, assignment.class_id,
-            assignment.difficulty.value,
-            len(assignment.submissions), len(assignment.grades)
-        ])
-
-    ws_grades = wb.create_sheet("Grades")
-    grade_headers = ["id", "student_id", "subject", "value", "date", "teacher_id", "comment"]
-    ws_grades.append(grade_headers)
-    for grade in platform_instance.grades.values():
-        ws_grades.append([
-            grade.id, grade.student_id, grade.subject, grade.value,
-            grade.date, grade.teacher_id, grade.comment
-        ])
-
-    ws_schedules = wb.create_sheet("Schedules")
-    schedule_headers = ["id", "class_id", "day", "lessons_json"]
-    ws_schedules.append(schedule_headers)
-    for schedule in platform_instance.schedules.values():
-        ws_schedules.append([
-            schedule.id, schedule.class_id, schedule.day,
-            str(schedule.lessons)
-        ])
-    
-    ws_notifications = wb.create_sheet("Notifications")
-    notification_headers = ["id", "message", "recipient_id", "created_at", "is_read", "priority"]
-    ws_notifications.append(notification_headers)
-    all_notifications = list(platform_instance.notifications.values())
+USER_HEADERS = ["id", "full_name", "email", "role", "created_at", "phone", "address"]
+STUDENT_HEADERS = ["user_id", "full_name", "grade", "subjects", "assignments", "grades_data"]
+TEACHER_HEADERS = ["user_id", "full_name", "subjects", "classes", "workload"]
+PARENT_HEADERS = ["user_id", "full_name", "children_ids", "notification_preferences"]
+ASSIGNMENT_HEADERS = ["id", "title", "description", "deadline", "subject", "teacher_id", "class_id", "difficulty", "submissions_count", "grades_count"]
+GRADE_HEADERS = ["id", "student_id", "subject", "value", "date", "teacher_id", "comment"]
+SCHEDULE_HEADERS = ["id", "class_id", "day", "lessons_json"]
+NOTIFICATION_HEADERS = ["id", "message", "recipient_id", "created_at", "is_read", "priority"]
+
+def _all_notifications(platform_instance):
+    for notif in platform_instance.notifications.values():
+        yield notif
     for user in platform_instance.users.values():
         for notif in user._notifications:
             if notif.id not in platform_instance.notifications:
-                all_notifications.append(notif)
-    
-    for notif in all_notifications:
-        ws_notifications.append([
-            notif.id, notif.message, notif.recipient_id,
-            notif.created_at, notif.is_read, notif.priority
-        ])
+                yield notif
+
+def _user_row(user):
+    return [user._id, user._full_name, user._email, user.role.value, user._created_at, user.phone, user.address]
+
+def _student_row(student):
+    return [student._id, student._full_name, student.grade, str(student.subjects), str(student.assignments), str(student.grades)]
+
+def _teacher_row(teacher):
+    return [teacher._id, teacher._full_name, ", ".join(teacher.subjects), ", ".join(teacher.classes), teacher.workload]
+
+def _parent_row(parent):
+    return [parent._id, parent._full_name, ", ".join(map(str, parent.children)), str(parent.notification_preferences)]
+
+def _assignment_row(assignment):
+    return [assignment.id, assignment.title, assignment.description, assignment.deadline, assignment.subject, assignment.teacher_id, assignment.class_id, assignment.difficulty.value, len(assignment.submissions), len(assignment.grades)]
+
+def _grade_row(grade):
+    return [grade.id, grade.student_id, grade.subject, grade.value, grade.date, grade.teacher_id, grade.comment]
+
+def _schedule_row(schedule):
+    return [schedule.id, schedule.class_id, schedule.day, str(schedule.lessons)]
+
+def _notification_row(notif):
+    return [notif.id, notif.message, notif.recipient_id, notif.created_at, notif.is_read, notif.priority]
+
+_TABLE_SOURCES = {
+    "users": lambda p: p.users.values(),
+    "students": lambda p: p.students.values(),
+    "teachers": lambda p: p.teachers.values(),
+    "parents": lambda p: p.parents.values(),
+    "assignments": lambda p: p.assignments.values(),
+    "grades": lambda p: p.grades.values(),
+    "schedules": lambda p: p.schedules.values(),
+    "notifications": _all_notifications,
+}
+
+# Journal tables map onto export tables; a user change also touches its role table.
+_ROLE_TABLES = {UserRole.STUDENT: "students", UserRole.TEACHER: "teachers", UserRole.PARENT: "parents"}
+
+def _export_tables_for_change(journal_table, obj):
+    if journal_table == "users":
+        role_table = _ROLE_TABLES.get(obj.role)
+        return ["users", role_table] if role_table else ["users"]
+    return [journal_table]
+
+# (sheet title, csv suffix, headers, row builder) for every exported table
+EXPORT_TABLES = [
+    ("Users", "users", USER_HEADERS, _user_row),
+    ("Students", "students", STUDENT_HEADERS, _student_row),
+    ("Teachers", "teachers", TEACHER_HEADERS, _teacher_row),
+    ("Parents", "parents", PARENT_HEADERS, _parent_row),
+    ("Assignments", "assignments", ASSIGNMENT_HEADERS, _assignment_row),
+    ("Grades", "grades", GRADE_HEADERS, _grade_row),
+    ("Schedules", "schedules", SCHEDULE_HEADERS, _schedule_row),
+    ("Notifications", "notifications", NOTIFICATION_HEADERS, _notification_row),
+]
+
+DEFAULT_COMPACT_EVERY = 20
+DEFAULT_SQL_BATCH_SIZE = 500
+
+class ExportSnapshot:
+    # Immutable, picklable copy of every exported row. Each collection is
+    # walked once and shared by all requested formats.
+    def __init__(self, platform_instance, formats=("xlsx", "csv", "sql")):
+        self.created_at = datetime.datetime.now().isoformat()
+        self.formats = tuple(formats)
+        self.is_valid = platform_instance.validate_data_for_export()
+        records = {key: list(source(platform_instance)) for key, source in _TABLE_SOURCES.items()}
+        tables = {}
+        if "xlsx" in formats or "csv" in formats:
+            for title, key, headers, row in EXPORT_TABLES:
+                tables[key] = tuple(tuple(row(record)) for record in records[key])
+        if "sql" in formats:
+            for table, key, columns, row in SQL_TABLES:
+                tables[f"sql:{table}"] = tuple(tuple(row(record)) for record in records[key])
+        self.tables = types.MappingProxyType(tables)
+
+    def rows(self, snapshot_key, source_key, row):
+        return self.tables[snapshot_key]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["tables"] = dict(self.tables)
+        return state
+
+    def __setstate__(self, state):
+        state["tables"] = types.MappingProxyType(state["tables"])
+        self.__dict__.update(state)
+
+class _LiveTables:
+    # Row source that walks the platform lazily, one generator per table.
+    def __init__(self, platform_instance):
+        self.platform_instance = platform_instance
+
+    def rows(self, snapshot_key, source_key, row):
+        return (row(record) for record in _TABLE_SOURCES[source_key](self.platform_instance))
+
+def _row_source(platform_instance, snapshot):
+    return snapshot if snapshot is not None else _LiveTables(platform_instance)
+
+def _is_exportable(platform_instance, snapshot):
+    if snapshot is not None:
+        return snapshot.is_valid
+    return platform_instance.validate_data_for_export()
+
+def _take_delta(platform_instance, consumer, formats, compact_every, target_exists, row_builders):
+    # Returns (snapshot, seq) when a compaction to a full export is due,
+    # otherwise (None, (rows, seq)) with the changed rows of every table.
+    # The cursor only moves to seq once the compaction has been written, so
+    # a failed one keeps the pending changes; a new consumer is registered
+    # straight away so changes made meanwhile are journaled for it.
+    journal = platform_instance.journal
+    with platform_instance._locks:
+        state = journal.cursor(consumer)
+        if state is None or state["deltas"] >= compact_every or not target_exists:
+            snapshot = ExportSnapshot(platform_instance, formats)
+            if state is None:
+                journal.reset(consumer)
+            return snapshot, journal.head
+        changes, seq = journal.pending(consumer)
+        rows = {}
+        for journal_table, table_changes in changes.items():
+            for key, (op, obj) in table_changes.items():
+                for export_table in _export_tables_for_change(journal_table, obj):
+                    values = row_builders[export_table](obj)
+                    rows.setdefault(export_table, []).append((op, key, values))
+        return None, (rows, seq)
+
+def export_to_xlsx(platform_instance, filename="eduplatform_data.xlsx", snapshot=None, streaming=False):
+    if not _is_exportable(platform_instance, snapshot):
+        emit("export.cancelled", "Export cancelled due to data validation errors.", level=WARNING, format="xlsx")
+        return
 
-    wb.save(filename)
-    print(f"Data exported to {filename} successfully.")
+    _write_xlsx(_row_source(platform_instance, snapshot), filename, streaming)
     platform_instance.export_log.append({
         "timestamp": datetime.datetime.now().isoformat(),
         "action": "Manual XLSX Export",
         "filename": filename
     })
 
-def export_to_csv(platform_instance, filename_prefix="eduplatform_data_"):
-    if not platform_instance.validate_data_for_export():
-        print("Export cancelled due to data validation errors.")
+def _write_xlsx(source, filename, streaming=False):
+    # A write-only workbook serialises each row as it is appended, so memory
+    # stays flat no matter how many rows the generators produce.
+    wb = Workbook(write_only=streaming)
+    for index, (title, key, headers, row) in enumerate(EXPORT_TABLES):
+        if index == 0 and not streaming:
+            ws = wb.active
+            ws.title = title
+        else:
+            ws = wb.create_sheet(title)
+        ws.append(headers)
+        for values in source.rows(key, key, row):
+            ws.append(values)
+
+    wb.save(filename)
+    emit("export.written", f"Data exported to {filename} successfully.", format="xlsx", filename=str(filename))
+
+def export_to_csv(platform_instance, filename_prefix="eduplatform_data_", snapshot=None, mode="full", compact_every=DEFAULT_COMPACT_EVERY):
+    if mode == "delta":
+        return _export_csv_delta(platform_instance, filename_prefix, compact_every)
+    if not _is_exportable(platform_instance, snapshot):
+        emit("export.cancelled", "Export cancelled due to data validation errors.", level=WARNING, format="csv")
         return
 
-    with open(f"{filename_prefix}users.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["id", "full_name", "email", "role", "created_at", "phone", "address"])
-        for user in platform_instance.users.values():
-            writer.writerow([user._id, user._full_name, user._email, user.role.value, user._created_at, user.phone, user.address])
-    print(f"Exported {filename_prefix}users.csv")
-
-    with open(f"{filename_prefix}students.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["user_id", "full_name", "grade", "subjects", "assignments", "grades_data"])
-        for student in platform_instance.students.values():
-            writer.writerow([student._id, student._full_name, student.grade, str(student.subjects), str(student.assignments), str(student.grades)])
-    print(f"Exported {filename_prefix}students.csv")
-
-    with open(f"{filename_prefix}teachers.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["user_id", "full_name", "subjects", "classes", "workload"])
-        for teacher in platform_instance.teachers.values():
-            writer.writerow([teacher._id, teacher._full_name, ", ".join(teacher.subjects), ", ".join(teacher.classes), teacher.workload])
-    print(f"Exported {filename_prefix}teachers.csv")
-
-    with open(f"{filename_prefix}parents.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["user_id", "full_name", "children_ids", "notification_preferences"])
-        for parent in platform_instance.parents.values():
-            writer.writerow([parent._id, parent._full_name, ", ".join(map(str, parent.children)), str(parent.notification_preferences)])
-    print(f"Exported {filename_prefix}parents.csv")
-
-    with open(f"{filename_prefix}assignments.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["id", "title", "description", "deadline", "subject", "teacher_id", "class_id", "difficulty", "submissions_count", "grades_count"])
-        for assignment in platform_instance.assignments.values():
-            writer.writerow([assignment.id, assignment.title, assignment.description, assignment.deadline, assignment.subject, assignment.teacher_id, assignment.class_id, assignment.difficulty.value, len(assignment.submissions), len(assignment.grades)])
-    print(f"Exported {filename_prefix}assignments.csv")
-
-    with open(f"{filename_prefix}grades.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["id", "student_id", "subject", "value", "date", "teacher_id", "comment"])
-        for grade in platform_instance.grades.values():
-            writer.writerow([grade.id, grade.student_id, grade.subject, grade.value, grade.date, grade.teacher_id, grade.comment])
-    print(f"Exported {filename_prefix}grades.csv")
-
-    with open(f"{filename_prefix}schedules.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["id", "class_id", "day", "lessons_json"])
-        for schedule in platform_instance.schedules.values():
-            writer.writerow([schedule.id, schedule.class_id, schedule.day, str(schedule.lessons)])
-    print(f"Exported {filename_prefix}schedules.csv")
-
-    with open(f"{filename_prefix}notifications.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["id", "message", "recipient_id", "created_at", "is_read", "priority"])
-        all_notifications = list(platform_instance.notifications.values())
-        for user in platform_instance.users.values():
-            for notif in user._notifications:
-                if notif.id not in platform_instance.notifications:
-                    all_notifications.append(notif)
-        for notif in all_notifications:
-            writer.writerow([notif.id, notif.message, notif.recipient_id, notif.created_at, notif.is_read, notif.priority])
-    print(f"Exported {filename_prefix}notifications.csv")
-
-    print("All data exported to CSV successfully.")
+    _write_csv(_row_source(platform_instance, snapshot), filename_prefix)
     platform_instance.export_log.append({
         "timestamp": datetime.datetime.now().isoformat(),
         "action": "Manual CSV Export",
         "filename_prefix": filename_prefix
     })
 
-def export_to_sql(platform_instance, filename="eduplatform_data.sql"):
+def _write_csv(source, filename_prefix):
+    for title, key, headers, row in EXPORT_TABLES:
+        with open(f"{filename_prefix}{key}.csv", 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(source.rows(key, key, row))
+        emit("export.written", f"Exported {filename_prefix}{key}.csv", format="csv", filename=f"{filename_prefix}{key}.csv")
+        changes_file = f"{filename_prefix}{key}_changes.csv"
+        if os.path.exists(changes_file):
+            os.remove(changes_file)
+
+    emit("export.complete", "All data exported to CSV successfully.", format="csv")
+
+def _export_csv_delta(platform_instance, filename_prefix, compact_every):
+    consumer = f"csv:{filename_prefix}"
+    target_exists = os.path.exists(f"{filename_prefix}users.csv")
+    row_builders = {key: row for title, key, headers, row in EXPORT_TABLES}
+    snapshot, delta = _take_delta(platform_instance, consumer, ("csv",), compact_every, target_exists, row_builders)
+    if snapshot is not None:
+        emit("export.compacting", "Compacting CSV export to a full snapshot.", format="csv")
+        export_to_csv(platform_instance, filename_prefix, snapshot=snapshot)
+        if snapshot.is_valid:
+            platform_instance.journal.reset(consumer, delta)
+        return
     if not platform_instance.validate_data_for_export():
-        print("Export cancelled due to data validation errors.")
+        emit("export.cancelled", "Export cancelled due to data validation errors.", level=WARNING, format="csv")
         return
 
-    sql_statements = []
+    rows, seq = delta
+    change_count = 0
+    # Inserts are appended to the table file; updates and deletes go to a
+    # per-table changes log that the next compaction folds back in.
+    for title, key, headers, row in EXPORT_TABLES:
+        table_rows = rows.get(key)
+        if not table_rows:
+            continue
+        inserts = [values for op, record_key, values in table_rows if op == INSERT]
+        changes = [[op] + values for op, record_key, values in table_rows if op != INSERT]
+        if inserts:
+            with open(f"{filename_prefix}{key}.csv", 'a', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows(inserts)
+        if changes:
+            changes_file = f"{filename_prefix}{key}_changes.csv"
+            is_new = not os.path.exists(changes_file)
+            with open(changes_file, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if is_new:
+                    writer.writerow(["op"] + headers)
+                writer.writerows(changes)
+        change_count += len(table_rows)
+        emit("export.written", f"Exported delta {filename_prefix}{key}.csv (+{len(inserts)} rows, {len(changes)} changes)", format="csv", filename=f"{filename_prefix}{key}.csv", inserts=len(inserts), changes=len(changes))
+
+    platform_instance.journal.commit(consumer, seq)
+    emit("export.complete", f"Delta CSV export complete: {change_count} changed rows.", format="csv", changes=change_count)
+    platform_instance.export_log.append({
+        "timestamp": datetime.datetime.now().isoformat(),
+        "action": "Delta CSV Export",
+        "filename_prefix": filename_prefix,
+        "changes": change_count
+    })
+
+def _sql_user_row(user):
+    return [user._id, user._full_name, user._email, user._password_hash, user.role.value, user._created_at, user.phone, user.address]
+
+def _sql_student_row(student):
+    return [student._id, student.grade, str(student.subjects), str(student.assignments), str(student.grades)]
+
+def _sql_teacher_row(teacher):
+    return [teacher._id, ", ".join(teacher.subjects), ", ".join(teacher.classes), teacher.workload]
+
+def _sql_parent_row(parent):
+    return [parent._id, ", ".join(map(str, parent.children)), str(parent.notification_preferences)]
+
+def _sql_assignment_row(assignment):
+    return [assignment.id, assignment.title, assignment.description, assignment.deadline, assignment.subject, assignment.teacher_id, assignment.class_id, assignment.difficulty.value, str(assignment.submissions), str(assignment.grades)]
+
+def _sql_grade_row(grade):
+    return [grade.id, grade.student_id, grade.subject, grade.value, grade.date, grade.teacher_id, grade.comment]
 
-    sql_statements.append("""
+def _sql_schedule_row(schedule):
+    return [schedule.id, schedule.class_id, schedule.day, str(schedule.lessons)]
+
+def _sql_notification_row(notif):
+    return [notif.id, notif.message, notif.recipient_id, notif.created_at, 1 if notif.is_read else 0, notif.priority]
+
+SQL_SCHEMA = [
+    """
 CREATE TABLE IF NOT EXISTS Users (
     id INT PRIMARY KEY,
     full_name VARCHAR(255) NOT NULL,
@@ -205,9 +307,8 @@ CREATE TABLE IF NOT EXISTS Users (
     phone VARCHAR(20),
     address TEXT
 );
-""")
-
-    sql_statements.append("""
+""",
+    """
 CREATE TABLE IF NOT EXISTS Students (
     user_id INT PRIMARY KEY,
     grade VARCHAR(10) NOT NULL,
@@ -216,9 +317,8 @@ CREATE TABLE IF NOT EXISTS Students (
     grades_data TEXT,
     FOREIGN KEY (user_id) REFERENCES Users(id) ON DELETE CASCADE
 );
-""")
-
-    sql_statements.append("""
+""",
+    """
 CREATE TABLE IF NOT EXISTS Teachers (
     user_id INT PRIMARY KEY,
     subjects TEXT,
@@ -226,18 +326,16 @@ CREATE TABLE IF NOT EXISTS Teachers (
     workload INT,
     FOREIGN KEY (user_id) REFERENCES Users(id) ON DELETE CASCADE
 );
-""")
-
-    sql_statements.append("""
+""",
+    """
 CREATE TABLE IF NOT EXISTS Parents (
     user_id INT PRIMARY KEY,
     children_ids TEXT,
     notification_preferences TEXT,
     FOREIGN KEY (user_id) REFERENCES Users(id) ON DELETE CASCADE
 );
-""")
-
-    sql_statements.append("""
+""",
+    """
 CREATE TABLE IF NOT EXISTS Assignments (
     id INT PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
@@ -251,9 +349,8 @@ CREATE TABLE IF NOT EXISTS Assignments (
     grades TEXT,
     FOREIGN KEY (teacher_id) REFERENCES Users(id) ON DELETE CASCADE
 );
-""")
-
-    sql_statements.append("""
+""",
+    """
 CREATE TABLE IF NOT EXISTS Grades (
     id INT PRIMARY KEY,
     student_id INT NOT NULL,
@@ -265,18 +362,16 @@ CREATE TABLE IF NOT EXISTS Grades (
     FOREIGN KEY (student_id) REFERENCES Users(id) ON DELETE CASCADE,
     FOREIGN KEY (teacher_id) REFERENCES Users(id) ON DELETE CASCADE
 );
-""")
-
-    sql_statements.append("""
+""",
+    """
 CREATE TABLE IF NOT EXISTS Schedules (
     id INT PRIMARY KEY,
     class_id VARCHAR(10) NOT NULL,
     day VARCHAR(20) NOT NULL,
     lessons TEXT
 );
-""")
-
-    sql_statements.append("""
+""",
+    """
 CREATE TABLE IF NOT EXISTS Notifications (
     id INT PRIMARY KEY,
     message TEXT NOT NULL,
@@ -286,82 +381,243 @@ CREATE TABLE IF NOT EXISTS Notifications (
     priority INT NOT NULL,
     FOREIGN KEY (recipient_id) REFERENCES Users(id) ON DELETE CASCADE
 );
-""")
+""",
+]
+
+# (table, source key, insert columns, row builder) in dump order; the first
+# column is the primary key used by delta UPDATE/DELETE statements.
+SQL_TABLES = [
+    ("Users", "users", ["id", "full_name", "email", "password_hash", "role", "created_at", "phone", "address"], _sql_user_row),
+    ("Students", "students", ["user_id", "grade", "subjects", "assignments", "grades_data"], _sql_student_row),
+    ("Teachers", "teachers", ["user_id", "subjects", "classes", "workload"], _sql_teacher_row),
+    ("Parents", "parents", ["user_id", "children_ids", "notification_preferences"], _sql_parent_row),
+    ("Assignments", "assignments", ["id", "title", "description", "deadline", "subject", "teacher_id", "class_id", "difficulty", "submissions", "grades"], _sql_assignment_row),
+    ("Grades", "grades", ["id", "student_id", "subject", "value", "date", "teacher_id", "comment"], _sql_grade_row),
+    ("Schedules", "schedules", ["id", "class_id", "day", "lessons"], _sql_schedule_row),
+    ("Notifications", "notifications", ["id", "message", "recipient_id", "created_at", "is_read", "priority"], _sql_notification_row),
+]
+
+def _sql_insert(table, columns, values):
+    return f"""
+INSERT INTO {table} ({", ".join(columns)})
+VALUES ({", ".join(_sql_escape(value) for value in values)});
+"""
+
+def _sql_insert_many(table, columns, rows):
+    values = ",\n".join(f"({', '.join(_sql_escape(value) for value in row)})" for row in rows)
+    return f"INSERT INTO {table} ({', '.join(columns)})\nVALUES\n{values};\n\n"
+
+def _sql_update(table, columns, values):
+    assignments = ", ".join(f"{column} = {_sql_escape(value)}" for column, value in zip(columns[1:], values[1:]))
+    return f"""
+UPDATE {table} SET {assignments}
+WHERE {columns[0]} = {_sql_escape(values[0])};
+"""
+
+def _sql_delete(table, columns, key):
+    return f"""
+DELETE FROM {table} WHERE {columns[0]} = {_sql_escape(key)};
+"""
+
+def export_to_sql(platform_instance, filename="eduplatform_data.sql", snapshot=None, mode="full", compact_every=DEFAULT_COMPACT_EVERY, batch_size=DEFAULT_SQL_BATCH_SIZE):
+    if mode == "delta":
+        return _export_sql_delta(platform_instance, filename, compact_every)
+    if not _is_exportable(platform_instance, snapshot):
+        emit("export.cancelled", "Export cancelled due to data validation errors.", level=WARNING, format="sql")
+        return
 
-    for user in platform_instance.users.values():
-        sql_statements.append(f"""
-INSERT INTO Users (id, full_name, email, password_hash, role, created_at, phone, address)
-VALUES ({user._id}, {_sql_escape(user._full_name)}, {_sql_escape(user._email)}, {_sql_escape(user._password_hash)}, {_sql_escape(user.role.value)}, {_sql_escape(user._created_at)}, {_sql_escape(user.phone)}, {_sql_escape(user.address)});
-""")
-
-    for student in platform_instance.students.values():
-        sql_statements.append(f"""
-INSERT INTO Students (user_id, full_name, grade, subjects, assignments, grades_data)
-VALUES ({student._id}, {_sql_escape(student._full_name)}, {_sql_escape(student.grade)}, {_sql_escape(str(student.subjects))}, {_sql_escape(str(student.assignments))}, {_sql_escape(str(student.grades))});
-""")
-
-    for teacher in platform_instance.teachers.values():
-        sql_statements.append(f"""
-INSERT INTO Teachers (user_id, full_name, subjects, classes, workload)
-VALUES ({teacher._id}, {_sql_escape(teacher._full_name)}, {_sql_escape(", ".join(teacher.subjects))}, {_sql_escape(", ".join(teacher.classes))}, {teacher.workload});
-""")
-    
-    for parent in platform_instance.parents.values():
-        sql_statements.append(f"""
-INSERT INTO Parents (user_id, full_name, children_ids, notification_preferences)
-VALUES ({parent._id}, {_sql_escape(parent._full_name)}, {_sql_escape(", ".join(map(str, parent.children)))}, {_sql_escape(str(parent.notification_preferences))});
-""")
-
-    for assignment in platform_instance.assignments.values():
-        sql_statements.append(f"""
-INSERT INTO Assignments (id, title, description, deadline, subject, teacher_id, class_id, difficulty, submissions, grades)
-VALUES ({assignment.id}, {_sql_escape(assignment.title)}, {_sql_escape(assignment.description)}, {_sql_escape(assignment.deadline)}, {_sql_escape(assignment.subject)}, {assignment.teacher_id}, {_sql_escape(assignment.class_id)}, {_sql_escape(assignment.difficulty.value)}, {_sql_escape(str(assignment.submissions))}, {_sql_escape(str(assignment.grades))});
-""")
-
-    for grade in platform_instance.grades.values():
-        sql_statements.append(f"""
-INSERT INTO Grades (id, student_id, subject, value, date, teacher_id, comment)
-VALUES ({grade.id}, {grade.student_id}, {_sql_escape(grade.subject)}, {grade.value}, {_sql_escape(grade.date)}, {grade.teacher_id}, {_sql_escape(grade.comment)});
-""")
-
-    for schedule in platform_instance.schedules.values():
-        sql_statements.append(f"""
-INSERT INTO Schedules (id, class_id, day, lessons)
-VALUES ({schedule.id}, {_sql_escape(schedule.class_id)}, {_sql_escape(schedule.day)}, {_sql_escape(str(schedule.lessons))});
-""")
-
-    all_notifications = list(platform_instance.notifications.values())
-    for user in platform_instance.users.values():
-        for notif in user._notifications:
-            if notif.id not in platform_instance.notifications:
-                all_notifications.append(notif)
-    
-    for notif in all_notifications:
-        sql_statements.append(f"""
-INSERT INTO Notifications (id, message, recipient_id, created_at, is_read, priority)
-VALUES ({notif.id}, {_sql_escape(notif.message)}, {notif.recipient_id}, {_sql_escape(notif.created_at)}, {1 if notif.is_read else 0}, {notif.priority});
-""")
+    _write_sql(_row_source(platform_instance, snapshot), filename, batch_size)
+    platform_instance.export_log.append({
+        "timestamp": datetime.datetime.now().isoformat(),
+        "action": "Manual SQL Export",
+        "filename": filename
+    })
 
+def _write_sql(source, filename, batch_size=DEFAULT_SQL_BATCH_SIZE):
+    # Statements are streamed straight to disk, with up to batch_size rows
+    # per multi-row INSERT.
     with open(filename, 'w', encoding='utf-8') as f:
-        for statement in sql_statements:
+        for statement in SQL_SCHEMA:
             f.write(statement.strip() + "\n\n")
+        for table, key, columns, row in SQL_TABLES:
+            batch = []
+            for values in source.rows(f"sql:{table}", key, row):
+                batch.append(values)
+                if len(batch) >= batch_size:
+                    f.write(_sql_insert_many(table, columns, batch))
+                    batch = []
+            if batch:
+                f.write(_sql_insert_many(table, columns, batch))
+
+    emit("export.written", f"SQL INSERT statements exported to {filename} successfully.", format="sql", filename=str(filename))
+
+def export_to_sqlite(platform_instance, filename="eduplatform_data.sqlite", snapshot=None):
+    if not _is_exportable(platform_instance, snapshot):
+        emit("export.cancelled", "Export cancelled due to data validation errors.", level=WARNING, format="sqlite")
+        return
 
-    print(f"SQL INSERT statements exported to {filename} successfully.")
+    rows = _write_sqlite(_row_source(platform_instance, snapshot), filename)
     platform_instance.export_log.append({
         "timestamp": datetime.datetime.now().isoformat(),
-        "action": "Manual SQL Export",
-        "filename": filename
+        "action": "Manual SQLite Export",
+        "filename": filename,
+        "rows": rows
+    })
+
+def _write_sqlite(source, filename):
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        if os.path.exists(f"{filename}{suffix}"):
+            os.remove(f"{filename}{suffix}")
+    conn = sqlite3.connect(filename, isolation_level=None)
+    rows_written = 0
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("BEGIN")
+        for statement in SQL_SCHEMA:
+            conn.execute(statement)
+        for table, key, columns, row in SQL_TABLES:
+            placeholders = ", ".join("?" for _ in columns)
+            cursor = conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                source.rows(f"sql:{table}", key, row)
+            )
+            rows_written += cursor.rowcount
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    emit("export.written", f"Data exported to SQLite database {filename} successfully ({rows_written} rows).", format="sqlite", filename=str(filename), rows=rows_written)
+    return rows_written
+
+def _timed_write(writer, *args):
+    start = time.perf_counter()
+    writer(*args)
+    return time.perf_counter() - start
+
+def _process_write(level, writer, *args):
+    # Runs in a spawned worker, whose event bus starts with the default
+    # console sink. Messages are collected instead and handed back, and the
+    # parent emits them through its own bus; level None means the parent is
+    # silent and nothing is collected.
+    sink = MemorySink() if level is not None else None
+    bus.set_sink(sink, level)
+    elapsed = _timed_write(writer, *args)
+    return elapsed, list(sink.events) if sink is not None else []
+
+EXPORT_EXECUTORS = ("process", "thread", "sequential")
+
+def default_export_executor():
+    # The formats only overlap in separate processes (openpyxl and the CSV
+    # writer hold the GIL); with a single CPU any pool costs more than it
+    # saves, so the writers run one after another in the caller.
+    return "process" if (os.cpu_count() or 1) > 1 else "sequential"
+
+def export_all(platform_instance, xlsx_filename="eduplatform_data.xlsx", csv_prefix="eduplatform_data_", sql_filename="eduplatform_data.sql", snapshot=None, executor=None, streaming=True, sqlite_filename=None):
+    # One snapshot, validated once, written to every format. executor is
+    # "process", "thread" or "sequential"; by default processes when there
+    # is more than one CPU.
+    if executor is None:
+        executor = default_export_executor()
+    if executor not in EXPORT_EXECUTORS:
+        raise ValueError(f"Unknown export executor {executor}; expected one of {', '.join(EXPORT_EXECUTORS)}.")
+    start = time.perf_counter()
+    if snapshot is None:
+        snapshot = platform_instance._take_export_snapshot()
+    snapshot_time = time.perf_counter() - start
+    if not snapshot.is_valid:
+        emit("export.cancelled", "Export cancelled due to data validation errors.", level=WARNING, format="all")
+        return None
+
+    jobs = {
+        "xlsx": (_write_xlsx, snapshot, xlsx_filename, streaming),
+        "csv": (_write_csv, snapshot, csv_prefix),
+        "sql": (_write_sql, snapshot, sql_filename),
+    }
+    if sqlite_filename is not None:
+        jobs["sqlite"] = (_write_sqlite, snapshot, sqlite_filename)
+    if executor == "sequential":
+        timings = {fmt: _timed_write(*job) for fmt, job in jobs.items()}
+    elif executor == "process":
+        level = bus.level if bus.enabled() else None
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(jobs), mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {fmt: pool.submit(_process_write, level, *job) for fmt, job in jobs.items()}
+            timings = {}
+            for fmt, future in futures.items():
+                timings[fmt], messages = future.result()
+                for event in messages:
+                    emit(event.name, event.message, event.level, **event.fields)
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="eduplatform-export") as pool:
+            futures = {fmt: pool.submit(_timed_write, *job) for fmt, job in jobs.items()}
+            timings = {fmt: future.result() for fmt, future in futures.items()}
+
+    timings["snapshot"] = snapshot_time
+    timings["total"] = time.perf_counter() - start
+    emit("export.complete", f"Export ({executor}) finished in {timings['total']:.3f}s (" + ", ".join(f"{fmt}: {timings[fmt]:.3f}s" for fmt in jobs) + ").", format="all", timings=timings)
+    platform_instance.export_log.append({
+        "timestamp": datetime.datetime.now().isoformat(),
+        "action": "Parallel Export",
+        "executor": executor,
+        "formats": list(jobs),
+        "files": {"xlsx": xlsx_filename, "csv": csv_prefix, "sql": sql_filename, "sqlite": sqlite_filename},
+        "timings": timings
+    })
+    return timings
+
+def _export_sql_delta(platform_instance, filename, compact_every):
+    consumer = f"sql:{filename}"
+    row_builders = {key: row for table, key, columns, row in SQL_TABLES}
+    snapshot, delta = _take_delta(platform_instance, consumer, ("sql",), compact_every, os.path.exists(filename), row_builders)
+    if snapshot is not None:
+        emit("export.compacting", "Compacting SQL export to a full snapshot.", format="sql")
+        export_to_sql(platform_instance, filename, snapshot=snapshot)
+        if snapshot.is_valid:
+            platform_instance.journal.reset(consumer, delta)
+        return
+    if not platform_instance.validate_data_for_export():
+        emit("export.cancelled", "Export cancelled due to data validation errors.", level=WARNING, format="sql")
+        return
+
+    rows, seq = delta
+    statements = []
+    deletes = []
+    for table, key, columns, row in SQL_TABLES:
+        for op, record_key, values in rows.get(key, []):
+            if op == INSERT:
+                statements.append(_sql_insert(table, columns, values))
+            elif op == UPDATE:
+                statements.append(_sql_update(table, columns, values))
+            else:
+                deletes.append(_sql_delete(table, columns, record_key))
+    # Dependent rows go first so deletes never violate foreign keys.
+    statements.extend(reversed(deletes))
+
+    with open(filename, 'a', encoding='utf-8') as f:
+        for statement in statements:
+            f.write(statement.strip() + "\n\n")
+
+    platform_instance.journal.commit(consumer, seq)
+    emit("export.written", f"Delta SQL export appended {len(statements)} statements to {filename}.", format="sql", filename=str(filename), statements=len(statements))
+    platform_instance.export_log.append({
+        "timestamp": datetime.datetime.now().isoformat(),
+        "action": "Delta SQL Export",
+        "filename": filename,
+        "changes": len(statements)
     })
 
 def _scrape_data(url="https://www.olx.uz/"):
-    print(f"\n--- Data Scraping Placeholder ---")
-    print(f"Attempting to scrape data from {url}...")
-    print("This is a placeholder. Actual web scraping is complex and requires:")
-    print("1. Libraries like 'requests' for fetching content and 'BeautifulSoup' for parsing HTML.")
-    print("2. Handling dynamic content (JavaScript rendering) often requires 'Selenium'.")
-    print("3. Respecting website's robots.txt and terms of service.")
-    print("4. Implementing robust error handling and retry mechanisms.")
-    print("5. Data cleaning and structuring for scraped data.")
-    print("For this in-memory application, live scraping is not implemented to keep the code simple.")
-    print("--- End of Data Scraping Placeholder ---")
-    return []
\ No newline at end of file
+    emit("export.scrape_data", f"\n--- Data Scraping Placeholder ---")
+    emit("export.scrape_data", f"Attempting to scrape data from {url}...")
+    emit("export.scrape_data", "This is a placeholder. Actual web scraping is complex and requires:")
+    emit("export.scrape_data", "1. Libraries like 'requests' for fetching content and 'BeautifulSoup' for parsing HTML.")
+    emit("export.scrape_data", "2. Handling dynamic content (JavaScript rendering) often requires 'Selenium'.")
+    emit("export.scrape_data", "3. Respecting website's robots.txt and terms of service.")
+    emit("export.scrape_data", "4. Implementing robust error handling and retry mechanisms.")
+    emit("export.scrape_data", "5. Data cleaning and structuring for scraped data.")
+    emit("export.scrape_data", "For this in-memory application, live scraping is not implemented to keep the code simple.")
+    emit("export.scrape_data", "--- End of Data Scraping Placeholder ---")
+    return []
+
+# Export stages, timed when instrumentation is enabled.
+instrumentation.register_functions(__name__, ("_take_delta", "_write_xlsx", "_write_csv", "_write_sql", "_write_sqlite",
+                                              "_export_csv_delta", "_export_sql_delta"), "export")
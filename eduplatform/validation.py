@@ -0,0 +1,44 @@
+USER_REQUIRED_FIELDS = (("full_name", "_full_name"), ("email", "_email"))
+
+
+def validate_user(user):
+    errors = []
+    for field, attribute in USER_REQUIRED_FIELDS:
+        if not getattr(user, attribute, None):
+            errors.append({
+                "record_type": "user",
+                "record_id": user._id,
+                "field": field,
+                "message": f"User {user._id} has an empty {field}."
+            })
+    return errors
+
+
+class ValidationState:
+    # Running set of invalid records, kept current as records are added,
+    # updated and removed, so export-time checks never rescan the tables.
+    def __init__(self):
+        self._errors = {}
+
+    def update(self, record_type, record_id, errors):
+        if errors:
+            self._errors[(record_type, record_id)] = errors
+        else:
+            self._errors.pop((record_type, record_id), None)
+
+    def discard(self, record_type, record_id):
+        self._errors.pop((record_type, record_id), None)
+
+    def is_valid(self):
+        return not self._errors
+
+    def invalid_ids(self, record_type=None):
+        return [record_id for (kind, record_id) in list(self._errors) if record_type is None or kind == record_type]
+
+    def report(self):
+        errors = [error for record_errors in list(self._errors.values()) for error in record_errors]
+        return {
+            "valid": not errors,
+            "invalid_records": len(self._errors),
+            "errors": errors
+        }
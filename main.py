@@ -94,9 +94,9 @@ def main():
     schedule11B_mon.view_schedule()
 
     print("\n--- Data Export ---")
-    platform.export_to_xlsx()
-    platform.export_to_csv()
-    platform.export_to_sql()
+    platform.export_all()
+
+    platform.close()
 
     print("\nEduPlatform Application Demo Finished.")
 